@@ -1,28 +1,20 @@
 import glob
 import json
 import fastavro
-from typing import List
 
 from pyscgen.avro._model.record_model import Schema
 from pyscgen.avro.schema.create_schema import AvroSchemaGenerator
+from pyscgen.json.ingest.file_reader import FileReader
 
 
-# get at least one json documente, load it and put it in a list
-json_documents: List[dict] = []
+# get at least one json document, each file holds one document. For newline-delimited JSON files, use ndjson=True.
 files: list = glob.glob(pathname="./data/*.json")
-i = 0
-for file_path in files:
-    with open(file_path, "r") as file:
-        json_ = json.load(file)
-        i += 1
-        print("working on row " + str(i))
-        json_documents.append(json_)
 
 
 # initialize the Generator
 avro_generator: AvroSchemaGenerator = AvroSchemaGenerator()
-# let it run and create a schema object
-avro_schema: Schema = avro_generator.create_schema(json_documents)
+# let it run and create a schema object, the files are streamed through the analyzer and never loaded into a list
+avro_schema: Schema = avro_generator.create_schema_from_files(files, ndjson=False)
 
 # NOTE: use the internal function and not anything else because it will remove empty attributes which might
 # otherwise lead to an invalid AVRO Schema!
@@ -38,5 +30,6 @@ with open(schema_path, "r") as value_schema_file:
     value_schema_str = value_schema_file.read()
 
 # if you want to, try to validate the data
-for i in range(0, len(json_documents)):
-    fastavro.validation.validate(json_documents[i], fastavro.parse_schema(json.loads(value_schema_str)))
+parsed_schema = fastavro.parse_schema(json.loads(value_schema_str))
+for json_document in FileReader(ndjson=False).read_documents(files):
+    fastavro.validation.validate(json_document, parsed_schema)
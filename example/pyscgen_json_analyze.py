@@ -4,6 +4,7 @@ import datetime
 from typing import List, Any
 
 from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
+from pyscgen.json.ingest.file_reader import FileReader
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -20,16 +21,11 @@ class JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
-# get at least one json documente, load it and put it in a list
-json_documents: List[dict] = []
+# get at least one json document, each file holds one document. For newline-delimited JSON files, use ndjson=True.
 files: list = glob.glob(pathname="./data/*.json")
-i = 0
-for file_path in files:
-    with open(file_path, "r") as file:
-        json_ = json.load(file)
-        i += 1
-        print("working on row " + str(i))
-        json_documents.append(json_)
+# analyze needs all documents for the flattened DataFrames, so they are read into a list here.
+# If you only need the column infos, use json_analyzer.analyze_files(files, ndjson=False), which streams the files.
+json_documents: List[dict] = list(FileReader(ndjson=False).read_documents(files))
 
 # initialize the JSONAnalyzer
 json_analyzer: JSONAnalyzer = JSONAnalyzer()
@@ -1,27 +1,16 @@
 import glob
-import json
-import fastavro
-from typing import List
 
 from pyscgen.pydantic.schema.create_schema import PydanticSchemaGenerator
 
 
-# get at least one json documente, load it and put it in a list
-json_documents: List[dict] = []
+# get at least one json document, each file holds one document. For newline-delimited JSON files, use ndjson=True.
 files: list = glob.glob(pathname="./data/*.json")
-i = 0
-for file_path in files:
-    with open(file_path, "r") as file:
-        json_ = json.load(file)
-        i += 1
-        print("working on row " + str(i))
-        json_documents.append(json_)
 
 
 # initialize the Generator
 pydantic_generator: PydanticSchemaGenerator = PydanticSchemaGenerator()
-# let it run and create a schema object
-pydantic_schema = pydantic_generator.create_schema(json_documents)
+# let it run and create a schema object, the files are streamed through the analyzer and never loaded into a list
+pydantic_schema = pydantic_generator.create_schema_from_files(files, ndjson=False)
 
 # writing the output so you can see the results or do whatever you like
 schema_path: str = "./out/pyndantic_model.py"
@@ -180,31 +180,47 @@ class DataTypeConfig:
             type_config: dict = self.data_type_config[self.default_data_type]
         return DataTypeConfigModel(**type_config)
 
-    def choose_type_info(self, data_types: []) -> DataTypeConfigModel:
+    def get_dominant_type(self, data_types: [], data_type_counts: [int], dominance_threshold: float) -> Any:
+        """
+        Returns the non-null datatype which makes up at least dominance_threshold of all non-null values.
+        :param data_types: list of found datatypes
+        :param data_type_counts: number of values of each datatype, in the same order as data_types
+        :param dominance_threshold: share (0,1] of the non-null values the datatype must have
+        :return: the dominant datatype or None if there is none
+        """
+        counts: dict = {data_type: count for data_type, count in zip(data_types, data_type_counts)
+                        if self.get_clean_type_string(str(data_type)).lower() != self.none_data_type.lower()}
+        total: int = sum(counts.values())
+        if total == 0:
+            return None
+        dominant_type = max(counts, key=counts.get)
+        if counts[dominant_type] / total >= dominance_threshold:
+            return dominant_type
+        return None
+
+    def choose_type_info(self, data_types: [], data_type_counts: [int] = None,
+                         dominance_threshold: float = None) -> DataTypeConfigModel:
         """
         Pass in a list of datatypes and get back the matchin one.
-        Basically, if the list contains multiple datatypes, the default_data_type is returned which usually is string.
+        Null is ignored, so a single datatype besides null is returned as it is.
+        If the list contains multiple non-null datatypes, the default_data_type is returned which usually is string,
+        unless one datatype is dominant - see get_dominant_type - if data_type_counts and dominance_threshold are set.
         Otherwise, the magic DataTypeConfig is extracted and returned.
         :param data_types:
+        :param data_type_counts: number of values of each datatype, in the same order as data_types
+        :param dominance_threshold: share (0,1] of the non-null values a datatype needs to be chosen over the default
         :return:
         """
-        data_type_config: DataTypeConfigModel
-        if len(data_types) == 2:
-            for i, data_type in enumerate(data_types):
-                data_type = str(data_type)
-                cleaned_type: str = self.get_clean_type_string(data_type).lower()
-                if cleaned_type == self.none_data_type.lower():
-                    if i == 1:
-                        selector = 0
-                    else:
-                        selector = 1
-                    data_type_str: str = str(data_types[selector])
-                    data_type_config = self.get_type_info_by_name(data_type_str)
-                else:
-                    data_type_config = self.get_type_info_by_name(self.default_data_type)
-        elif data_types is None:
-            data_type_config = self.get_type_info_by_name(self.default_data_type)
-        else:
-            data_type_str: str = str(data_types[0])
-            data_type_config = self.get_type_info_by_name(data_type_str)
-        return data_type_config
+        if not data_types:
+            return self.get_type_info_by_name(self.default_data_type)
+        non_null_types: list = [data_type for data_type in data_types
+                                if self.get_clean_type_string(str(data_type)).lower() != self.none_data_type.lower()]
+        if not non_null_types:
+            return self.get_type_info_by_name(str(data_types[0]))
+        if len(non_null_types) == 1:
+            return self.get_type_info_by_name(str(non_null_types[0]))
+        if data_type_counts is not None and dominance_threshold is not None:
+            dominant_type = self.get_dominant_type(data_types, data_type_counts, dominance_threshold)
+            if dominant_type is not None:
+                return self.get_type_info_by_name(str(dominant_type))
+        return self.get_type_info_by_name(self.default_data_type)
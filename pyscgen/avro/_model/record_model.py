@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import json
 import warnings
 from abc import ABC, abstractmethod
+from copy import deepcopy
 from typing import List, Optional, Union, Any
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, fields, is_dataclass
 from pydantic import validator
 from pyscgen.avro._model.__model_config import ModelConfig
 
+# values of these types are immutable and taken over as they are by AvroEntity.as_dict
+_SCALAR_TYPES: frozenset = frozenset((str, int, float, bool, bytes))
+
 
 @dataclass
 class AvroEntity(ABC):
@@ -18,42 +23,123 @@ class AvroEntity(ABC):
             Defaults to True.
         :return:
         """
+        if not remove_empty:
+            return asdict(self)
+        return self.__serialize(self)
 
-        avro_entity = asdict(self)
-
-        def remove_empty_dicts(dict_: dict):
-            """
-
-            :param dict_:
-            :return:
-            """
-            new_dict = {}
-            for k, v in dict_.items():
-                if isinstance(v, dict):
-                    v = remove_empty_dicts(v)
-                if v is not None:
-                    new_dict[k] = v
-            return new_dict or None
-
-        def remove_nones(obj):
-            """
-            Source:
-            https://stackoverflow.com/questions/20558699/python-how-recursively-remove-none-values-from-a-nested-data-structure-lists-a
-            :param obj:
-            :return:
-            """
-            if isinstance(obj, (list, tuple, set)):
-                return type(obj)(remove_nones(x) for x in obj if x is not None)
-            elif isinstance(obj, dict):
-                return type(obj)((remove_nones(k), remove_nones(v))
-                                 for k, v in obj.items() if k is not None and v is not None)
-            else:
-                return obj
-
-        if remove_empty:
-            avro_entity = remove_empty_dicts(remove_nones(avro_entity))
+    def as_json(self, remove_empty: bool = True, indent: Optional[int] = None) -> str:
+        """
+        Converts the dataclass to the JSON of an avsc file, which works for any nesting depth of the schema
+        :param remove_empty: If True, removes all keys with None values from the avro schema, see as_dict.
+            Defaults to True.
+        :param indent: indentation of the JSON, see json.dumps. Defaults to None, which means a single line.
+        :return:
+        """
+        avro_dict: Optional[dict] = self.as_dict(remove_empty=remove_empty)
+        try:
+            return json.dumps(avro_dict, indent=indent)
+        except RecursionError:
+            # the schema is nested too deeply for the json module
+            return self.__dump_json(avro_dict, indent)
 
-        return avro_entity
+    @staticmethod
+    def __dump_json(value: Any, indent: Optional[int] = None) -> str:
+        """
+        Encodes a value to the same JSON as json.dumps, but with an explicit stack, so there is no limit for the
+        nesting depth. Scalars are encoded by json.dumps.
+        :param value: e.g. the result of as_dict
+        :param indent: indentation, see json.dumps
+        :return:
+        """
+        item_separator: str = ", " if indent is None else ","
+        parts: List[str] = []
+        # str are emitted as they are, tuples (value, depth) are encoded
+        stack: list = [(value, 0)]
+        while stack:
+            entry = stack.pop()
+            if type(entry) is str:
+                parts.append(entry)
+                continue
+            value, depth = entry
+            if isinstance(value, dict):
+                items: list = [(json.dumps(key if type(key) is str else json.dumps(key)) + ": ", child)
+                               for key, child in value.items()]
+                opening, closing = "{", "}"
+            elif isinstance(value, (list, tuple)):
+                items: list = [("", child) for child in value]
+                opening, closing = "[", "]"
+            else:
+                parts.append(json.dumps(value))
+                continue
+            if not items:
+                parts.append(opening + closing)
+                continue
+            parts.append(opening)
+            if indent is None:
+                first_prefix, prefix, stack_closing = "", item_separator, closing
+            else:
+                first_prefix = "\n" + " " * (indent * (depth + 1))
+                prefix = item_separator + first_prefix
+                stack_closing = "\n" + " " * (indent * depth) + closing
+            stack.append(stack_closing)
+            for index in range(len(items) - 1, -1, -1):
+                key, child = items[index]
+                stack.append((child, depth + 1))
+                stack.append((prefix if index else first_prefix) + key)
+        return "".join(parts)
+
+    @staticmethod
+    def __serialize(entity: AvroEntity) -> Optional[dict]:
+        """
+        Converts an entity to a dict in a single pass, which is equal to removing all None values and keys of
+        dataclasses.asdict, and afterwards all dicts which are empty and nested directly in dicts - but not within
+        lists - like the schema itself, if it has no values. Tuples become lists.
+        The entity is walked with an explicit stack, so there is no limit for the nesting depth.
+        :param entity: dataclass which is converted
+        :return: the dict or None, if it is empty
+        """
+        root: dict = {}
+        # the values which still need to be converted into their new container, and if the container is a dict
+        # which is nested directly in dicts up to the root. Containers within lists never are.
+        stack: list = [(entity, root, True)]
+        # dicts which are removed from their parent dict if they are empty in the end: (parent, key, dict)
+        removable: list = []
+        while stack:
+            source, target, directly_nested = stack.pop()
+            is_list: bool = type(target) is list
+            if is_list:
+                items = enumerate(source)
+            elif is_dataclass(source):
+                items = ((field_.name, getattr(source, field_.name)) for field_ in fields(source))
+            else:
+                items = source.items()
+            for key, value in items:
+                if key is None or value is None:
+                    continue
+                value_type: type = type(value)
+                if value_type in _SCALAR_TYPES:
+                    child = value
+                elif value_type is dict or (is_dataclass(value) and not isinstance(value, type)):
+                    child = {}
+                    stack.append((value, child, directly_nested))
+                    if directly_nested:
+                        removable.append((target, key, child))
+                elif value_type is list or value_type is tuple:
+                    child = []
+                    stack.append((value, child, False))
+                elif value_type is set or value_type is frozenset:
+                    child = value_type(element for element in deepcopy(value) if element is not None)
+                else:
+                    child = deepcopy(value)
+                if is_list:
+                    target.append(child)
+                else:
+                    target[key] = child
+        # children are listed after their parents, so they are removed first and their parents become empty
+        for parent, key, child in reversed(removable):
+            if not child:
+                del parent[key]
+        return root or None
 
     @abstractmethod
     def add_item(self, item: Any):
@@ -82,9 +168,9 @@ class AvroEntity(ABC):
         for element in list_:
             if type(element) in (Array, ArrayItem, Field, Record):
                 result = element.find_child(name)
-            else:
-                result = None
-        return result
+                if result is not None:
+                    return result
+        return None
 
 
 @dataclass
@@ -223,9 +309,10 @@ class ArrayItem(AvroEntity):
             for field in self.fields:
                 if type(field) == list:
                     result = self.find_child_list(field, name)
-                else:
-                    if field.name == name:
-                        result = field
+                elif field.name == name:
+                    result = field
+                if result is not None:
+                    return result
         else:
             result = self
         return result
@@ -332,6 +419,8 @@ class Record(AvroEntity):
                             result = field
                     except Exception as e:
                         print(e)
+                if result is not None:
+                    return result
         else:
             result = self
         return result
@@ -383,7 +472,8 @@ class Schema(AvroEntity):
         for field in self.fields:
             if type(field) == list:
                 result = self.find_child_list(field, name)
-            else:
-                if field.name == name:
-                    result = field
+            elif field.name == name:
+                result = field
+            if result is not None:
+                return result
         return result
@@ -1,15 +1,22 @@
-import traceback
+import itertools
+import json
 import warnings
-from typing import Any, Union, List, NoReturn
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Optional, Union, List, NoReturn
 
 from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
-from pyscgen.json._model.analyze_model import ColumnInfo
+from pyscgen.json._model.analyze_model import ColumnInfo, ColumnInfos
 from pyscgen.avro._model.record_model import Field, Array, Schema, Record
 
 
+# python types which fastavro encodes as the primitive AVRO types, other than string
+_AVRO_PYTHON_TYPES: Dict[str, tuple] = {"int": (int,), "long": (int,), "float": (float, int), "double": (float, int),
+                                        "boolean": (bool,), "bytes": (bytes,)}
+
+
 class AvroSchemaGenerator:
 
-    def __init__(self, alphabetically_ordered_by_path: bool = False, debug: bool = False):
+    def __init__(self, alphabetically_ordered_by_path: bool = False, debug: bool = False,
+                 type_dominance_threshold: float = None):
         """
 
         :param alphabetically_ordered_by_path:
@@ -17,12 +24,16 @@ class AvroSchemaGenerator:
             This comes in handy if you need a more deterministic solution.
         :param debug: If True, Debug inf is printed out.
             Defaults to False.
+        :param type_dominance_threshold: If set, fields with mixed types get the type which makes up at least this
+            share of the values instead of string, see JSONAnalyzer. Defaults to None.
         """
-        self.json_analyzer = JSONAnalyzer(alphabetically_ordered_by_path=alphabetically_ordered_by_path)
+        self.json_analyzer = JSONAnalyzer(alphabetically_ordered_by_path=alphabetically_ordered_by_path,
+                                          type_dominance_threshold=type_dominance_threshold)
         self.debug = debug
         self.__list_symbol_extended: str = self.json_analyzer.path_concat_separator + self.json_analyzer.list_symbol
 
-    def create_schema(self, docs: [dict], name: str = "PyScGenClass", namespace: str = "com.pyscgen.avro") -> Schema:
+    def create_schema(self, docs: [dict], name: str = "PyScGenClass", namespace: str = "com.pyscgen.avro",
+                      workers: int = None, sample: int = None) -> Schema:
         """
         Create an AVRO-Schema based on the given JSON-Documents/Dicts.
         Internally, the json analyzer and merger are used which is present in this package to gather all needed
@@ -30,10 +41,128 @@ class AvroSchemaGenerator:
         :param docs: List of dicts on which data the AVRO-Schema will be based on
         :param name: Name of the AVRO-Schema used in the "name" Attribute
         :param namespace: AVRO Namespace.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the schema is inferred from a bounded sample of at most this number of documents,
+            see JSONAnalyzer.analyze. Defaults to None, which means all documents are analyzed.
+        :return:
+        """
+        column_infos: ColumnInfos = self.json_analyzer.analyze(docs=docs, workers=workers, sample=sample).column_infos
+        return self.create_schema_from_column_infos(column_infos, name=name, namespace=namespace)
+
+    def create_schema_from_files(self, paths: Union[str, List[str]], name: str = "PyScGenClass",
+                                 namespace: str = "com.pyscgen.avro", ndjson: bool = True, workers: int = None,
+                                 sample: int = None, parser_backend: str = "auto") -> Schema:
+        """
+        Create an AVRO-Schema based on JSON files. The files are streamed through the JSON analyzer, see
+        JSONAnalyzer.analyze_files, so they are never loaded into memory as a whole.
+        :param paths: a single path or a list of paths
+        :param name: Name of the AVRO-Schema used in the "name" Attribute
+        :param namespace: AVRO Namespace.
+        :param ndjson: If True, the files contain newline-delimited JSON, one document per line. If False, each file
+            holds exactly one JSON document. Defaults to True.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the schema is inferred from a bounded sample of at most this number of documents.
+            Defaults to None, which means all documents are analyzed.
+        :param parser_backend: JSON decoding backend, see JSONAnalyzer.analyze_files. Defaults to "auto".
+        :return:
+        """
+        column_infos: ColumnInfos = self.json_analyzer.analyze_files(paths, ndjson=ndjson, workers=workers,
+                                                                     sample=sample, parser_backend=parser_backend)
+        return self.create_schema_from_column_infos(column_infos, name=name, namespace=namespace)
+
+    async def create_schema_async(self, docs: AsyncIterable[dict], name: str = "PyScGenClass",
+                                  namespace: str = "com.pyscgen.avro", batch_size: int = 1000,
+                                  stop_after_stable: int = None, sample: int = None) -> Schema:
+        """
+        Create an AVRO-Schema based on an async iterable of JSON documents, e.g. the consumer of a message bus.
+        The documents are folded into the analysis as they arrive, see JSONAnalyzer.analyze_async.
+        :param docs: async iterable of dicts on which data the AVRO-Schema will be based on
+        :param name: Name of the AVRO-Schema used in the "name" Attribute
+        :param namespace: AVRO Namespace.
+        :param batch_size: number of documents which are folded at once. Defaults to 1000.
+        :param stop_after_stable: If set, the analysis stops once this number of documents in a row did not change
+            the schema. Defaults to None, which means all documents are analyzed.
+        :param sample: If set, the schema is based on a bounded sample of at most this number of documents.
+            Defaults to None, which means all documents are analyzed.
+        :return:
+        """
+        column_infos: ColumnInfos = await self.json_analyzer.analyze_async(docs, batch_size=batch_size,
+                                                                           stop_after_stable=stop_after_stable,
+                                                                           sample=sample)
+        return self.create_schema_from_column_infos(column_infos, name=name, namespace=namespace)
+
+    def infer_and_write(self, docs: Iterable[dict], out_path: str, name: str = "PyScGenClass",
+                        namespace: str = "com.pyscgen.avro", infer_from: int = None, batch_size: int = 1000,
+                        codec: str = "deflate", workers: int = None, sample: int = None) -> Schema:
+        """
+        Create an AVRO-Schema based on the given JSON-Documents/Dicts and encode the documents into an AVRO container
+        file with it. The documents are streamed into the file in blocks of batch_size documents and coerced to the
+        schema on the way, e.g. values of fields with mixed types are converted to string and type outliers - see
+        type_dominance_threshold - to the dominant type, see __get_coercer. Documents which still do not match the
+        schema, e.g. because they were not part of the inferred ones, raise the error of fastavro. fastavro is an
+        optional dependency, install it with the "avro" extra.
+        :param docs: dicts which the AVRO-Schema is based on and which are written. If infer_from is not set, they
+            are iterated twice, so they must not be a one-shot iterator like a generator.
+        :param out_path: path of the AVRO file, an existing file is overwritten.
+        :param name: Name of the AVRO-Schema used in the "name" Attribute
+        :param namespace: AVRO Namespace.
+        :param infer_from: If set, the schema is inferred from this number of first documents only, which are
+            buffered, and all documents are written in a single pass. Defaults to None, which means the schema is
+            inferred from all documents in a first pass.
+        :param batch_size: number of documents which are written as one block of the container file.
+            Defaults to 1000.
+        :param codec: compression codec of the container file, see fastavro.writer. Defaults to "deflate".
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the schema is inferred from a bounded sample of at most this number of the documents
+            it is inferred from, see infer_from. All documents are written. Documents with a structure which was
+            not sampled can fail to match the schema. Defaults to None, which means all documents are analyzed.
+        :return: the AVRO-Schema of the file
+        """
+        try:
+            import fastavro
+        except ImportError as e:
+            raise ImportError("infer_and_write needs fastavro, install it with: pip install pyscgen[avro]") from e
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if infer_from is None:
+            if iter(docs) is docs:
+                raise ValueError("docs is a one-shot iterator, which can´t be read twice. Set infer_from to infer the "
+                                 "schema from the first documents instead.")
+            # streamed, so the documents are never held in memory as a whole
+            column_infos: ColumnInfos = self.json_analyzer.analyze_stream(docs, workers=workers, sample=sample)
+        else:
+            docs = iter(docs)
+            head: List[dict] = list(itertools.islice(docs, infer_from))
+            column_infos: ColumnInfos = self.json_analyzer.analyze_stream(head, workers=workers, sample=sample)
+            docs = itertools.chain(head, docs)
+        schema: Schema = self.create_schema_from_column_infos(column_infos, name=name, namespace=namespace)
+        schema_dict: dict = schema.as_dict()
+        coerce: Callable[[Any], Any] = self.__get_coercer(schema_dict) or (lambda doc: doc)
+        with open(out_path, "wb") as file:
+            writer = fastavro.write.Writer(file, fastavro.parse_schema(schema_dict), codec=codec)
+            for index, doc in enumerate(docs, 1):
+                writer.write(coerce(doc))
+                if index % batch_size == 0:
+                    writer.flush()
+            writer.flush()
+        return schema
+
+    def create_schema_from_column_infos(self, column_infos: ColumnInfos, name: str = "PyScGenClass",
+                                        namespace: str = "com.pyscgen.avro") -> Schema:
+        """
+        Create an AVRO-Schema based on the ColumnInfos of the JSON analyzer.
+        :param column_infos: ColumnInfos, e.g. the result of JSONAnalyzer.analyze_stream
+        :param name: Name of the AVRO-Schema used in the "name" Attribute
+        :param namespace: AVRO Namespace.
         :return:
         """
         avro_schema: Schema = Schema(name=name, namespace=namespace)
-        _, column_infos, _, _, _ = self.json_analyzer.analyze(docs=docs)
+        # the AVRO elements, which the children of a column are added to, by path_id. Parents are always listed
+        # before their children, so each element is added to its parent with a single lookup.
+        containers: Dict[Optional[int], Any] = {None: avro_schema}
         column_info: ColumnInfo
         # loop over the analyzed column infos
         for column_info in column_infos.column_infos:
@@ -50,78 +179,150 @@ class AvroSchemaGenerator:
             if self.debug:
                 print("config: " + str({"path": column_info.path, "is_list": is_list, "is_dict": is_dict,
                                         "parent_is_list": parent_is_list, "parent_is_dict": parent_is_dict}))
-            avro_schema = self.__add_element(avro_schema, column_info, is_list, is_dict, has_parent, parent_is_list,
-                                             parent_is_dict)
+            self.__add_element(containers, column_info, is_list, is_dict, parent_is_list, parent_is_dict)
+            if self.debug:
+                print("avro_schema updated: " + str(avro_schema))
+                print("___________________________________________________")
 
         return avro_schema
 
-    def __add_element(self, avro_schema: Any, column_info: ColumnInfo, is_list: bool, is_dict: bool, has_parent: bool,
-                      parent_is_list: bool, parent_is_dict: bool
-                      ) -> NoReturn:
+    def __add_element(self, containers: Dict[Optional[int], Any], column_info: ColumnInfo, is_list: bool,
+                      is_dict: bool, parent_is_list: bool, parent_is_dict: bool) -> NoReturn:
         """
         Add a new element to the avro schema based on the given column infos
-        :param avro_schema: current avro schema where the new element should be appended
+        :param containers: AVRO elements by path_id, the element of the current column is added to the one of its
+            parent column. The schema itself is stored for the path_id None.
         :param column_info: column info object of the current column which should be appended to the schema
         :param is_list: True if the column is of type list
         :param is_dict: True if the column is of type dict
+        :param parent_is_list: True if the parent column is of type list
+        :param parent_is_dict: True if the parent column is of type dict
         :return:
         """
+        parent: Any = containers.get(column_info.parent_id)
+        if parent is None:
+            # the parent column is neither a dict nor a list, e.g. because of mixed types
+            warnings.warn("The column '" + column_info.path + "' is skipped, because its parent column is not a "
+                          "record or array in the AVRO-Schema.")
+            return
+        avro_element = self.__get_avro_element(column_info, is_list, is_dict, parent_is_list, parent_is_dict)
+        parent.add_item(avro_element)
+        if is_list or is_dict:
+            containers[column_info.path_id] = self.__get_container(avro_element)
+        if self.debug:
+            print("working on element: " + column_info.avro_path)
+            print(parent)
 
-        # use the datatype infos to append the correct value to the element
-        if not has_parent:
-            field: Field = self.__get_avro_element(column_info, is_list, is_dict, parent_is_list, parent_is_dict)
-            avro_schema.add_item(field)
-            if self.debug:
-                print(avro_schema)
-        else:
-            self.__assign_wrapper(avro_schema, column_info, is_list, is_dict, parent_is_list, parent_is_dict)
-        return avro_schema
+    @staticmethod
+    def __get_container(avro_element: Union[Field, Record, Array, list]) -> Union[Field, Record, Array]:
+        """
+        Returns the element which the children of a list or dict column are added to. A Field adds them to its
+        type, a nullable type ["null", ...] to the Record or Array within it.
+        :param avro_element: the result of __get_avro_element
+        :return:
+        """
+        if isinstance(avro_element, list):
+            return avro_element[-1]
+        return avro_element
 
-    def __assign_wrapper(self, avro_schema: Any,
-                         column_info: ColumnInfo,
-                         is_list: bool,
-                         is_dict: bool,
-                         parent_is_list: bool,
-                         parent_is_dict: bool,
-                         skip_errors: bool = False):
-        """
-        Creat
-        :param avro_schema:
-        :param column_info:
-        :param is_list:
-        :param is_dict:
-        :param skip_errors:
+    @staticmethod
+    def __to_string(value: Any) -> Optional[str]:
+        """
+        Convert a value of a string field with mixed types to string. Numbers, booleans, dicts and lists are
+        converted to JSON, e.g. true instead of True, values of other types like datetimes by str.
+        :param value:
         :return:
         """
-        path = column_info.parent_config.avro_path
-        path_elements_list: list = path.split(self.json_analyzer.path_concat_separator)
-        avro_element = self.__get_avro_element(column_info, is_list, is_dict, parent_is_list, parent_is_dict)
-        avro_schema_ref = avro_schema
-        try:
-            for element in path_elements_list:
-                if self.debug:
-                    print("working on element:" + element)
-                # if element == self.json_analyzer.list_symbol:
-                # save an avro schema reference before search
-                # if the search returns no result, reset for the next search.
-                # This helps to iterate nested arrays because they don´t have a name attribute
-                avro_schema_ref_safe = avro_schema_ref
-                avro_schema_ref = avro_schema_ref.find_child(element)
-                if avro_schema_ref is None:
-                    avro_schema_ref = avro_schema_ref_safe
-
-            avro_schema_ref.add_item(avro_element)
-            if self.debug:
-                print("Current AVRO-Schema: " + str(avro_schema.as_dict()))
-                print(avro_schema_ref)
-        except Exception as e:
-            error_info: dict = {"Error": str(e), "Traceback": traceback.format_exc()}
-            warnings.warn(str(error_info))
-            if not skip_errors:
-                raise e
-        if self.debug:
-            print("avro_schema updated: " + str(avro_schema))
-            print("___________________________________________________")
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (bool, int, float, dict, list, tuple)):
+            return json.dumps(value, default=str)
+        return str(value)
+
+    @staticmethod
+    def __to_primitive(avro_type: str, nullable: bool) -> Callable[[Any], Any]:
+        """
+        Returns a function which converts a value to a primitive AVRO type other than string. With a
+        type_dominance_threshold, a field gets the dominant type of its values, so the values of the other types -
+        the type outliers - are converted if possible, e.g. "7" to 7. Values which can´t be converted, e.g. "n/a",
+        become None if the field is nullable and raise a ValueError otherwise.
+        :param avro_type: primitive AVRO type, e.g. "int"
+        :param nullable: True if the field accepts null
+        :return:
+        """
+        def convert(value: Any) -> Any:
+            if avro_type in ("int", "long"):
+                if type(value) is float and not value.is_integer():
+                    raise ValueError
+                return int(value)
+            if avro_type in ("float", "double"):
+                return float(value)
+            if avro_type == "boolean" and isinstance(value, str) and value.lower() in ("true", "false"):
+                return value.lower() == "true"
+            if avro_type == "bytes" and isinstance(value, str):
+                return value.encode("utf-8")
+            raise ValueError
+
+        python_types: tuple = _AVRO_PYTHON_TYPES[avro_type]
+
+        def coerce(value: Any) -> Any:
+            if value is None or (type(value) in python_types):
+                return value
+            try:
+                return convert(value)
+            except (TypeError, ValueError, OverflowError):
+                if nullable:
+                    return None
+                raise ValueError("The value " + repr(value) + " can´t be converted to the AVRO type '" + avro_type +
+                                 "' of a field which is not nullable.") from None
+
+        return coerce
+
+    def __get_coercer(self, avro_type: Any, nullable: bool = False) -> Optional[Callable[[Any], Any]]:
+        """
+        Returns a function which converts a value to the given type of the AVRO-Schema, so it can be encoded: values
+        of string fields are converted to string, because mixed types result in string. Values of other primitive
+        types are converted to them, if there can be type outliers, see __to_primitive. Records and arrays are converted element by element, values
+        which do not match are returned as they are.
+        :param avro_type: type of a field or the schema itself, as in the output of Schema.as_dict
+        :param nullable: True if the type is part of a union with null
+        :return: the function or None, if no value within the type needs to be converted
+        """
+        if avro_type == "string":
+            return self.__to_string
+        if isinstance(avro_type, str) and avro_type in _AVRO_PYTHON_TYPES:
+            # without a type_dominance_threshold, mixed types result in string, so there are no type outliers
+            if self.json_analyzer.type_dominance_threshold is None:
+                return None
+            return self.__to_primitive(avro_type, nullable)
+        if isinstance(avro_type, list):
+            # nullable types are the only unions, None is returned as it is by all coercers
+            non_null_types: list = [union_type for union_type in avro_type if union_type != "null"]
+            return self.__get_coercer(non_null_types[0], "null" in avro_type) if len(non_null_types) == 1 else None
+        if not isinstance(avro_type, dict):
+            return None
+        if avro_type.get("type") == "array":
+            coerce_item: Optional[Callable[[Any], Any]] = self.__get_coercer(avro_type.get("items"))
+            if coerce_item is None:
+                return None
+            return lambda value: [coerce_item(item) for item in value] if isinstance(value, list) else value
+        if avro_type.get("type") == "record":
+            field_coercers: list = [(field["name"], self.__get_coercer(field["type"]))
+                                    for field in avro_type.get("fields", [])]
+            if not any(coerce_field is not None for _, coerce_field in field_coercers):
+                return None
+
+            def coerce_record(value: Any) -> Any:
+                if not isinstance(value, dict):
+                    return value
+                record: dict = {}
+                for field_name, coerce_field in field_coercers:
+                    field_value: Any = value.get(field_name)
+                    record[field_name] = field_value if coerce_field is None else coerce_field(field_value)
+                return record
+
+            return coerce_record
+        return self.__get_coercer(avro_type.get("type"))
 
     @staticmethod
     def __get_avro_element(column_info: ColumnInfo, is_list: bool, is_dict: bool,
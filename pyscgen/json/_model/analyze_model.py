@@ -1,5 +1,5 @@
 from typing import List, Optional
-from dataclasses import asdict
+from dataclasses import asdict, field
 from pydantic.dataclasses import dataclass
 
 from pyscgen.json._model.__model_config import ModelConfig
@@ -13,12 +13,14 @@ class ParentColumnInfo:
     avro_path: str
     avro_name: str
     data_type_config: Optional[DataTypeConfigModel] = None
+    path_id: Optional[int] = None
 
     def __init__(self, name: str,
                  path: str,
                  avro_path: str,
                  avro_name: str,
-                 data_type_config: Optional[DataTypeConfigModel] = None):
+                 data_type_config: Optional[DataTypeConfigModel] = None,
+                 path_id: Optional[int] = None):
         """
         Information about the parent column of the current Colum
         :param name: Name of the parent column
@@ -26,12 +28,14 @@ class ParentColumnInfo:
         :param avro_path: AVRO Path
         :param avro_name:  AVRO Name
         :param data_type_config: DataTypeConfigModel object
+        :param path_id: integer ID of the parent column
         """
         self.name = name
         self.path = path
         self.avro_name = avro_name
         self.avro_path = avro_path
         self.data_type_config = data_type_config
+        self.path_id = path_id
 
 
 @dataclass(config=ModelConfig)
@@ -47,6 +51,21 @@ class ColumnInfo:
     avro_name: str
     data_type_config: Optional[DataTypeConfigModel] = None
     parent_config: Optional[ParentColumnInfo] = None
+    distinct_count: Optional[int] = None
+    distinct_count_approximate: bool = False
+    path_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    depth: int = 0
+    children_ids: List[int] = field(default_factory=list)
+    nullability_confidence: float = 1.0
+    data_type_counts: List[int] = field(default_factory=list)
+    type_outlier_count: int = 0
+    present_count: int = 0
+    null_count: int = 0
+    missing_count: int = 0
+    array_length_min: Optional[int] = None
+    array_length_max: Optional[int] = None
+    array_length_mean: Optional[float] = None
 
     def __init__(self, name: str,
                  path: str,
@@ -58,7 +77,22 @@ class ColumnInfo:
                  avro_path: str,
                  avro_name: str,
                  data_type_config: Optional[DataTypeConfigModel] = None,
-                 parent_config: Optional[ParentColumnInfo] = None
+                 parent_config: Optional[ParentColumnInfo] = None,
+                 distinct_count: Optional[int] = None,
+                 distinct_count_approximate: bool = False,
+                 path_id: Optional[int] = None,
+                 parent_id: Optional[int] = None,
+                 depth: int = 0,
+                 children_ids: Optional[List[int]] = None,
+                 nullability_confidence: float = 1.0,
+                 data_type_counts: Optional[List[int]] = None,
+                 type_outlier_count: int = 0,
+                 present_count: int = 0,
+                 null_count: int = 0,
+                 missing_count: int = 0,
+                 array_length_min: Optional[int] = None,
+                 array_length_max: Optional[int] = None,
+                 array_length_mean: Optional[float] = None
                  ):
         """
         Column Info Object.
@@ -67,7 +101,8 @@ class ColumnInfo:
         :param path: JSON path to access the column
         :param has_nulls: True if null values are present
         :param density: Percentage (0,1) of how densely the column is populated. 1 means no null-values are present
-        :param unique_values: list of unique values of this column in the given documents
+        :param unique_values: list of unique values of this column in the given documents.
+            If distinct_count_approximate is True, only a random sample of the unique values.
         :param data_types: list of found python datatypes of this column in the given documents
         :param mixed_types: True if daty_types holds more than one entry and therefore mixed types are present in this column.
         :param avro_path: AVRO path
@@ -75,6 +110,26 @@ class ColumnInfo:
         :param data_type_config: data type config
         :param parent_config: If the column is not a root element, a parent ColumnInfo object is present,
                 which describes the parent column.
+        :param distinct_count: number of distinct non-null values of this column in the given documents
+        :param distinct_count_approximate: True if distinct_count is an estimate, because the number of unique values
+                exceeded the max_unique_values of the JSONAnalyzer.
+        :param path_id: integer ID of the column in the path trie of the JSONAnalyzer
+        :param parent_id: path_id of the parent column, None for root elements
+        :param depth: nesting depth of the column, 0 for root elements
+        :param children_ids: path_ids of the direct child columns
+        :param nullability_confidence: Confidence (0,1) that has_nulls is correct. 1 if nulls were found or all
+                documents were analyzed. If only a sample was analyzed and no nulls were found, the probability that
+                nulls would have been found in the sample if at least min_null_rate of all documents had them.
+        :param data_type_counts: number of values of each datatype, in the same order as data_types
+        :param type_outlier_count: number of non-null values whose datatype differs from the dominant datatype, which
+                was chosen for the column because of the type_dominance_threshold of the JSONAnalyzer. 0 otherwise.
+        :param present_count: number of documents in which the column has at least one non-null value
+        :param null_count: number of documents in which the column is present, but only with null values
+        :param missing_count: number of documents in which the column is not present at all. An explicit null
+                and a missing key both make has_nulls True, these counts tell them apart.
+        :param array_length_min: minimum length of the lists of this column, None if the column holds no lists
+        :param array_length_max: maximum length of the lists of this column, None if the column holds no lists
+        :param array_length_mean: mean length of the lists of this column, None if the column holds no lists
 
         """
         self.name = name
@@ -88,6 +143,74 @@ class ColumnInfo:
         self.parent_config = parent_config
         self.avro_path = avro_path
         self.avro_name = avro_name
+        self.distinct_count = distinct_count
+        self.distinct_count_approximate = distinct_count_approximate
+        self.path_id = path_id
+        self.parent_id = parent_id
+        self.depth = depth
+        self.children_ids = children_ids if children_ids is not None else []
+        self.nullability_confidence = nullability_confidence
+        self.data_type_counts = data_type_counts if data_type_counts is not None else []
+        self.type_outlier_count = type_outlier_count
+        self.present_count = present_count
+        self.null_count = null_count
+        self.missing_count = missing_count
+        self.array_length_min = array_length_min
+        self.array_length_max = array_length_max
+        self.array_length_mean = array_length_mean
+
+    def as_dict(self) -> dict:
+        """
+        Returns the object as a dict
+        :return:
+        """
+        return asdict(self)
+
+
+@dataclass(config=ModelConfig)
+class AnalysisStatistics:
+    document_count: int
+    path_count: int
+    shape_cache_hits: int = 0
+    shape_cache_misses: int = 0
+    sample_size: Optional[int] = None
+    population_size: Optional[int] = None
+    last_change_index: int = -1
+    stopped_early: bool = False
+    parser_backend: Optional[str] = None
+
+    def __init__(self, document_count: int,
+                 path_count: int,
+                 shape_cache_hits: int = 0,
+                 shape_cache_misses: int = 0,
+                 sample_size: Optional[int] = None,
+                 population_size: Optional[int] = None,
+                 last_change_index: int = -1,
+                 stopped_early: bool = False,
+                 parser_backend: Optional[str] = None):
+        """
+        Statistics about the analysis run the ColumnInfos are based on.
+        :param document_count: number of analyzed documents
+        :param path_count: number of distinct paths found
+        :param shape_cache_hits: number of documents whose structural shape was already known, only their values
+            were folded into the accumulators.
+        :param shape_cache_misses: number of documents whose structure had to be walked
+        :param sample_size: number of sampled documents which were analyzed, None if no sampling was used.
+        :param population_size: number of documents seen, including the ones left out by sampling
+        :param last_change_index: index of the last analyzed document which added a path or data type or made a
+            path nullable, i.e. from the next document on the schema did not change anymore. -1 if no document did.
+        :param stopped_early: True if the analysis stopped consuming documents because the schema was stable
+        :param parser_backend: JSON decoding backend used to parse the documents, None if dicts were analyzed
+        """
+        self.document_count = document_count
+        self.path_count = path_count
+        self.shape_cache_hits = shape_cache_hits
+        self.shape_cache_misses = shape_cache_misses
+        self.sample_size = sample_size
+        self.population_size = population_size
+        self.last_change_index = last_change_index
+        self.stopped_early = stopped_early
+        self.parser_backend = parser_backend
 
     def as_dict(self) -> dict:
         """
@@ -100,13 +223,55 @@ class ColumnInfo:
 @dataclass(config=ModelConfig)
 class ColumnInfos:
     column_infos: List[ColumnInfo]
+    statistics: Optional[AnalysisStatistics] = None
 
-    def __init__(self, column_infos: [ColumnInfo]):
+    def __init__(self, column_infos: [ColumnInfo], statistics: Optional[AnalysisStatistics] = None):
         """
         ColumnInfos Object. Holds infos about all found columns which have been found in the given documents.
+        The columns form a tree via their path_id, parent_id and children_ids, which can be walked with get_roots,
+        get_children and get_parent without parsing the paths.
         :param column_infos: list of ColumnInfo objects
+        :param statistics: statistics about the analysis run, e.g. the number of analyzed documents
         """
         self.column_infos = column_infos
+        self.statistics = statistics
+        self.__by_id: Optional[dict] = None
+
+    def get_column_info(self, path_id: int) -> Optional[ColumnInfo]:
+        """
+        Returns the ColumnInfo with the given path_id or None, if there is none.
+        :param path_id:
+        :return:
+        """
+        if self.__by_id is None:
+            self.__by_id = {column_info.path_id: column_info for column_info in self.column_infos
+                            if column_info.path_id is not None}
+        return self.__by_id.get(path_id)
+
+    def get_roots(self) -> List[ColumnInfo]:
+        """
+        Returns the ColumnInfos of all root elements
+        :return:
+        """
+        return [column_info for column_info in self.column_infos if column_info.parent_id is None]
+
+    def get_parent(self, column_info: ColumnInfo) -> Optional[ColumnInfo]:
+        """
+        Returns the ColumnInfo of the parent column or None, if the column is a root element.
+        :param column_info:
+        :return:
+        """
+        if column_info.parent_id is None:
+            return None
+        return self.get_column_info(column_info.parent_id)
+
+    def get_children(self, column_info: ColumnInfo) -> List[ColumnInfo]:
+        """
+        Returns the ColumnInfos of the direct children of the column, in the order they were found.
+        :param column_info:
+        :return:
+        """
+        return [self.get_column_info(path_id) for path_id in column_info.children_ids]
 
     def as_dict(self) -> dict:
         """
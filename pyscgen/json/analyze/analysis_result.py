@@ -0,0 +1,143 @@
+import typing
+
+import pandas as pd
+
+from pyscgen.json._model.analyze_model import ColumnInfos
+from pyscgen.json._model.document_model import Collection
+from pyscgen.json.analyze.analysis_state import AnalysisState
+
+
+class AnalysisResult:
+
+    def __init__(self, column_infos: ColumnInfos,
+                 state: AnalysisState,
+                 flatten: typing.Callable[[], typing.Tuple[Collection, pd.DataFrame, pd.DataFrame]],
+                 get_unique: typing.Callable[[], pd.DataFrame]):
+        """
+        Result of JSONAnalyzer.analyze.
+        Only the column_infos are computed up front, the collection_data and the DataFrames are built the first time
+        they are accessed. For backwards compatibility, the result can still be unpacked like the former tuple:
+        collection_data, column_infos, df_flattened, df_dtypes, df_unique = result
+        :param column_infos: ColumnInfos of the analyzed documents
+        :param state: AnalysisState the column_infos are based on
+        :param flatten: callable which returns the collection_data, df_flattened and df_dtypes
+        :param get_unique: callable which returns df_unique
+        """
+        self.column_infos: ColumnInfos = column_infos
+        self.state: AnalysisState = state
+        self.__flatten = flatten
+        self.__get_unique = get_unique
+        self.__collection_data: typing.Optional[Collection] = None
+        self.__df_flattened: typing.Optional[pd.DataFrame] = None
+        self.__df_dtypes: typing.Optional[pd.DataFrame] = None
+        self.__df_unique: typing.Optional[pd.DataFrame] = None
+        self.__fields: typing.List[str] = ["collection_data", "column_infos", "df_flattened", "df_dtypes",
+                                           "df_unique"]
+
+    def __load_flattened(self):
+        """
+        Flatten the documents once and keep the collection_data, df_flattened and df_dtypes
+        :return:
+        """
+        if self.__collection_data is None:
+            self.__collection_data, self.__df_flattened, self.__df_dtypes = self.__flatten()
+
+    @property
+    def collection_data(self) -> Collection:
+        """
+        Infos about each document, columns present in it, if it is null, the data type etc.
+        :return:
+        """
+        self.__load_flattened()
+        return self.__collection_data
+
+    @property
+    def df_flattened(self) -> pd.DataFrame:
+        """
+        pandas DataFrame which holds the flattened json documents.
+        :return:
+        """
+        self.__load_flattened()
+        return self.__df_flattened
+
+    @property
+    def df_dtypes(self) -> pd.DataFrame:
+        """
+        pandas DataFrame which holds information about which dtypes are found in a column in the given documents.
+        :return:
+        """
+        self.__load_flattened()
+        return self.__df_dtypes
+
+    @property
+    def df_unique(self) -> pd.DataFrame:
+        """
+        pandas DataFrame which holds information about unique values of each flattened column.
+        :return:
+        """
+        if self.__df_unique is None:
+            self.__df_unique = self.__get_unique()
+        return self.__df_unique
+
+    def documents_with(self, path: str, with_nulls: bool = False) -> typing.List[int]:
+        """
+        Returns the indexes of the documents which contain the path. Needs JSONAnalyzer(track_presence=True).
+        If a sample was analyzed, the indexes refer to the sampled documents.
+        :param path: JSON path of the column
+        :param with_nulls: If True, a path counts as present if it is null. Otherwise, it needs a non-null value.
+        :return:
+        """
+        return list(self.state.find_documents(with_paths=[path], with_nulls=with_nulls).get_indexes())
+
+    def find_documents(self, with_paths: typing.Iterable[str] = (), without_paths: typing.Iterable[str] = (),
+                       with_nulls: bool = False) -> typing.List[int]:
+        """
+        Returns the indexes of the documents which contain all with_paths and none of the without_paths, e.g. the
+        documents which made a column nullable: find_documents(without_paths=[path]).
+        Needs JSONAnalyzer(track_presence=True).
+        :param with_paths: paths which must be present
+        :param without_paths: paths which must not be present
+        :param with_nulls: see documents_with
+        :return:
+        """
+        return list(self.state.find_documents(with_paths, without_paths, with_nulls).get_indexes())
+
+    def count_documents_with_shape(self, paths: typing.Iterable[str], with_nulls: bool = False) -> int:
+        """
+        Returns the number of documents in which exactly the given paths are present.
+        Needs JSONAnalyzer(track_presence=True).
+        :param paths: all paths of the shape, including the paths of nested elements, see get_document_paths
+        :param with_nulls: see documents_with
+        :return:
+        """
+        return self.state.count_documents_with_shape(paths, with_nulls)
+
+    def get_document_paths(self, document_index: int, with_nulls: bool = False) -> typing.List[str]:
+        """
+        Returns the paths which are present in a document. Needs JSONAnalyzer(track_presence=True).
+        :param document_index: index of the document
+        :param with_nulls: see documents_with
+        :return:
+        """
+        return self.state.get_document_paths(document_index, with_nulls)
+
+    def __iter__(self) -> typing.Iterator:
+        """
+        Iterate over all outputs in the order of the former tuple, this builds all lazy outputs.
+        :return:
+        """
+        for field in self.__fields:
+            yield getattr(self, field)
+
+    def __getitem__(self, index: typing.Union[int, slice]):
+        """
+        Access the outputs by their index in the former tuple.
+        :param index:
+        :return:
+        """
+        if isinstance(index, slice):
+            return tuple(getattr(self, field) for field in self.__fields[index])
+        return getattr(self, self.__fields[index])
+
+    def __len__(self) -> int:
+        return len(self.__fields)
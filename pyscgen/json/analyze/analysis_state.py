@@ -0,0 +1,274 @@
+import typing
+
+from pyscgen.json.analyze.path_accumulator import PathAccumulator, VALUE_PRESENT
+from pyscgen.json.analyze.path_trie import PathTrie, PathNode
+from pyscgen.json.analyze.presence_bitmap import PresenceBitmap
+
+
+class AnalysisState:
+
+    def __init__(self, max_unique_values: int = None, sample_size: int = 20, trie: PathTrie = None,
+                 track_presence: bool = False, track_unique_values: bool = True):
+        """
+        Partial analysis state of the JSONAnalyzer.
+        Holds per-path counts, found data types, null counts and unique values of all documents folded into it.
+        Two states can be combined with merge, which allows to analyze shards of the documents on separate workers
+        or machines and reduce the results afterwards. The ColumnInfos can be derived from any (merged) state with
+        JSONAnalyzer.create_column_infos.
+        :param max_unique_values: If set, the unique values of a path are tracked exactly only up to this number,
+            afterwards the distinct count is estimated. See PathAccumulator.
+        :param sample_size: number of example values kept per path once max_unique_values is exceeded
+        :param trie: PathTrie which maps the paths to integer IDs. If None, a new trie with the default path
+            symbols is created.
+        :param track_presence: If True, the documents in which a path is present and in which it is null are tracked
+            in bitmaps indexed by the document number, see get_presence_bitmap. Defaults to False.
+        :param track_unique_values: If False, the unique values are not tracked at all. See PathAccumulator.
+            Defaults to True.
+        """
+        self.max_unique_values: typing.Optional[int] = max_unique_values
+        self.sample_size: int = sample_size
+        self.track_presence: bool = track_presence
+        self.track_unique_values: bool = track_unique_values
+        self.document_count: int = 0
+        # documents which were seen, but left out by sampling
+        self.skipped_document_count: int = 0
+        self.trie: PathTrie = trie if trie is not None else PathTrie()
+        # accumulators indexed by the path ID of the trie
+        self.accumulators: typing.List[PathAccumulator] = []
+        # cache {shape: plan} used by the JSONAnalyzer to fold documents with a known structure, it is not serialized
+        self.shape_cache: dict = {}
+        self.shape_cache_hits: int = 0
+        self.shape_cache_misses: int = 0
+        # number of paths which were present and not null in every document so far
+        self.non_nullable_count: int = 0
+        # index of the last document which added a path, a data type or made a path nullable, -1 if none did
+        self.last_change_index: int = -1
+        # True if the analysis stopped consuming documents because the schema was stable
+        self.stopped_early: bool = False
+        # JSON decoding backend used to parse the documents, None if they were passed in as dicts
+        self.parser_backend: typing.Optional[str] = None
+
+    def __getstate__(self) -> dict:
+        """
+        Leave out the shape cache when the state is pickled, e.g. to be sent back from a worker process.
+        :return:
+        """
+        state: dict = self.__dict__.copy()
+        state["shape_cache"] = {}
+        return state
+
+    @property
+    def population_count(self) -> int:
+        """
+        Number of documents seen, including the ones left out by sampling
+        :return:
+        """
+        return self.document_count + self.skipped_document_count
+
+    def get_accumulator_by_id(self, path_id: int) -> PathAccumulator:
+        """
+        Returns the accumulator of the given path ID, accumulators are created for all new IDs of the trie.
+        :param path_id: ID of the path in the trie
+        :return:
+        """
+        accumulators: typing.List[PathAccumulator] = self.accumulators
+        while len(accumulators) <= path_id:
+            accumulators.append(PathAccumulator(self.trie.nodes[len(accumulators)].path,
+                                                max_unique_values=self.max_unique_values,
+                                                sample_size=self.sample_size,
+                                                track_presence=self.track_presence,
+                                                track_unique_values=self.track_unique_values))
+        return accumulators[path_id]
+
+    def add_document(self, document_accumulators: typing.Dict[PathAccumulator, int], changed: bool = False):
+        """
+        Count one document after its values were folded into the accumulators and track if it changed the schema.
+        :param document_accumulators: {accumulator: status} of all paths found in the document, status is the highest
+            status of the values of the path in the document, see PathAccumulator.add_value.
+        :param changed: True if the document added a new path or data type
+        :return:
+        """
+        non_nullable_count: int = 0
+        document_index: typing.Optional[int] = self.document_count if self.track_presence else None
+        for accumulator, status in document_accumulators.items():
+            # only paths which have been present and not null in all documents so far can stay non-nullable
+            if status == VALUE_PRESENT and not accumulator.has_nulls(self.document_count):
+                non_nullable_count += 1
+            accumulator.add_document(status, document_index)
+        if changed or non_nullable_count != self.non_nullable_count:
+            self.non_nullable_count = non_nullable_count
+            self.last_change_index = self.document_count
+        self.document_count += 1
+
+    def get_stable_count(self) -> int:
+        """
+        Returns the number of documents since the last one which changed the schema
+        :return:
+        """
+        return self.document_count - 1 - self.last_change_index
+
+    def __get_schema_signature(self) -> typing.Tuple[int, int, int]:
+        """
+        Returns the number of paths, path/data type combinations and non-nullable paths, which change whenever
+        the schema changes.
+        :return:
+        """
+        return (len(self.accumulators),
+                sum(len(accumulator.data_types) for accumulator in self.accumulators),
+                self.non_nullable_count)
+
+    def get_accumulator(self, path: str) -> typing.Optional[PathAccumulator]:
+        """
+        Returns the accumulator of the given path or None, if the path is not known.
+        :param path: JSON path of the column
+        :return:
+        """
+        path_id: typing.Optional[int] = self.trie.get_id(path)
+        return None if path_id is None else self.get_accumulator_by_id(path_id)
+
+    def get_presence_bitmap(self, path: str, with_nulls: bool = False) -> PresenceBitmap:
+        """
+        Returns the bitmap of the documents in which the path is present with a non-null value. Dicts and lists
+        within a list count as present.
+        :param path: JSON path of the column
+        :param with_nulls: If True, the documents in which the path is present but null are included.
+        :return: PresenceBitmap, empty if the path is not known.
+        """
+        if not self.track_presence:
+            raise ValueError("Presence is not tracked, set track_presence to analyze the documents with bitmaps.")
+        accumulator: typing.Optional[PathAccumulator] = self.get_accumulator(path)
+        if accumulator is None:
+            return PresenceBitmap()
+        if not with_nulls:
+            return PresenceBitmap(bytearray(accumulator.present_bitmap.data))
+        return PresenceBitmap.from_int(accumulator.present_bitmap.to_int() | accumulator.null_bitmap.to_int())
+
+    def find_documents(self, with_paths: typing.Iterable[str] = (), without_paths: typing.Iterable[str] = (),
+                       with_nulls: bool = False) -> PresenceBitmap:
+        """
+        Returns the bitmap of the documents which contain all with_paths and none of the without_paths.
+        :param with_paths: paths which must be present
+        :param without_paths: paths which must not be present
+        :param with_nulls: If True, a path counts as present if it is null. Otherwise, it needs a non-null value.
+        :return: PresenceBitmap of the document indexes
+        """
+        bits: int = (1 << self.document_count) - 1
+        path: str
+        for path in with_paths:
+            bits &= self.get_presence_bitmap(path, with_nulls).to_int()
+        for path in without_paths:
+            bits &= ~self.get_presence_bitmap(path, with_nulls).to_int()
+        return PresenceBitmap.from_int(bits)
+
+    def count_documents_with_shape(self, paths: typing.Iterable[str], with_nulls: bool = False) -> int:
+        """
+        Returns the number of documents in which exactly the given paths are present, e.g. the shape of a document
+        returned by get_document_paths.
+        :param paths: all paths of the shape, including the paths of nested elements
+        :param with_nulls: see find_documents
+        :return:
+        """
+        paths = set(paths)
+        other_paths: typing.List[str] = [node.path for node in self.trie.nodes if node.path not in paths]
+        return self.find_documents(paths, other_paths, with_nulls).count()
+
+    def get_document_paths(self, document_index: int, with_nulls: bool = False) -> typing.List[str]:
+        """
+        Returns the paths which are present in a document
+        :param document_index: index of the document in the order it was analyzed
+        :param with_nulls: see find_documents
+        :return:
+        """
+        if not self.track_presence:
+            raise ValueError("Presence is not tracked, set track_presence to analyze the documents with bitmaps.")
+        return [accumulator.path for accumulator in self.accumulators
+                if document_index in accumulator.present_bitmap
+                or (with_nulls and document_index in accumulator.null_bitmap)]
+
+    def merge(self, other: "AnalysisState") -> "AnalysisState":
+        """
+        Merge another state into this one.
+        The documents of the other state are treated as if they were appended after the own documents.
+        The path IDs of the other state are mapped to the IDs of this state, new paths are added in the order of the
+        other state.
+        If the other state changes the schema of this state, its last change is taken over. Where exactly in the other
+        documents the change happened is not known then, so the first document of the other state is assumed at least.
+        :param other: state to merge into this one, it is not altered.
+        :return: self
+        """
+        signature: typing.Tuple[int, int, int] = self.__get_schema_signature()
+        own_document_count: int = self.document_count
+        if self.track_presence and not other.track_presence:
+            # the documents of the other state are not tracked, so the bitmaps would be incomplete
+            self.track_presence = False
+            for accumulator in self.accumulators:
+                accumulator.present_bitmap = None
+                accumulator.null_bitmap = None
+        if self.track_unique_values and not other.track_unique_values:
+            self.track_unique_values = False
+            for accumulator in self.accumulators:
+                accumulator.stop_tracking_unique_values()
+        self.document_count += other.document_count
+        self.skipped_document_count += other.skipped_document_count
+        self.shape_cache_hits += other.shape_cache_hits
+        self.shape_cache_misses += other.shape_cache_misses
+        id_map: typing.List[int] = []
+        node: PathNode
+        for node in other.trie.nodes:
+            parent_id: typing.Optional[int] = None if node.parent_id is None else id_map[node.parent_id]
+            id_map.append(self.trie.get_child_id(parent_id, node.name))
+        for path_id, accumulator in enumerate(other.accumulators):
+            self.get_accumulator_by_id(id_map[path_id]).merge(accumulator, own_document_count)
+        self.non_nullable_count = sum(1 for accumulator in self.accumulators
+                                      if not accumulator.has_nulls(self.document_count))
+        if other.last_change_index >= 0 and (own_document_count == 0 or signature != self.__get_schema_signature()):
+            self.last_change_index = own_document_count + other.last_change_index
+        elif signature != self.__get_schema_signature():
+            self.last_change_index = own_document_count
+        self.stopped_early = self.stopped_early or other.stopped_early
+        self.parser_backend = self.parser_backend or other.parser_backend
+        return self
+
+    def as_dict(self) -> dict:
+        """
+        Returns the state as a dict which can be serialized, e.g. to JSON, and restored with from_dict
+        :return:
+        """
+        return {
+            "max_unique_values": self.max_unique_values,
+            "sample_size": self.sample_size,
+            "track_presence": self.track_presence,
+            "track_unique_values": self.track_unique_values,
+            "document_count": self.document_count,
+            "skipped_document_count": self.skipped_document_count,
+            "shape_cache_hits": self.shape_cache_hits,
+            "shape_cache_misses": self.shape_cache_misses,
+            "non_nullable_count": self.non_nullable_count,
+            "last_change_index": self.last_change_index,
+            "stopped_early": self.stopped_early,
+            "parser_backend": self.parser_backend,
+            "trie": self.trie.as_dict(),
+            "accumulators": [accumulator.as_dict() for accumulator in self.accumulators]
+        }
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> "AnalysisState":
+        """
+        Create a state from the output of as_dict
+        :param dict_:
+        :return:
+        """
+        state = cls(max_unique_values=dict_.get("max_unique_values"), sample_size=dict_.get("sample_size", 20),
+                    trie=PathTrie.from_dict(dict_["trie"]), track_presence=dict_.get("track_presence", False),
+                    track_unique_values=dict_.get("track_unique_values", True))
+        state.document_count = dict_["document_count"]
+        state.skipped_document_count = dict_.get("skipped_document_count", 0)
+        state.shape_cache_hits = dict_.get("shape_cache_hits", 0)
+        state.shape_cache_misses = dict_.get("shape_cache_misses", 0)
+        state.non_nullable_count = dict_.get("non_nullable_count", 0)
+        state.last_change_index = dict_.get("last_change_index", -1)
+        state.stopped_early = dict_.get("stopped_early", False)
+        state.parser_backend = dict_.get("parser_backend")
+        for accumulator_dict in dict_["accumulators"]:
+            state.accumulators.append(PathAccumulator.from_dict(accumulator_dict))
+        return state
@@ -1,29 +1,174 @@
+import asyncio
 import collections.abc as collections
+import functools
+import itertools
 import operator
+import random
 import typing
+import warnings
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 
 import shortuuid
 import pandas as pd
 
 from pyscgen.json._model.document_model import Document, Collection, Column
-from pyscgen.json._model.analyze_model import ColumnInfo, ColumnInfos, ParentColumnInfo
+from pyscgen.json._model.analyze_model import ColumnInfo, ColumnInfos, ParentColumnInfo, AnalysisStatistics
+from pyscgen.json.analyze.path_accumulator import PathAccumulator, ELEMENT_CONTAINER
+from pyscgen.json.analyze.analysis_state import AnalysisState
+from pyscgen.json.analyze.path_trie import PathTrie, PathNode
+from pyscgen.json.analyze.shape_plan import ShapePlan
+from pyscgen.json.analyze.document_sampler import DocumentSampler
+from pyscgen.json.ingest.file_reader import FileReader
+from pyscgen.json.ingest.structure_scanner import StructureScanner
+from pyscgen.json.analyze.analysis_result import AnalysisResult
 from pyscgen.__config.dtype_config import DataTypeConfig
 
 
+# JSONAnalyzer of a worker process of the process pool, created once by _init_worker
+_worker_analyzer: typing.Optional["JSONAnalyzer"] = None
+
+
+def _init_worker(settings: dict):
+    """
+    Initializer of the process pool: create the JSONAnalyzer of the worker process from the settings of the
+    analyzer which started the pool, so only the chunks of documents have to be sent to the worker.
+    :param settings: keyword arguments of the JSONAnalyzer
+    :return:
+    """
+    global _worker_analyzer
+    _worker_analyzer = JSONAnalyzer(**settings)
+
+
+def _flatten_chunk(docs: [dict]) -> list:
+    """
+    Worker function of the process pool: flatten a chunk of documents.
+    :param docs: chunk of documents
+    :return:
+    """
+    return _worker_analyzer._flatten_documents(docs)
+
+
+def _analyze_chunk(docs: [dict]) -> AnalysisState:
+    """
+    Worker function of the process pool: fold a chunk of documents into a new AnalysisState.
+    :param docs: chunk of documents
+    :return:
+    """
+    return _worker_analyzer.analyze_state(docs)
+
+
+_END_OF_CONTAINER = object()
+_SCALAR, _MAPPING, _LIST = 0, 1, 2
+_CONTAINER_KINDS: typing.Dict[type, int] = {}
+_ARRAY_SAMPLINGS: typing.Tuple[str, ...] = ("head", "stride", "random")
+# documents with a longer shape are not cached, so the cache holds at most this number of entries per shape
+_MAX_SHAPE_LENGTH: int = 1024
+
+
+def _get_container_kind(data_type: type) -> int:
+    """
+    Returns if values of the type are walked as dict, as list or not at all.
+    The result is cached per type, which is a lot cheaper than an isinstance check against the abstract base classes
+    for every value.
+    :param data_type: python type
+    :return: _MAPPING, _LIST or _SCALAR
+    """
+    kind: typing.Optional[int] = _CONTAINER_KINDS.get(data_type)
+    if kind is None:
+        if issubclass(data_type, collections.MutableMapping):
+            kind = _MAPPING
+        elif issubclass(data_type, list):
+            kind = _LIST
+        else:
+            kind = _SCALAR
+        _CONTAINER_KINDS[data_type] = kind
+    return kind
+
+
 class JSONAnalyzer:
 
-    def __init__(self, alphabetically_ordered_by_path: bool = True):
+    def __init__(self, alphabetically_ordered_by_path: bool = True, max_unique_values: int = 10000,
+                 unique_values_sample_size: int = 20, shape_cache_size: int = 1000, stratified_sampling: bool = True,
+                 min_null_rate: float = 0.01, type_dominance_threshold: float = None, track_presence: bool = False,
+                 max_array_elements: int = None, array_sampling: str = "head", track_unique_values: bool = True):
         """
 
         :param alphabetically_ordered_by_path: If true, returns the analyzed elements ordered alphabetically by path.
             Defaults to True.
+        :param max_unique_values: If set, the unique values of each column are tracked exactly only up to this
+            number. Afterwards, the distinct count is estimated with a HyperLogLog sketch and only a random sample of
+            unique_values_sample_size values is kept, which bounds the memory for columns like IDs or timestamps.
+            Defaults to 10000, so the memory of a stream of documents stays bounded. None means the unique values
+            are always tracked exactly.
+        :param unique_values_sample_size: number of example values kept per column once max_unique_values is
+            exceeded. Defaults to 20.
+        :param shape_cache_size: maximum number of structural document shapes for which the list of path IDs is
+            cached. Documents with a known shape only fold their values into the accumulators without walking the
+            path trie again. The oldest shape is dropped once the cache is full. Large documents, e.g. with long lists,
+            are not cached, so the memory of a cached shape is bounded. Defaults to 1000, 0 disables the cache.
+        :param stratified_sampling: If True and a sample is drawn, one document of each structural shape (the set of
+            non-null paths and their data types) is always part of the sample, so rare shapes and optional fields are
+            not missed. This needs one structural walk per document. Defaults to True.
+        :param min_null_rate: share of documents with nulls, which a sample is expected to reveal. It is used to
+            calculate the nullability_confidence of columns without nulls in a sample. Defaults to 0.01.
+        :param type_dominance_threshold: If set, a column with multiple non-null data types gets the data type which
+            makes up at least this share (0,1] of its non-null values instead of the default type string. The values
+            of the other types are reported as type_outlier_count of the column. Defaults to None, which means mixed
+            types always fall back to string.
+        :param track_presence: If True, the documents in which each path is present and in which it is null are
+            tracked in bitmaps indexed by the document number, see AnalysisState.get_presence_bitmap.
+            This needs two bits per path and document. Defaults to False.
+        :param max_array_elements: If set, at most this number of elements of each list is inspected, which bounds
+            the cost of documents with long, homogeneous lists. The length statistics of the lists always count all
+            elements. Not applied with structure_only. Defaults to None, which means all elements are inspected.
+        :param array_sampling: which elements of a longer list are inspected: "head" for the first ones, "stride" for
+            elements evenly spread over the list or "random" for a random selection, which is the same for all lists
+            of the same length. Defaults to "head".
+        :param track_unique_values: If False, the values are neither hashed nor kept, so the columns have no
+            unique_values and no distinct_count. This is the cheapest setting if only the structure is needed.
+            Defaults to True.
         """
+        if array_sampling not in _ARRAY_SAMPLINGS:
+            raise ValueError("array_sampling must be one of " + str(_ARRAY_SAMPLINGS) + ", not " + repr(array_sampling))
         self.datatype_config = DataTypeConfig()
         self.alphabetically_ordered_by_path = alphabetically_ordered_by_path
+        self.max_unique_values = max_unique_values
+        self.unique_values_sample_size = unique_values_sample_size
+        self.shape_cache_size = shape_cache_size
+        self.stratified_sampling = stratified_sampling
+        self.min_null_rate = min_null_rate
+        self.type_dominance_threshold = type_dominance_threshold
+        self.track_presence = track_presence
+        self.max_array_elements = max_array_elements
+        self.array_sampling = array_sampling
+        self.track_unique_values = track_unique_values
         self.__list_symbol: str = "0"
         self.__path_concat_separator: str = "."
         self.__dict_path_append_name: str = "_record"
         self.__list_path_append_name: str = "_element"
+        self.__trie: PathTrie = self.__create_trie()
+        self.__stratum_trie: PathTrie = self.__create_trie()
+
+    def __create_trie(self) -> PathTrie:
+        """
+        Create an empty PathTrie with the path symbols of this analyzer
+        :return:
+        """
+        return PathTrie(path_concat_separator=self.__path_concat_separator,
+                        list_symbol=self.__list_symbol,
+                        dict_path_append_name=self.__dict_path_append_name)
+
+    def __create_state(self) -> AnalysisState:
+        """
+        Create a new, empty AnalysisState with the settings of the analyzer
+        :return:
+        """
+        return AnalysisState(max_unique_values=self.max_unique_values,
+                             sample_size=self.unique_values_sample_size,
+                             trie=self.__create_trie(),
+                             track_presence=self.track_presence,
+                             track_unique_values=self.track_unique_values)
 
     @property
     def list_symbol(self) -> str:
@@ -41,80 +186,159 @@ class JSONAnalyzer:
         """
         return self.__path_concat_separator
 
-    def __inspect_lists(self, list_: list, parent_key: str = '') -> (dict, dict):
+    def __get_array_elements(self, value: list) -> typing.Iterable:
         """
-        Inspect a list recursively.
-        :param list_: list which should be inspected
-        :param parent_key: if it´s not a root element, a parent key needs to be supplied for path building.
-            Defaults to ''
+        Returns the elements of a list which are inspected, only max_array_elements of them for longer lists.
+        :param value: list
         :return:
         """
-        items = []
-        dtypes = []
-        for element in list_:
-            path = parent_key + self.__path_concat_separator + self.__list_symbol
-            if isinstance(element, collections.MutableMapping):
-                items.append((path, None))
-                dtypes.append((path, type(element)))
-                recursive_data = self.__get_values_and_types(element, parent_key=path)
-                items.extend(recursive_data[0].items())
-                dtypes.extend(recursive_data[1].items())
-            else:
-                if isinstance(element, list):
-                    items.append((path, None))
-                    dtypes.append((path, type(element)))
-                    recursive_data = self.__inspect_lists(list_=element, parent_key=path)
-                    items.extend(recursive_data[0].items())
-                    dtypes.extend(recursive_data[1].items())
-                else:
-                    items.append((path, element))
-                    dtypes.append((path, type(element)))
-        items_hashable = self.__remove_unhashable(items)
-        items_hashable = dict(list(set(items_hashable)))
-        dtypes = dict(list(set(dtypes)))
-        return items_hashable, dtypes
-
-    def __get_values_and_types(self, doc: dict, parent_key: str = '') -> (dict, dict):
-        """
-        Inspect a document recursively to get the values and types for each element.
-        Hints taken from: https://stackoverflow.com/questions/6027558/flatten-nested-dictionaries-compressing-keys
-        :param doc: input document to get the values and types from.
-        :param parent_key: parent key - keep at default value, only needed for recursive calls.
+        length: int = len(value)
+        if self.max_array_elements is None or length <= self.max_array_elements:
+            return value
+        if self.array_sampling == "head":
+            return itertools.islice(value, self.max_array_elements)
+        if self.array_sampling == "stride":
+            return itertools.islice(value, 0, None, -(-length // self.max_array_elements))
+        # seeded by the length, so the walk and the shape of a document select the same elements
+        indexes: typing.List[int] = random.Random(length).sample(range(length), self.max_array_elements)
+        return [value[index] for index in sorted(indexes)]
+
+    def __walk(self, doc: dict, trie: PathTrie, array_lengths: list = None
+               ) -> typing.Iterator[typing.Tuple[int, type, typing.Any]]:
+        """
+        Walk a document depth first with an explicit stack instead of recursion, so there is no limit for the
+        nesting depth of the document.
+        For every element, dicts and lists included, a tuple (path_id, type, value) is emitted exactly once.
+        Dicts and lists directly under a key are emitted with themselves as value. Dicts and lists within a list -
+        on any level below it - are emitted with ELEMENT_CONTAINER as value. They count as present, but make the path
+        nullable and are flattened as None, like the former recursive implementation did.
+        Elements of lists share the path of the list extended by the list symbol. Of long lists, only the elements
+        selected by __get_array_elements are walked.
+        :param doc: input document to walk
+        :param trie: PathTrie which maps the paths to integer IDs, new paths are added to it.
+        :param array_lengths: If given, a tuple (path_id, length) is appended for every list.
         :return:
-        Returns a tuple with tho dictionaries:
-
-        - 1.: {key: value}: returns the key with the data present under it.
-        - 2.: {key: type}: returns the key with the associated type.
-        """
-        items = []
-        dtypes = []
-        for k, v in doc.items():
-            path = parent_key + self.__path_concat_separator + k if parent_key else k
-            if isinstance(v, collections.MutableMapping):
-                if k:
-                    # @TODO: Here, fix dict appended to items
-                    path = parent_key + self.__path_concat_separator + k if parent_key != "" else k
-                    items.append((path, v))
-                    dtypes.append((path, type(v)))
-                recursive_data = self.__get_values_and_types(v, path)
-                items.extend(recursive_data[0].items())
-                dtypes.extend(recursive_data[1].items())
+        """
+        get_array_elements = self.__get_array_elements
+        list_symbol: str = self.__list_symbol
+        nodes: list = trie.nodes
+        kinds: dict = _CONTAINER_KINDS
+        end = _END_OF_CONTAINER
+        # each entry holds the children of the container node, its path ID, an iterator over its content,
+        # if the container is a list and if the container is located within a list
+        stack: list = [(trie.root_children, None, iter(doc.items()), False, False)]
+        while stack:
+            children, parent_id, iterator, is_list, within_list = stack[-1]
+            item = next(iterator, end)
+            if item is end:
+                stack.pop()
+                continue
+            if is_list:
+                key, value = list_symbol, item
+                within_list = True
+            else:
+                key, value = item
+            path_id: int = children.get(key)
+            if path_id is None:
+                path_id = trie.get_child_id(parent_id, str(key))
+            data_type: type = type(value)
+            kind: int = kinds.get(data_type)
+            if kind is None:
+                kind = _get_container_kind(data_type)
+            if kind == _SCALAR:
+                yield path_id, data_type, value
+            elif kind == _MAPPING:
+                yield path_id, data_type, ELEMENT_CONTAINER if within_list else value
+                stack.append((nodes[path_id].children, path_id, iter(value.items()), False, within_list))
+            else:
+                yield path_id, data_type, ELEMENT_CONTAINER if within_list else value
+                if array_lengths is not None:
+                    array_lengths.append((path_id, len(value)))
+                stack.append((nodes[path_id].children, path_id, iter(get_array_elements(value)), True, within_list))
+
+    def __get_shape(self, doc: dict) -> typing.Optional[typing.Tuple[tuple, list, list]]:
+        """
+        Get the structural shape of a document: its keys, the types of its values and the nesting, without any
+        path handling. The values and the list lengths are collected in the same depth first order as __walk
+        emits them. The values are the scalars and the dicts and lists which are not within a list. Of long lists,
+        only the elements inspected by __walk are part of the shape.
+        :param doc: input document
+        :return: tuple (shape, values, list lengths), the shape is hashable and equal for documents with the
+            same structure. None as soon as the shape gets longer than _MAX_SHAPE_LENGTH.
+        """
+        get_array_elements = self.__get_array_elements
+        kinds: dict = _CONTAINER_KINDS
+        end = _END_OF_CONTAINER
+        shape: list = []
+        values: list = []
+        array_lengths: list = []
+        stack: list = [(iter(doc.items()), False, False)]
+        while stack:
+            iterator, is_list, within_list = stack[-1]
+            item = next(iterator, end)
+            if item is end:
+                stack.pop()
+                shape.append(end)
+                continue
+            if is_list:
+                value = item
+                within_list = True
+            else:
+                key, value = item
+                shape.append(key)
+            if len(shape) > _MAX_SHAPE_LENGTH:
+                return None
+            data_type: type = type(value)
+            shape.append(data_type)
+            kind: int = kinds.get(data_type)
+            if kind is None:
+                kind = _get_container_kind(data_type)
+            if kind == _SCALAR:
+                values.append(value)
+                continue
+            if not within_list:
+                values.append(value)
+            if kind == _MAPPING:
+                stack.append((iter(value.items()), False, within_list))
             else:
-                if isinstance(v, list):
-                    path = parent_key + self.__path_concat_separator + k if parent_key else k
-                    items.append((path, v))
-                    dtypes.append((path, type(v)))
-                    recursive_data = self.__inspect_lists(list_=v, parent_key=path)
-                    items.extend(recursive_data[0].items())
-                    dtypes.extend(recursive_data[1].items())
-                else:
-                    items.append((path, v))
-                    dtypes.append((path, type(v)))
-        return dict(items), dict(dtypes)
+                array_lengths.append(len(value))
+                stack.append((iter(get_array_elements(value)), True, within_list))
+        return tuple(shape), values, array_lengths
+
+    def __get_stratum(self, doc: dict) -> frozenset:
+        """
+        Returns the stratum of a document for stratified sampling: the set of its non-null paths and their types.
+        :param doc: input document
+        :return:
+        """
+        return frozenset((path_id, data_type) for path_id, data_type, value in self.__walk(doc, self.__stratum_trie)
+                         if value is not None)
+
+    def __create_sampler(self, sample: int) -> DocumentSampler:
+        """
+        Create a DocumentSampler, stratified by shape if stratified_sampling is set
+        :param sample: maximum number of documents in the sample
+        :return:
+        """
+        return DocumentSampler(sample, get_stratum=self.__get_stratum if self.stratified_sampling else None)
+
+    def __sample_documents(self, docs: typing.Iterable[dict], sample: int) -> typing.Tuple[typing.List[dict], int]:
+        """
+        Draw a bounded sample of the documents, stratified by shape if stratified_sampling is set.
+        :param docs: iterable of documents
+        :param sample: maximum number of documents in the sample
+        :return: tuple (sampled documents in input order, number of documents left out)
+        """
+        sampler: DocumentSampler = self.__create_sampler(sample)
+        doc: dict
+        for doc in docs:
+            sampler.add(doc)
+        sampled_docs: typing.List[dict] = sampler.get_documents()
+        return sampled_docs, sampler.seen - len(sampled_docs)
 
     def __get_values_and_types_formatted(self, doc: dict) -> (Document, dict, dict):
         """
-        Puts the value and type information from __get_values_and_types into a Column object and afterwards those
+        Puts the value and type information from __walk into a Column object and afterwards those
         into an Document object
         :param doc: input document to get the infos from
         :return:
@@ -124,7 +348,14 @@ class JSONAnalyzer:
         - 2.: {key: value}: returns the key with the data present under it.
         - 3.: {key: type}: returns the key with the associated type.
         """
-        items, dtypes = self.__get_values_and_types(doc=doc)
+        items: dict = {}
+        dtypes: dict = {}
+        nodes: list = self.__trie.nodes
+        for path_id, data_type, value in self.__walk(doc, self.__trie):
+            path: str = nodes[path_id].path
+            # dicts and lists within a list are flattened as None
+            items[path] = None if value is ELEMENT_CONTAINER else value
+            dtypes[path] = data_type
         column_count = len(items)
         column_info_list = []
         for k, v in items.items():
@@ -142,122 +373,333 @@ class JSONAnalyzer:
         )
         return document_info, items, dtypes
 
-    def __get_unique_column_values(self, df_flattened: pd.DataFrame, df_dtypes: pd.DataFrame) -> (ColumnInfos, list, list):
+    def _flatten_documents(self, docs: [dict]) -> list:
         """
-        Get unique columns values based on the DataFrame input
-        :param df_flattened: data frame which holds the flattened json
-        :param df_dtypes:
+        Flatten the given documents with __get_values_and_types_formatted.
+        Not name mangled on purpose, so the process pool workers can call it.
+        :param docs: documents to flatten
+        :return: list of tuples (Document, {key: value}, {key: type}), one per document.
+        """
+        return [self.__get_values_and_types_formatted(doc) for doc in docs]
+
+    def __get_settings(self) -> dict:
+        """
+        Returns the keyword arguments to create an analyzer with the same settings as this one
         :return:
         """
+        return {
+            "alphabetically_ordered_by_path": self.alphabetically_ordered_by_path,
+            "max_unique_values": self.max_unique_values,
+            "unique_values_sample_size": self.unique_values_sample_size,
+            "shape_cache_size": self.shape_cache_size,
+            "stratified_sampling": self.stratified_sampling,
+            "min_null_rate": self.min_null_rate,
+            "type_dominance_threshold": self.type_dominance_threshold,
+            "track_presence": self.track_presence,
+            "max_array_elements": self.max_array_elements,
+            "array_sampling": self.array_sampling,
+            "track_unique_values": self.track_unique_values
+        }
 
-        columns: list = []
-        data: list = []
-        column_infos_list: list = []
-        column_path: str = None
-        for column_path in df_flattened:
-            try:
-                values = df_flattened[column_path].unique().tolist()
-            except Exception as e:
-                # @TODO: Generic solution for dicts and lists of lists
-                merged_ls = []
-                for index, value in df_flattened[column_path].iteritems():
-                    merged_ls.append(value)
-                # https://stackoverflow.com/questions/3724551/python-uniqueness-for-list-of-lists
-                try:
-                    values = [list(x) for x in set(tuple(x) for x in merged_ls)]
-                except Exception as e:
-                    values = df_flattened[column_path].tolist()
-            values_without_nan = [x for x in values if str(x) != 'nan' and x is not None]
-            values_extended_for_df_without_nan = [column_path] + values_without_nan
-            len_values_without_nan = len(values_without_nan)
-            len_values = len(values)
-            has_none = len_values_without_nan != len_values
-            data_types_list = df_dtypes[column_path].dropna().unique().tolist()
-            parent_info = None
-            if column_path.count(self.path_concat_separator) >= 1:
-                parent_col_name_split: list = column_path.rsplit(self.path_concat_separator, 1)
-                parent_column_path: str = parent_col_name_split[0]
-                parent_column_avro_path: str = self.__create_avro_path(parent_column_path, self.__path_concat_separator, self.__list_symbol)
-                parent_column_name: str = parent_column_path.rsplit(self.path_concat_separator, 1)[-1]
-                parent_column_avro_name: str = parent_column_avro_path.rsplit(self.path_concat_separator, 1)[-1]
-                parent_data_types_list = df_dtypes[parent_column_path].dropna().unique().tolist()
-                parent_info = ParentColumnInfo(
-                    name=parent_column_name,
-                    path=parent_column_path,
-                    data_type_config=self.datatype_config.choose_type_info(parent_data_types_list),
-                    avro_name = parent_column_avro_name,
-                    avro_path = parent_column_avro_path
-                )
-            column_avro_path: str = self.__create_avro_path(column_path, self.__path_concat_separator, self.__list_symbol)
-            column_avro_name: str = column_avro_path.rsplit('.', 1)[-1]
-            column_name: str = column_path.rsplit('.', 1)[-1]
-            column_info = ColumnInfo(
-                name=column_name,
-                path=column_path,
-                has_nulls=has_none,
-                density=len_values_without_nan / len_values if len_values != 0 else 0,
-                unique_values=values_without_nan,
-                data_types=data_types_list,
-                mixed_types=len(data_types_list) > 1,
-                data_type_config=self.datatype_config.choose_type_info(data_types_list),
-                parent_config=parent_info,
-                avro_name=column_avro_name,
-                avro_path=column_avro_path
+    def __map_chunks(self, function: typing.Callable, docs: typing.Iterable[dict], workers: int,
+                     chunk_size: int) -> typing.Iterator:
+        """
+        Split the documents into chunks and call function(chunk) for each chunk in a ProcessPoolExecutor.
+        Each worker process creates its own analyzer with the settings of this one once, so the analyzer and its
+        tries are not sent along with every chunk.
+        The results are yielded in the order of the chunks. At most two chunks per worker are in flight,
+        so the documents are consumed lazily.
+        :param function: module level worker function
+        :param docs: iterable of documents
+        :param workers: number of worker processes
+        :param chunk_size: number of documents per chunk
+        :return:
+        """
+        docs_iterator: typing.Iterator = iter(docs)
+        chunks: typing.Iterator = iter(lambda: list(itertools.islice(docs_iterator, chunk_size)), [])
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.__get_settings(),)) as executor:
+            futures: deque = deque()
+            for chunk in chunks:
+                futures.append(executor.submit(function, chunk))
+                if len(futures) >= workers * 2:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def __create_column_info(self, node: PathNode,
+                             parent_node: typing.Optional[PathNode],
+                             has_nulls: bool,
+                             density: float,
+                             unique_values: list,
+                             data_types_list: list,
+                             data_type_counts: typing.List[int],
+                             parent_data_types_list: typing.Optional[list] = None,
+                             parent_data_type_counts: typing.Optional[typing.List[int]] = None,
+                             distinct_count: int = None,
+                             distinct_count_approximate: bool = False,
+                             nullability_confidence: float = 1.0,
+                             present_count: int = 0,
+                             null_count: int = 0,
+                             missing_count: int = 0,
+                             array_length_min: int = None,
+                             array_length_max: int = None,
+                             array_length_mean: float = None) -> ColumnInfo:
+        """
+        Create a ColumnInfo object, including the parent info if the column is not a root element.
+        :param node: PathNode of the column
+        :param parent_node: PathNode of the parent column, None for root elements
+        :param has_nulls: True if null values are present
+        :param density: density of the column
+        :param unique_values: unique non-null values of the column
+        :param data_types_list: found python datatypes of the column
+        :param data_type_counts: number of values of each datatype of the column
+        :param parent_data_types_list: found python datatypes of the parent column, if the column has a parent
+        :param parent_data_type_counts: number of values of each datatype of the parent column
+        :param distinct_count: number of distinct non-null values
+        :param distinct_count_approximate: True if the distinct_count is an estimate
+        :param nullability_confidence: confidence that has_nulls is correct
+        :param present_count: number of documents with a non-null value of the column
+        :param null_count: number of documents in which the column is only null
+        :param missing_count: number of documents without the column
+        :param array_length_min: minimum length of the lists of the column
+        :param array_length_max: maximum length of the lists of the column
+        :param array_length_mean: mean length of the lists of the column
+        :return:
+        """
+        parent_info = None
+        if parent_node is not None:
+            parent_info = ParentColumnInfo(
+                name=parent_node.name,
+                path=parent_node.path,
+                data_type_config=self.datatype_config.choose_type_info(parent_data_types_list,
+                                                                       parent_data_type_counts,
+                                                                       self.type_dominance_threshold),
+                avro_name=parent_node.avro_name,
+                avro_path=parent_node.avro_path,
+                path_id=parent_node.path_id
             )
-            column_infos_list.append(column_info)
+        type_outlier_count: int = 0
+        if self.type_dominance_threshold is not None:
+            dominant_type = self.datatype_config.get_dominant_type(data_types_list, data_type_counts,
+                                                                   self.type_dominance_threshold)
+            if dominant_type is not None:
+                type_outlier_count = sum(count for data_type, count in zip(data_types_list, data_type_counts)
+                                         if data_type is not dominant_type and data_type is not type(None))
+        column_info = ColumnInfo(
+            name=node.name,
+            path=node.path,
+            has_nulls=has_nulls,
+            density=density,
+            unique_values=unique_values,
+            data_types=data_types_list,
+            data_type_counts=data_type_counts,
+            mixed_types=len(data_types_list) > 1,
+            data_type_config=self.datatype_config.choose_type_info(data_types_list, data_type_counts,
+                                                                   self.type_dominance_threshold),
+            type_outlier_count=type_outlier_count,
+            parent_config=parent_info,
+            avro_name=node.avro_name,
+            avro_path=node.avro_path,
+            distinct_count=distinct_count,
+            distinct_count_approximate=distinct_count_approximate,
+            path_id=node.path_id,
+            parent_id=node.parent_id,
+            depth=node.depth,
+            children_ids=list(node.children.values()),
+            nullability_confidence=nullability_confidence,
+            present_count=present_count,
+            null_count=null_count,
+            missing_count=missing_count,
+            array_length_min=array_length_min,
+            array_length_max=array_length_max,
+            array_length_mean=array_length_mean
+        )
+        return column_info
+
+    def __fold_document(self, doc: dict, state: AnalysisState):
+        """
+        Fold the values and types of one document into the per-path accumulators of the state.
+        If the shape cache is enabled and the structural shape of the document is already known, the cached ShapePlan
+        is used instead of walking the path trie. Documents with a shape longer than _MAX_SHAPE_LENGTH, e.g. with
+        long lists, are always walked and not cached.
+        :param doc: input document
+        :param state: AnalysisState, new paths are added in the order they are found.
+        :return:
+        """
+        array_lengths: list = []
+        shape_values_lengths: typing.Optional[tuple] = self.__get_shape(doc) if self.shape_cache_size else None
+        if shape_values_lengths is None:
+            self.__fold_events(self.__walk(doc, state.trie, array_lengths), state)
+            self.__fold_array_lengths(array_lengths, state)
+            if self.shape_cache_size:
+                state.shape_cache_misses += 1
+            return
+        shape, values, shape_array_lengths = shape_values_lengths
+        plan: typing.Optional[ShapePlan] = state.shape_cache.get(shape)
+        if plan is not None:
+            state.shape_cache_hits += 1
+            plan.fold(values, state, shape_array_lengths)
+            return
+        state.shape_cache_misses += 1
+        plan = ShapePlan()
+        self.__fold_events(self.__walk(doc, state.trie, array_lengths), state, plan)
+        self.__fold_array_lengths(array_lengths, state)
+        plan.record_arrays(array_lengths)
+        if len(state.shape_cache) >= self.shape_cache_size:
+            del state.shape_cache[next(iter(state.shape_cache))]
+        state.shape_cache[shape] = plan
+
+    @staticmethod
+    def __fold_array_lengths(array_lengths: typing.List[typing.Tuple[int, int]], state: AnalysisState):
+        """
+        Fold the lengths of the lists of one document into the accumulators of the state
+        :param array_lengths: (path_id, length) of each list
+        :param state: AnalysisState
+        :return:
+        """
+        for path_id, length in array_lengths:
+            state.get_accumulator_by_id(path_id).add_array_length(length)
 
-            if values:
-                data.append(values_extended_for_df_without_nan)
-                columns.append(column_path)
+    @staticmethod
+    def __fold_events(events: typing.Iterable[typing.Tuple[int, type, typing.Any]], state: AnalysisState,
+                      plan: ShapePlan = None):
+        """
+        Fold the (path_id, type, value) events of one document into the accumulators of the state.
+        :param events: events of one document
+        :param state: AnalysisState
+        :param plan: If given, the events are recorded to the ShapePlan of the document shape.
+        :return:
+        """
+        document_accumulators: dict = {}
+        # dicts and lists nested in each other are hashed once per document
+        digests: dict = {}
+        new_data_type: bool = False
+        for path_id, data_type, value in events:
+            if plan is not None:
+                plan.record(path_id, data_type, value, _get_container_kind(data_type) != _SCALAR)
+            accumulator: PathAccumulator = state.get_accumulator_by_id(path_id)
+            # new paths always come with a new data type
+            if data_type not in accumulator.data_types:
+                new_data_type = True
+            status: int = accumulator.add_value(value, data_type, digests)
+            # the highest status of the values of a path in the document counts
+            if document_accumulators.get(accumulator, -1) < status:
+                document_accumulators[accumulator] = status
+        state.add_document(document_accumulators, changed=new_data_type)
 
+    def create_column_infos(self, state: AnalysisState) -> ColumnInfos:
+        """
+        Create the ColumnInfos based on an AnalysisState, e.g. the result of analyze_state or multiple merged states.
+        :param state: AnalysisState
+        :return:
+        """
+        column_infos_list: list = []
+        nodes: typing.List[PathNode] = state.trie.nodes
+        node: PathNode
+        for node in nodes:
+            accumulator: PathAccumulator = state.get_accumulator_by_id(node.path_id)
+            parent_node: typing.Optional[PathNode] = None
+            parent_accumulator: typing.Optional[PathAccumulator] = None
+            if node.parent_id is not None:
+                parent_node = nodes[node.parent_id]
+                parent_accumulator = state.get_accumulator_by_id(node.parent_id)
+            has_nulls: bool = accumulator.has_nulls(state.document_count)
+            nullability_confidence: float = 1.0
+            if state.skipped_document_count and not has_nulls:
+                nullability_confidence = 1 - (1 - self.min_null_rate) ** state.document_count
+            column_info = self.__create_column_info(
+                node=node,
+                parent_node=parent_node,
+                has_nulls=has_nulls,
+                nullability_confidence=nullability_confidence,
+                density=accumulator.get_density(state.document_count),
+                unique_values=accumulator.get_unique_values(),
+                data_types_list=accumulator.get_data_types(),
+                data_type_counts=accumulator.get_data_type_counts(),
+                parent_data_types_list=parent_accumulator.get_data_types() if parent_accumulator else None,
+                parent_data_type_counts=parent_accumulator.get_data_type_counts() if parent_accumulator else None,
+                distinct_count=accumulator.get_distinct_count(),
+                distinct_count_approximate=accumulator.is_approximate,
+                present_count=accumulator.present_count,
+                null_count=accumulator.null_count,
+                missing_count=accumulator.get_missing_count(state.document_count),
+                array_length_min=accumulator.array_length_min,
+                array_length_max=accumulator.array_length_max,
+                array_length_mean=accumulator.get_array_length_mean()
+            )
+            column_infos_list.append(column_info)
         # sort the list by the path attribute of the column_info class
         if self.alphabetically_ordered_by_path:
             column_infos_list = sorted(column_infos_list, key=operator.attrgetter('path'))
-        column_infos = ColumnInfos(
-            column_infos=column_infos_list
+        statistics = AnalysisStatistics(
+            document_count=state.document_count,
+            path_count=len(nodes),
+            shape_cache_hits=state.shape_cache_hits,
+            shape_cache_misses=state.shape_cache_misses,
+            sample_size=state.document_count if state.skipped_document_count else None,
+            population_size=state.population_count,
+            last_change_index=state.last_change_index,
+            stopped_early=state.stopped_early,
+            parser_backend=state.parser_backend
         )
-        return column_infos, columns, data
+        return ColumnInfos(column_infos=column_infos_list, statistics=statistics)
 
-    def __create_avro_path(self, path: str, split_string: str, search_string: str):
+    def __flatten(self, docs: typing.Iterable[dict], workers: int = None, chunk_size: int = 1000
+                  ) -> typing.Tuple[Collection, pd.DataFrame, pd.DataFrame]:
         """
-        replaces the search string withing the path with an avro compliant "record"-name
-        :param path: input path
-        :param split_string: string which can be used to split the path in
-        :param search_string: string which should be searched and altered
+        Flatten the documents to build the collection_data, df_flattened and df_dtypes outputs of analyze.
+        :param docs: documents to flatten
+        :param workers: If greater than 1, the documents are flattened in chunks in a ProcessPoolExecutor.
+        :param chunk_size: number of documents per chunk if workers is set.
         :return:
         """
-        container = []
-        path_split: [str] = path.split(split_string)
-        for i, element in enumerate(path_split):
-            if element == search_string:
-                container.append(container[i - 1] + self.__dict_path_append_name )
-            else:
-                container.append(element)
-        avro_path = ".".join(container)
-        return avro_path
+        document_data_list: list = []
+        values: list = []
+        data_types: list = []
+        if workers is not None and workers > 1:
+            flattened_docs: typing.Iterable = itertools.chain.from_iterable(
+                self.__map_chunks(_flatten_chunk, docs, workers, chunk_size))
+        else:
+            flattened_docs: typing.Iterable = (self.__get_values_and_types_formatted(doc) for doc in docs)
+        for i, (document_info, items, dtypes) in enumerate(flattened_docs):
+            document_data_list.append(document_info)
+            values.append(items)
+            data_types.append(dtypes)
+        collection_data: Collection = Collection(
+            documents=document_data_list,
+            size=i
+        )
+        df_flattened = pd.DataFrame(values)
+        df_dtypes = pd.DataFrame(data_types)
+        return collection_data, df_flattened, df_dtypes
 
-    def __remove_unhashable(self, tuple_list: typing.List[typing.Tuple]):
+    @staticmethod
+    def __get_df_unique(state: AnalysisState) -> pd.DataFrame:
         """
-        Remove all non-hashable elements from the tuple list and replace it with None
-        This is a bug fix because I didn´t find a quick solution why sometimes a dict slips through the logic.
-        It works, so why bother?!
-        :param tuple_list:
+        Build the pivoted DataFrame of unique values per column based on the accumulators of the state.
+        The column "0" holds the path, the columns 1 - n one distinct value each.
+        :param state: AnalysisState
         :return:
         """
-        return_tuple_list: list = []
-        for i, value in enumerate(tuple_list):
-            if not isinstance(value[1], collections.Hashable):
-                new_tuple = (value[0], None)
-                return_tuple_list.append(new_tuple)
-            else:
-                return_tuple_list.append(value)
-        return return_tuple_list
+        data: list = [[accumulator.path] + accumulator.get_unique_values() for accumulator in state.accumulators]
+        return pd.DataFrame(data=data)
 
-    def analyze(self, docs: [dict]) -> typing.Tuple[Collection, ColumnInfos, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def analyze(self, docs: [dict], workers: int = None, chunk_size: int = 1000, sample: int = None
+                ) -> AnalysisResult:
         """
         Analyze a list of dictionaries/json documents to get all infos about the structure, nullability etc.
+        Only the column_infos are computed right away, all other outputs are built the first time they are accessed
+        on the returned AnalysisResult. Unpacking the result builds all of them.
         :param docs: list of dictionaries which should be analyzed
-        :return: Tuple of 5 elements, listed below.
+        :param workers: If greater than 1, the documents are split into chunks which are analyzed in a
+            ProcessPoolExecutor with this number of processes. Defaults to None, which means no parallelism.
+        :param chunk_size: number of documents per chunk if workers is set. Defaults to 1000.
+        :param sample: If set, only a bounded sample of at most this number of documents is analyzed, drawn with
+            reservoir sampling and stratified by shape if stratified_sampling is set. Defaults to None, which means
+            all documents are analyzed.
+            All outputs are based on the sampled documents.
+        :return: AnalysisResult, which can be unpacked to a tuple of 5 elements, listed below.
             1.: Collection: Infos about each document, columns present in it, if it is null, the data type etc.
             2.: ColumnInfos: Main Output of the analyze function. Contains all infos to all found columns within all
                 json documents with infos like: name, path, has_nulls, density, unique_values etc.
@@ -266,21 +708,233 @@ class JSONAnalyzer:
             5.: pandas DataFrame which holds information about unique values of each flattened column of the given json documents.
 
         """
-        document_data_list: list = []
-        values: list = []
-        data_types: list = []
-        doc: dict
-        for i, doc in enumerate(docs):
-            document_info, items, dtypes = self.__get_values_and_types_formatted(doc)
-            document_data_list.append(document_info)
-            values.append(items)
-            data_types.append(dtypes)
-        collection_data: Collection = Collection(
-            documents=document_data_list,
-            size=i
+        skipped_document_count: int = 0
+        if sample is not None:
+            docs, skipped_document_count = self.__sample_documents(docs, sample)
+        elif not isinstance(docs, collections.Sequence):
+            docs = list(docs)
+        state: AnalysisState = self.analyze_state(docs, workers=workers, chunk_size=chunk_size)
+        state.skipped_document_count += skipped_document_count
+        return AnalysisResult(
+            column_infos=self.create_column_infos(state),
+            state=state,
+            flatten=lambda: self.__flatten(docs, workers, chunk_size),
+            get_unique=lambda: self.__get_df_unique(state)
         )
-        df_flattened = pd.DataFrame(values)
-        df_dtypes = pd.DataFrame(data_types)
-        column_infos, columns, data = self.__get_unique_column_values(df_flattened, df_dtypes)
-        df_unique = pd.DataFrame(data=data)
-        return collection_data, column_infos, df_flattened, df_dtypes, df_unique
+
+    def analyze_state(self, docs: typing.Iterable[dict], state: AnalysisState = None, workers: int = None,
+                      chunk_size: int = 1000, sample: int = None, stop_after_stable: int = None) -> AnalysisState:
+        """
+        Fold any iterable of dictionaries/json documents into an AnalysisState in a single pass.
+        The state can be merged with the states of other shards and turned into ColumnInfos with create_column_infos.
+        :param docs: iterable of dictionaries which should be analyzed
+        :param state: existing AnalysisState the documents should be added to. If None, a new state is created.
+        :param workers: If greater than 1, the documents are split into chunks which are folded into partial states
+            in a ProcessPoolExecutor with this number of processes. Defaults to None, which means no parallelism.
+        :param chunk_size: number of documents per chunk if workers is set. Defaults to 1000.
+        :param sample: If set, only a bounded sample of at most this number of documents is analyzed, drawn with
+            reservoir sampling and stratified by shape if stratified_sampling is set. Defaults to None, which means
+            all documents are analyzed.
+        :param stop_after_stable: If set, the analysis stops consuming documents once this number of documents in a
+            row added no new path or data type and made no path nullable. With workers, this is checked after each
+            chunk. Defaults to None, which means all documents are analyzed.
+        :return: AnalysisState
+        """
+        if state is None:
+            state = self.__create_state()
+        if sample is not None:
+            docs, skipped_document_count = self.__sample_documents(docs, sample)
+            state.skipped_document_count += skipped_document_count
+        if workers is not None and workers > 1:
+            partial_state: AnalysisState
+            for partial_state in self.__map_chunks(_analyze_chunk, docs, workers, chunk_size):
+                state.merge(partial_state)
+                if stop_after_stable is not None and state.get_stable_count() >= stop_after_stable:
+                    state.stopped_early = True
+                    break
+        else:
+            doc: dict
+            for doc in docs:
+                self.__fold_document(doc, state)
+                if stop_after_stable is not None and state.get_stable_count() >= stop_after_stable:
+                    state.stopped_early = True
+                    break
+        return state
+
+    def analyze_stream(self, docs: typing.Iterable[dict], workers: int = None, chunk_size: int = 1000,
+                       sample: int = None, stop_after_stable: int = None) -> ColumnInfos:
+        """
+        Analyze any iterable of dictionaries/json documents - e.g. a generator reading from a file or a message bus -
+        in a single pass. Each document is folded into per-path accumulators as it arrives and is not kept afterwards,
+        so the memory consumption is bounded by the number of distinct paths and not by the number of documents.
+        :param docs: iterable of dictionaries which should be analyzed
+        :param workers: If greater than 1, the documents are analyzed in chunks in a ProcessPoolExecutor with this
+            number of processes. Defaults to None, which means no parallelism.
+        :param chunk_size: number of documents per chunk if workers is set. Defaults to 1000.
+        :param sample: If set, only a bounded sample of at most this number of documents is analyzed, drawn with
+            reservoir sampling and stratified by shape if stratified_sampling is set. Defaults to None, which means
+            all documents are analyzed.
+        :param stop_after_stable: If set, the analysis stops consuming documents once this number of documents in a
+            row added no new path or data type and made no path nullable. With workers, this is checked after each
+            chunk. Defaults to None, which means all documents are analyzed.
+        :return: ColumnInfos: Contains all infos to all found columns within all json documents, the same as the
+            second output of analyze.
+        """
+        return self.create_column_infos(self.analyze_state(docs, workers=workers, chunk_size=chunk_size,
+                                                           sample=sample, stop_after_stable=stop_after_stable))
+
+    async def analyze_async(self, docs: typing.AsyncIterable[dict], batch_size: int = 1000,
+                            stop_after_stable: int = None, executor: Executor = None, sample: int = None
+                            ) -> ColumnInfos:
+        """
+        Analyze an async iterable of dictionaries/json documents, e.g. the consumer of a message bus, as the documents
+        arrive. The documents are collected into batches and each batch is folded into the analysis state in an
+        executor, so the event loop is not blocked. While one batch is folded, the next one is collected. The iterable
+        is only consumed further once the previous batch is folded, so at most two batches are held in memory.
+        :param docs: async iterable of dictionaries which should be analyzed
+        :param batch_size: number of documents per batch. Defaults to 1000.
+        :param stop_after_stable: If set, the analysis stops consuming documents once this number of documents in a
+            row added no new path or data type and made no path nullable, see analyze_stream. Defaults to None.
+        :param executor: Executor the batches are folded in. It must run in the same process, e.g. a
+            ThreadPoolExecutor, as the state is shared. Defaults to None, which means the default executor of the loop.
+        :param sample: If set, the batches are offered to a bounded sample of at most this number of documents
+            instead, which is analyzed once the iterable is exhausted, see analyze_stream. Defaults to None, which
+            means all documents are analyzed.
+        :return: ColumnInfos: Contains all infos to all found columns within all json documents, the same as the
+            second output of analyze.
+        """
+        state = self.__create_state()
+        sampler: typing.Optional[DocumentSampler] = self.__create_sampler(sample) if sample is not None else None
+        loop = asyncio.get_running_loop()
+        pending: typing.Optional[asyncio.Future] = None
+        batch: typing.List[dict] = []
+        async for doc in docs:
+            batch.append(doc)
+            if len(batch) < batch_size:
+                continue
+            if pending is not None:
+                await pending
+                if state.stopped_early:
+                    batch = []
+                    break
+            pending = loop.run_in_executor(executor, functools.partial(self.__fold_batch, batch, state, sampler,
+                                                                       stop_after_stable))
+            batch = []
+        if pending is not None:
+            await pending
+        if batch and not state.stopped_early:
+            await loop.run_in_executor(executor, functools.partial(self.__fold_batch, batch, state, sampler,
+                                                                   stop_after_stable))
+        if sampler is not None:
+            sampled_docs: typing.List[dict] = sampler.get_documents()
+            state.skipped_document_count += sampler.seen - len(sampled_docs)
+            await loop.run_in_executor(executor, functools.partial(self.analyze_state, sampled_docs, state,
+                                                                   stop_after_stable=stop_after_stable))
+        return self.create_column_infos(state)
+
+    def __fold_batch(self, batch: typing.List[dict], state: AnalysisState, sampler: typing.Optional[DocumentSampler],
+                     stop_after_stable: typing.Optional[int]):
+        """
+        Fold one batch of analyze_async into the state, or offer it to the sampler if a sample is drawn
+        :param batch: documents of the batch
+        :param state: AnalysisState
+        :param sampler: DocumentSampler or None
+        :param stop_after_stable: see analyze_state
+        :return:
+        """
+        if sampler is None:
+            self.analyze_state(batch, state, stop_after_stable=stop_after_stable)
+            return
+        doc: dict
+        for doc in batch:
+            sampler.add(doc)
+
+    def __scan_state(self, raw_docs: typing.Iterable[memoryview], stop_after_stable: int = None) -> AnalysisState:
+        """
+        Fold raw JSON documents into a new AnalysisState with the StructureScanner, without parsing them into dicts.
+        :param raw_docs: raw JSON bytes, one document each
+        :param stop_after_stable: see analyze_state
+        :return:
+        """
+        state = self.__create_state()
+        scanner = StructureScanner()
+        raw_doc: memoryview
+        for raw_doc in raw_docs:
+            array_lengths: list = []
+            self.__fold_events(scanner.scan(raw_doc, state.trie, array_lengths), state)
+            self.__fold_array_lengths(array_lengths, state)
+            if stop_after_stable is not None and state.get_stable_count() >= stop_after_stable:
+                state.stopped_early = True
+                break
+        state.parser_backend = "structure_scanner"
+        return state
+
+    def __analyze_reader(self, reader: FileReader, documents: typing.Iterable[dict],
+                         raw_docs: typing.Iterable[memoryview], workers: int, chunk_size: int, sample: int,
+                         stop_after_stable: int, structure_only: bool) -> ColumnInfos:
+        """
+        Analyze the documents of a FileReader, either parsed or with the StructureScanner.
+        :param reader: FileReader
+        :param documents: parsed documents of the reader
+        :param raw_docs: raw documents of the reader
+        :param workers: see analyze_stream
+        :param chunk_size: see analyze_stream
+        :param sample: see analyze_stream
+        :param stop_after_stable: see analyze_stream
+        :param structure_only: see analyze_files
+        :return:
+        """
+        if structure_only:
+            if workers is not None or sample is not None:
+                warnings.warn("workers and sample are not supported with structure_only and are ignored.")
+            return self.create_column_infos(self.__scan_state(raw_docs, stop_after_stable=stop_after_stable))
+        state: AnalysisState = self.analyze_state(documents, workers=workers, chunk_size=chunk_size, sample=sample,
+                                                  stop_after_stable=stop_after_stable)
+        state.parser_backend = reader.parser.backend
+        return self.create_column_infos(state)
+
+    def analyze_files(self, paths: typing.Union[str, typing.Iterable[str]], ndjson: bool = True, workers: int = None,
+                      chunk_size: int = 1000, sample: int = None, stop_after_stable: int = None,
+                      parser_backend: str = "auto", structure_only: bool = False) -> ColumnInfos:
+        """
+        Analyze JSON files without loading them into a list first. The files are read through mmap and the documents
+        are parsed lazily and streamed into the analysis, so only the documents currently processed are in memory.
+        :param paths: a single path or an iterable of paths
+        :param ndjson: If True, the files contain newline-delimited JSON, one document per line. If False, each file
+            holds exactly one JSON document. Defaults to True.
+        :param workers: see analyze_stream
+        :param chunk_size: see analyze_stream
+        :param sample: see analyze_stream
+        :param stop_after_stable: see analyze_stream
+        :param parser_backend: JSON decoding backend: "json", "orjson", "simdjson" or "auto" for the fastest
+            installed one. Falls back to an installed backend with a warning. The used backend is recorded in the
+            statistics. Defaults to "auto".
+        :param structure_only: If True, the raw JSON is tokenized by the StructureScanner, which feeds the paths,
+            types and scalar values straight into the accumulators without building any dicts or lists. The unique
+            values of dicts and lists are not tracked. workers and sample are not supported in this mode.
+            Defaults to False.
+        :return: ColumnInfos: Contains all infos to all found columns within all json documents, the same as the
+            second output of analyze.
+        """
+        reader = FileReader(ndjson=ndjson, parser_backend=parser_backend)
+        return self.__analyze_reader(reader, reader.read_documents(paths), reader.read_raw_documents(paths),
+                                     workers, chunk_size, sample, stop_after_stable, structure_only)
+
+    def analyze_bytes(self, data: typing.Union[bytes, bytearray], ndjson: bool = True, workers: int = None,
+                      chunk_size: int = 1000, sample: int = None, stop_after_stable: int = None,
+                      parser_backend: str = "auto", structure_only: bool = False) -> ColumnInfos:
+        """
+        Analyze raw JSON bytes, e.g. a downloaded dump or a message payload, the same way as analyze_files.
+        :param data: newline-delimited JSON if ndjson is set, otherwise one JSON document
+        :param ndjson: see analyze_files
+        :param workers: see analyze_stream
+        :param chunk_size: see analyze_stream
+        :param sample: see analyze_stream
+        :param stop_after_stable: see analyze_stream
+        :param parser_backend: see analyze_files
+        :param structure_only: see analyze_files
+        :return: ColumnInfos
+        """
+        reader = FileReader(ndjson=ndjson, parser_backend=parser_backend)
+        return self.__analyze_reader(reader, reader.read_bytes(data), reader.read_raw_bytes(data),
+                                     workers, chunk_size, sample, stop_after_stable, structure_only)
@@ -0,0 +1,157 @@
+import base64
+import hashlib
+import math
+import random
+import typing
+
+
+class HyperLogLog:
+
+    def __init__(self, precision: int = 12):
+        """
+        HyperLogLog sketch to estimate the number of distinct values with a fixed amount of memory.
+        Two sketches with the same precision can be merged without losing accuracy.
+        :param precision: number of bits used for the register index, 2^precision registers are used.
+            The standard error is about 1.04 / sqrt(2^precision), e.g. 1.6% for the default of 12.
+        """
+        self.precision: int = precision
+        self.register_count: int = 1 << precision
+        self.registers: bytearray = bytearray(self.register_count)
+
+    @staticmethod
+    def get_hash(key: typing.Hashable) -> int:
+        """
+        Returns a 64 bit hash of the key which is - other than the builtin hash - stable across processes.
+        :param key:
+        :return:
+        """
+        return int.from_bytes(hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, key: typing.Hashable):
+        """
+        Add a key to the sketch
+        :param key:
+        :return:
+        """
+        self.add_hash(self.get_hash(key))
+
+    def add_hash(self, hash_: int):
+        """
+        Add a 64 bit hash to the sketch
+        :param hash_:
+        :return:
+        """
+        index: int = hash_ >> (64 - self.precision)
+        remaining: int = hash_ & ((1 << (64 - self.precision)) - 1)
+        rank: int = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """
+        Returns the estimated number of distinct keys added to the sketch
+        :return:
+        """
+        m: int = self.register_count
+        alpha: float = 0.7213 / (1 + 1.079 / m)
+        estimate: float = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros: int = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            # small range correction with linear counting
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge another sketch with the same precision into this one
+        :param other:
+        :return: self
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only HyperLogLog sketches with the same precision can be merged.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def as_dict(self) -> dict:
+        """
+        Returns the sketch as a serializable dict
+        :return:
+        """
+        return {"precision": self.precision, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> "HyperLogLog":
+        """
+        Create a sketch from the output of as_dict
+        :param dict_:
+        :return:
+        """
+        sketch = cls(precision=dict_["precision"])
+        sketch.registers = bytearray(base64.b64decode(dict_["registers"]))
+        return sketch
+
+
+class ReservoirSample:
+
+    def __init__(self, size: int, seed: int = 0):
+        """
+        Uniform random sample of distinct example values with a fixed maximum size (reservoir sampling).
+        :param size: maximum number of values kept
+        :param seed: seed of the random number generator, which makes the sample reproducible.
+        """
+        self.size: int = size
+        self.seen: int = 0
+        self.values: dict = {}
+        # keys of values by their slot in the reservoir, so a replaced value is found in constant time
+        self.__keys: list = []
+        self.__random: random.Random = random.Random(seed)
+
+    def add(self, key: typing.Hashable, value: typing.Any):
+        """
+        Offer a value to the sample
+        :param key: hashable representation of the value, used to keep the sample distinct
+        :param value:
+        :return:
+        """
+        self.seen += 1
+        if key in self.values:
+            return
+        if len(self.values) < self.size:
+            self.values[key] = value
+            self.__keys.append(key)
+        else:
+            index: int = self.__random.randrange(self.seen)
+            if index < self.size:
+                del self.values[self.__keys[index]]
+                self.__keys[index] = key
+                self.values[key] = value
+
+    def merge(self, other: "ReservoirSample") -> "ReservoirSample":
+        """
+        Merge another sample into this one, each side contributes in proportion to the number of values it has seen.
+        :param other:
+        :return: self
+        """
+        own: list = list(self.values.items())
+        others: list = list(other.values.items())
+        own_weight: int = self.seen
+        other_weight: int = other.seen
+        self.__random.shuffle(own)
+        self.__random.shuffle(others)
+        merged: dict = {}
+        while len(merged) < self.size and (own or others):
+            take_own: bool = bool(own) and (not others or
+                                            self.__random.random() * (own_weight + other_weight) < own_weight)
+            key, value = own.pop() if take_own else others.pop()
+            merged.setdefault(key, value)
+        self.values = merged
+        self.__keys = list(merged)
+        self.seen += other.seen
+        return self
+
+    def get_values(self) -> list:
+        """
+        Returns the sampled values
+        :return:
+        """
+        return list(self.values.values())
@@ -0,0 +1,55 @@
+import random
+import typing
+
+from pyscgen.json.analyze.cardinality_sketch import ReservoirSample
+
+
+class DocumentSampler:
+
+    def __init__(self, size: int, get_stratum: typing.Optional[typing.Callable[[dict], typing.Hashable]] = None,
+                 seed: int = 0):
+        """
+        Bounded sample of a stream of documents.
+        A uniform reservoir sample of size documents is drawn. If get_stratum is given, the first document of each
+        stratum (e.g. each structural shape) is kept in addition and takes precedence over the uniform sample, so rare
+        shapes are part of the sample no matter how seldom they occur. Representatives are kept for at most size strata.
+        :param size: maximum number of documents in the sample
+        :param get_stratum: callable which returns a hashable stratum key for a document. Defaults to None, which
+            means the sample is not stratified.
+        :param seed: seed of the random number generator, which makes the sample reproducible.
+        """
+        self.size: int = size
+        self.seen: int = 0
+        self.__get_stratum = get_stratum
+        self.__random: random.Random = random.Random(seed)
+        self.__reservoir: ReservoirSample = ReservoirSample(size, seed=seed)
+        self.__representatives: typing.Dict[typing.Hashable, typing.Tuple[int, dict]] = {}
+
+    def add(self, doc: dict):
+        """
+        Offer a document to the sample
+        :param doc:
+        :return:
+        """
+        index: int = self.seen
+        if self.__get_stratum is not None and len(self.__representatives) < self.size:
+            stratum: typing.Hashable = self.__get_stratum(doc)
+            if stratum not in self.__representatives:
+                self.__representatives[stratum] = (index, doc)
+        self.__reservoir.add(index, doc)
+        self.seen += 1
+
+    def get_documents(self) -> typing.List[dict]:
+        """
+        Returns the sampled documents in the order they were added.
+        The strata representatives are taken first, the remaining places are filled from the uniform sample.
+        :return:
+        """
+        sample: typing.Dict[int, dict] = dict(self.__representatives.values())
+        uniform: list = list(self.__reservoir.values.items())
+        self.__random.shuffle(uniform)
+        for index, doc in uniform:
+            if len(sample) >= self.size:
+                break
+            sample.setdefault(index, doc)
+        return [sample[index] for index in sorted(sample)]
@@ -0,0 +1,431 @@
+import collections.abc as collections
+import importlib
+import typing
+
+from pyscgen.json.analyze.cardinality_sketch import HyperLogLog, ReservoirSample
+from pyscgen.json.analyze.presence_bitmap import PresenceBitmap
+from pyscgen.json.analyze.structural_hash import get_structural_hash
+
+_PLAIN_TYPES: typing.Tuple[type, ...] = (str, int, float, bool, type(None))
+_NESTED_TYPES: typing.Tuple[type, ...] = (collections.Mapping, list, tuple, set, frozenset)
+
+
+class _UnknownValue:
+    """
+    Type of UNKNOWN_VALUE and ELEMENT_CONTAINER
+    """
+
+    def __repr__(self) -> str:
+        return "ELEMENT_CONTAINER" if self is ELEMENT_CONTAINER else "UNKNOWN_VALUE"
+
+
+# stand-in for a non-null value which is not known, e.g. a dict or list which the StructureScanner did not build.
+# It counts as present, but is not tracked as unique value.
+UNKNOWN_VALUE: _UnknownValue = _UnknownValue()
+# stand-in for a dict or list within a list, on any level below it. It counts as present and is not tracked as
+# unique value, but makes the path nullable, like these containers always did.
+ELEMENT_CONTAINER: _UnknownValue = _UnknownValue()
+
+# stand-in for a dict or list among the exact unique values, of which only the structural hash is kept
+_DIGEST_ONLY: object = object()
+
+# status of the values of a path in one document, the highest status of its values counts
+VALUE_NULL, VALUE_ELEMENT_CONTAINER, VALUE_PRESENT = 0, 1, 2
+
+
+class PathAccumulator:
+
+    def __init__(self, path: str, max_unique_values: int = None, sample_size: int = 20,
+                 track_presence: bool = False, track_unique_values: bool = True):
+        """
+        Accumulates all infos about one path/column while documents are folded into the analyzer one by one.
+        Only aggregated values are kept, so the memory needed is bounded by the number of distinct paths (and their
+        distinct values) and not by the number of analyzed documents.
+        :param path: JSON path of the column
+        :param max_unique_values: If set, the unique values are tracked exactly only up to this number.
+            Afterwards, the number of distinct values is estimated with a HyperLogLog sketch and only a random sample
+            of sample_size example values is kept. Defaults to None, which means the unique values are always exact.
+        :param sample_size: number of example values kept once max_unique_values is exceeded. Of dicts and lists,
+            only this number of distinct values is kept at all, the others are only counted by their structural hash.
+        :param track_presence: If True, the indexes of the documents in which the path is present with a non-null
+            value and in which it is null are tracked in a PresenceBitmap each. Defaults to False.
+        :param track_unique_values: If False, the values are neither hashed nor kept, there is no distinct count and
+            no sample. Defaults to True.
+        """
+        self.path: str = path
+        self.max_unique_values: typing.Optional[int] = max_unique_values
+        self.track_unique_values: bool = track_unique_values
+        self.sample_size: int = sample_size
+        self.present_count: int = 0
+        self.null_count: int = 0
+        # documents in which the path was present, but only with dicts or lists within a list, see ELEMENT_CONTAINER
+        self.element_container_count: int = 0
+        self.data_types: dict = {}
+        self.unique_values: dict = {}
+        # number of dicts and lists kept in unique_values, see sample_size
+        self.__nested_value_count: int = 0
+        self.sketch: typing.Optional[HyperLogLog] = None
+        self.sample: typing.Optional[ReservoirSample] = None
+        # length statistics of the lists found under the path
+        self.array_count: int = 0
+        self.array_length_sum: int = 0
+        self.array_length_min: typing.Optional[int] = None
+        self.array_length_max: typing.Optional[int] = None
+        self.present_bitmap: typing.Optional[PresenceBitmap] = PresenceBitmap() if track_presence else None
+        self.null_bitmap: typing.Optional[PresenceBitmap] = PresenceBitmap() if track_presence else None
+
+    @staticmethod
+    def is_null(value: typing.Any) -> bool:
+        """
+        Returns True if the value counts as null, which is None or NaN.
+        :param value:
+        :return:
+        """
+        return value is None or (isinstance(value, float) and value != value)
+
+    @staticmethod
+    def get_hashable(value: typing.Any, digests: dict = None) -> typing.Hashable:
+        """
+        Returns a canonical, hashable representation of the value which is used to deduplicate it.
+        Scalars and other hashable values are returned as they are. Nested values - dicts, lists, tuples and sets -
+        are replaced by their structural hash, so equal nested values always get the same 16 byte key, no matter in
+        which order the keys were found, and the key does not hold a copy of the value. Unhashable values of other
+        types are represented by their repr.
+        :param value:
+        :param digests: digests of the nested values of the current document, see get_structural_hash
+        :return:
+        """
+        if type(value) in _PLAIN_TYPES:
+            return value
+        if isinstance(value, _NESTED_TYPES):
+            return get_structural_hash(value, digests)
+        if isinstance(value, collections.Hashable):
+            return value
+        return repr(value)
+
+    def add_value(self, value: typing.Any, data_type: type, digests: dict = None) -> int:
+        """
+        Fold one value of the path into the accumulator. A path can have multiple values in one document, e.g. if
+        it is an element of a list. Dicts and lists are tracked as unique values by their structural hash.
+        :param value: value found under the path, UNKNOWN_VALUE if it is not null, but not known, ELEMENT_CONTAINER
+            for dicts and lists within a list.
+        :param data_type: python type of the value
+        :param digests: digests of the nested values of the current document, so dicts and lists nested in each
+            other are only hashed once per document. See get_structural_hash.
+        :return: VALUE_NULL, VALUE_ELEMENT_CONTAINER or VALUE_PRESENT
+        """
+        self.data_types[data_type] = self.data_types.get(data_type, 0) + 1
+        return self.add_counted_value(value, digests)
+
+    def add_data_type(self, data_type: type, count: int = 1):
+        """
+        Count a found data type without a value, e.g. for the types of a known document shape.
+        :param data_type: python type
+        :param count: number of values with this type
+        :return:
+        """
+        self.data_types[data_type] = self.data_types.get(data_type, 0) + count
+
+    def add_counted_value(self, value: typing.Any, digests: dict = None) -> int:
+        """
+        Track a value, whose type was already counted with add_data_type.
+        :param value: value found under the path, see add_value
+        :param digests: digests of the nested values of the current document, see add_value
+        :return: VALUE_NULL, VALUE_ELEMENT_CONTAINER or VALUE_PRESENT
+        """
+        if value is ELEMENT_CONTAINER:
+            return VALUE_ELEMENT_CONTAINER
+        if self.is_null(value):
+            return VALUE_NULL
+        if self.track_unique_values and value is not UNKNOWN_VALUE:
+            self.__add_unique(self.get_hashable(value, digests), value)
+        return VALUE_PRESENT
+
+    def add_array_length(self, length: int):
+        """
+        Track the length of one list found under the path, all elements counted even if only some were inspected.
+        :param length:
+        :return:
+        """
+        self.array_count += 1
+        self.array_length_sum += length
+        if self.array_length_min is None or length < self.array_length_min:
+            self.array_length_min = length
+        if self.array_length_max is None or length > self.array_length_max:
+            self.array_length_max = length
+
+    def get_array_length_mean(self) -> typing.Optional[float]:
+        """
+        Returns the mean length of the lists found under the path, None if there were no lists.
+        :return:
+        """
+        return self.array_length_sum / self.array_count if self.array_count else None
+
+    def add_document(self, status: int, document_index: int = None):
+        """
+        Count one document in which the path was found
+        :param status: highest status of the values of the path in the document, see add_value. The path is present
+            if at least one value was not null.
+        :param document_index: index of the document, which is added to the bitmaps if presence is tracked
+        :return:
+        """
+        if status != VALUE_NULL:
+            self.present_count += 1
+            if status == VALUE_ELEMENT_CONTAINER:
+                self.element_container_count += 1
+            if self.present_bitmap is not None:
+                self.present_bitmap.add(document_index)
+        else:
+            self.null_count += 1
+            if self.null_bitmap is not None:
+                self.null_bitmap.add(document_index)
+
+    def __add_unique(self, key: typing.Hashable, value: typing.Any):
+        """
+        Track a non-null value either exactly or in the sketch and sample, if the cap was exceeded.
+        :param key: hashable representation of the value
+        :param value:
+        :return:
+        """
+        if self.sketch is None:
+            if key not in self.unique_values:
+                if isinstance(value, _NESTED_TYPES):
+                    if self.__nested_value_count < self.sample_size:
+                        self.__nested_value_count += 1
+                    else:
+                        value = _DIGEST_ONLY
+                self.unique_values[key] = value
+                if self.max_unique_values is not None and len(self.unique_values) > self.max_unique_values:
+                    self.__switch_to_sketch()
+        else:
+            self.sketch.add(key)
+            if value is not _DIGEST_ONLY:
+                self.sample.add(key, value)
+
+    def __switch_to_sketch(self):
+        """
+        Replace the exact unique values with a HyperLogLog sketch and a reservoir sample of example values
+        :return:
+        """
+        self.sketch = HyperLogLog()
+        self.sample = ReservoirSample(self.sample_size)
+        for key, value in self.unique_values.items():
+            self.sketch.add(key)
+            if value is not _DIGEST_ONLY:
+                self.sample.add(key, value)
+        self.unique_values = {}
+        self.__nested_value_count = 0
+
+    def stop_tracking_unique_values(self):
+        """
+        Drop the unique values and do not track them any longer, e.g. because another accumulator without them was
+        merged into this one.
+        :return:
+        """
+        self.track_unique_values = False
+        self.unique_values = {}
+        self.__nested_value_count = 0
+        self.sketch = None
+        self.sample = None
+
+    @property
+    def is_approximate(self) -> bool:
+        """
+        True if the unique values exceeded max_unique_values and the distinct count is an estimate.
+        :return:
+        """
+        return self.sketch is not None
+
+    def get_distinct_count(self) -> typing.Optional[int]:
+        """
+        Returns the number of distinct non-null values, estimated if is_approximate is True, None if the unique
+        values are not tracked.
+        :return:
+        """
+        if not self.track_unique_values:
+            return None
+        if self.sketch is None:
+            return len(self.unique_values)
+        return self.sketch.count()
+
+    def get_unique_values(self) -> list:
+        """
+        Returns all unique non-null values found for this path or a random sample of them if is_approximate is True.
+        Of dicts and lists, at most sample_size values are returned.
+        :return:
+        """
+        if self.sketch is None:
+            return [value for value in self.unique_values.values() if value is not _DIGEST_ONLY]
+        return self.sample.get_values()
+
+    def get_data_types(self) -> list:
+        """
+        Returns all found python types in the order they were first seen
+        :return:
+        """
+        return list(self.data_types.keys())
+
+    def get_data_type_counts(self) -> typing.List[int]:
+        """
+        Returns the number of values of each found python type, in the same order as get_data_types
+        :return:
+        """
+        return list(self.data_types.values())
+
+    def get_missing_count(self, document_count: int) -> int:
+        """
+        Returns the number of documents in which the path was not found at all
+        :param document_count: number of documents folded into the analysis
+        :return:
+        """
+        return document_count - self.present_count - self.null_count
+
+    def has_nulls(self, document_count: int) -> bool:
+        """
+        Returns True if the path was null or missing in at least one document. Documents in which the path only held
+        dicts or lists within a list count as null as well, like they always did.
+        :param document_count: number of documents folded into the analysis
+        :return:
+        """
+        return self.null_count > 0 or self.element_container_count > 0 or self.present_count < document_count
+
+    def get_density(self, document_count: int) -> float:
+        """
+        Returns the density the same way the JSONAnalyzer always calculated it: the number of unique non-null
+        values divided by the number of unique values, where missing and null each count as one unique value.
+        If the path was present, but none of its values is known - see UNKNOWN_VALUE - or the unique values are not
+        tracked, they count as one unique value.
+        :param document_count: number of documents folded into the analysis
+        :return:
+        """
+        len_values_without_nan: int = self.get_distinct_count() or int(self.present_count > 0)
+        missing: bool = self.present_count + self.null_count < document_count
+        len_values: int = len_values_without_nan + int(missing) + int(self.null_count > 0)
+        return len_values_without_nan / len_values if len_values != 0 else 0
+
+    def merge(self, other: "PathAccumulator", document_offset: int = 0) -> "PathAccumulator":
+        """
+        Merge the infos of another accumulator of the same path into this one.
+        The documents of the other accumulator are treated as if they were appended after the own documents.
+        If one of the accumulators does not track presence or unique values, they are dropped.
+        :param other: accumulator to merge into this one
+        :param document_offset: number of own documents, the document indexes of the other bitmaps are shifted by it.
+        :return: self
+        """
+        if self.present_bitmap is not None and other.present_bitmap is not None:
+            self.present_bitmap.merge(other.present_bitmap, document_offset)
+            self.null_bitmap.merge(other.null_bitmap, document_offset)
+        else:
+            self.present_bitmap = None
+            self.null_bitmap = None
+        self.present_count += other.present_count
+        self.null_count += other.null_count
+        self.element_container_count += other.element_container_count
+        for data_type, count in other.data_types.items():
+            self.data_types[data_type] = self.data_types.get(data_type, 0) + count
+        if other.array_count:
+            if self.array_count:
+                self.array_length_min = min(self.array_length_min, other.array_length_min)
+                self.array_length_max = max(self.array_length_max, other.array_length_max)
+            else:
+                self.array_length_min = other.array_length_min
+                self.array_length_max = other.array_length_max
+            self.array_count += other.array_count
+            self.array_length_sum += other.array_length_sum
+        if not other.track_unique_values:
+            self.stop_tracking_unique_values()
+        elif self.track_unique_values:
+            if other.sketch is None:
+                for key, value in other.unique_values.items():
+                    self.__add_unique(key, value)
+            else:
+                if self.sketch is None:
+                    self.__switch_to_sketch()
+                self.sketch.merge(other.sketch)
+                self.sample.merge(other.sample)
+        return self
+
+    @staticmethod
+    def get_type_name(data_type: type) -> str:
+        """
+        Returns a serializable name of the python type, e.g. "datetime:datetime"
+        :param data_type:
+        :return:
+        """
+        return data_type.__module__ + ":" + data_type.__qualname__
+
+    @staticmethod
+    def get_type_by_name(type_name: str) -> type:
+        """
+        Returns the python type to a name created by get_type_name
+        :param type_name:
+        :return:
+        """
+        if type_name == PathAccumulator.get_type_name(type(None)):
+            return type(None)
+        module_name, qualname = type_name.split(":", 1)
+        data_type = importlib.import_module(module_name)
+        for attribute in qualname.split("."):
+            data_type = getattr(data_type, attribute)
+        return data_type
+
+    def as_dict(self) -> dict:
+        """
+        Returns the accumulator as a dict which only contains serializable types
+        :return:
+        """
+        return {
+            "path": self.path,
+            "max_unique_values": self.max_unique_values,
+            "sample_size": self.sample_size,
+            "track_unique_values": self.track_unique_values,
+            "present_count": self.present_count,
+            "null_count": self.null_count,
+            "element_container_count": self.element_container_count,
+            "data_types": {self.get_type_name(data_type): count for data_type, count in self.data_types.items()},
+            "unique_values": self.get_unique_values(),
+            "unique_digests": [key.hex() for key, value in self.unique_values.items() if value is _DIGEST_ONLY],
+            "sketch": self.sketch.as_dict() if self.sketch is not None else None,
+            "sample_seen": self.sample.seen if self.sample is not None else None,
+            "array_count": self.array_count,
+            "array_length_sum": self.array_length_sum,
+            "array_length_min": self.array_length_min,
+            "array_length_max": self.array_length_max,
+            "present_bitmap": self.present_bitmap.as_dict() if self.present_bitmap is not None else None,
+            "null_bitmap": self.null_bitmap.as_dict() if self.null_bitmap is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> "PathAccumulator":
+        """
+        Create an accumulator from the output of as_dict
+        :param dict_:
+        :return:
+        """
+        accumulator = cls(dict_["path"], max_unique_values=dict_.get("max_unique_values"),
+                          sample_size=dict_.get("sample_size", 20),
+                          track_unique_values=dict_.get("track_unique_values", True))
+        accumulator.present_count = dict_["present_count"]
+        accumulator.null_count = dict_["null_count"]
+        accumulator.element_container_count = dict_.get("element_container_count", 0)
+        accumulator.data_types = {cls.get_type_by_name(type_name): count
+                                  for type_name, count in dict_["data_types"].items()}
+        accumulator.array_count = dict_.get("array_count", 0)
+        accumulator.array_length_sum = dict_.get("array_length_sum", 0)
+        accumulator.array_length_min = dict_.get("array_length_min")
+        accumulator.array_length_max = dict_.get("array_length_max")
+        if dict_.get("sketch") is None:
+            for value in dict_["unique_values"]:
+                accumulator.__add_unique(cls.get_hashable(value), value)
+            for digest in dict_.get("unique_digests", []):
+                accumulator.__add_unique(bytes.fromhex(digest), _DIGEST_ONLY)
+        else:
+            accumulator.sketch = HyperLogLog.from_dict(dict_["sketch"])
+            accumulator.sample = ReservoirSample(accumulator.sample_size)
+            for value in dict_["unique_values"]:
+                accumulator.sample.add(cls.get_hashable(value), value)
+            accumulator.sample.seen = dict_["sample_seen"]
+        if dict_.get("present_bitmap") is not None:
+            accumulator.present_bitmap = PresenceBitmap.from_dict(dict_["present_bitmap"])
+            accumulator.null_bitmap = PresenceBitmap.from_dict(dict_["null_bitmap"])
+        return accumulator
@@ -0,0 +1,141 @@
+import typing
+
+
+class PathNode:
+
+    def __init__(self, path_id: int,
+                 parent_id: typing.Optional[int],
+                 name: str,
+                 path: str,
+                 avro_name: str,
+                 avro_path: str,
+                 depth: int):
+        """
+        One node of the PathTrie, which represents one path/column.
+        All derived names are built once when the node is created, so the path never needs to be parsed again.
+        :param path_id: integer ID of the path, the index of the node in the trie
+        :param parent_id: ID of the parent path, None for root elements
+        :param name: name of the element, the last part of the path
+        :param path: JSON path
+        :param avro_name: AVRO name
+        :param avro_path: AVRO path
+        :param depth: nesting depth, 0 for root elements
+        """
+        self.path_id: int = path_id
+        self.parent_id: typing.Optional[int] = parent_id
+        self.name: str = name
+        self.path: str = path
+        self.avro_name: str = avro_name
+        self.avro_path: str = avro_path
+        self.depth: int = depth
+        self.children: typing.Dict[str, int] = {}
+
+
+class PathTrie:
+
+    def __init__(self, path_concat_separator: str = ".", list_symbol: str = "0", dict_path_append_name: str = "_record"):
+        """
+        Trie of all paths found in the analyzed documents, which maps each path to an integer ID.
+        IDs are assigned in the order the paths are found, so a parent always has a lower ID than its children.
+        :param path_concat_separator: string which separates the elements of a path
+        :param list_symbol: string which represents list elements in a path
+        :param dict_path_append_name: string which is appended to the AVRO name of the parent to name list elements
+        """
+        self.path_concat_separator: str = path_concat_separator
+        self.list_symbol: str = list_symbol
+        self.dict_path_append_name: str = dict_path_append_name
+        self.nodes: typing.List[PathNode] = []
+        self.root_children: typing.Dict[str, int] = {}
+        self.__path_ids: typing.Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get_children(self, parent_id: typing.Optional[int]) -> typing.Dict[str, int]:
+        """
+        Returns the {name: path_id} mapping of the children of a node, or of the root elements if parent_id is None.
+        :param parent_id:
+        :return:
+        """
+        return self.root_children if parent_id is None else self.nodes[parent_id].children
+
+    def get_child_id(self, parent_id: typing.Optional[int], name: str) -> int:
+        """
+        Returns the ID of the child with the given name, the child is added if it does not exist yet.
+        :param parent_id: ID of the parent, None for root elements
+        :param name: name of the child
+        :return:
+        """
+        path_id: int = self.get_children(parent_id).get(name)
+        if path_id is None:
+            path_id = self.add_node(parent_id, name)
+        return path_id
+
+    def add_node(self, parent_id: typing.Optional[int], name: str) -> int:
+        """
+        Add a new child node to the parent and return its ID
+        :param parent_id: ID of the parent, None for root elements
+        :param name: name of the child
+        :return:
+        """
+        name = str(name)
+        path_id: int = len(self.nodes)
+        if parent_id is None:
+            node = PathNode(path_id=path_id, parent_id=None, name=name, path=name, avro_name=name, avro_path=name,
+                            depth=0)
+        else:
+            parent: PathNode = self.nodes[parent_id]
+            avro_name: str = parent.avro_name + self.dict_path_append_name if name == self.list_symbol else name
+            node = PathNode(path_id=path_id,
+                            parent_id=parent_id,
+                            name=name,
+                            path=parent.path + self.path_concat_separator + name,
+                            avro_name=avro_name,
+                            avro_path=parent.avro_path + self.path_concat_separator + avro_name,
+                            depth=parent.depth + 1)
+        self.nodes.append(node)
+        self.get_children(parent_id)[name] = path_id
+        self.__path_ids[node.path] = path_id
+        return path_id
+
+    def get_node(self, path_id: int) -> PathNode:
+        """
+        Returns the node with the given ID
+        :param path_id:
+        :return:
+        """
+        return self.nodes[path_id]
+
+    def get_id(self, path: str) -> typing.Optional[int]:
+        """
+        Returns the ID of the given path or None, if the path is not known.
+        :param path:
+        :return:
+        """
+        return self.__path_ids.get(path)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the trie as a serializable dict
+        :return:
+        """
+        return {
+            "path_concat_separator": self.path_concat_separator,
+            "list_symbol": self.list_symbol,
+            "dict_path_append_name": self.dict_path_append_name,
+            "nodes": [[node.parent_id, node.name] for node in self.nodes]
+        }
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> "PathTrie":
+        """
+        Create a trie from the output of as_dict, the IDs stay the same.
+        :param dict_:
+        :return:
+        """
+        trie = cls(path_concat_separator=dict_["path_concat_separator"],
+                   list_symbol=dict_["list_symbol"],
+                   dict_path_append_name=dict_["dict_path_append_name"])
+        for parent_id, name in dict_["nodes"]:
+            trie.add_node(parent_id, name)
+        return trie
@@ -0,0 +1,91 @@
+import base64
+import typing
+
+
+class PresenceBitmap:
+
+    def __init__(self, data: bytearray = None):
+        """
+        Compact set of document indexes, one bit per document.
+        Bit i of the bitmap is set if the document with index i is part of the set, e.g. because a path was present
+        in it. The bitmap only grows up to the highest index added, so a million documents need at most 125 KB.
+        :param data: bits of the bitmap, little-endian: bit i is bit i % 8 of byte i // 8.
+        """
+        self.data: bytearray = data if data is not None else bytearray()
+
+    def add(self, index: int):
+        """
+        Add a document index to the set
+        :param index:
+        :return:
+        """
+        data: bytearray = self.data
+        byte_index: int = index >> 3
+        if byte_index >= len(data):
+            data.extend(bytes(byte_index + 1 - len(data)))
+        data[byte_index] |= 1 << (index & 7)
+
+    def __contains__(self, index: int) -> bool:
+        byte_index: int = index >> 3
+        return byte_index < len(self.data) and bool(self.data[byte_index] >> (index & 7) & 1)
+
+    def to_int(self) -> int:
+        """
+        Returns the bitmap as an int, whose bit i is set if index i is in the set
+        :return:
+        """
+        return int.from_bytes(self.data, "little")
+
+    @classmethod
+    def from_int(cls, bits: int) -> "PresenceBitmap":
+        """
+        Create a bitmap from an int, see to_int
+        :param bits: non-negative int
+        :return:
+        """
+        return cls(bytearray(bits.to_bytes((bits.bit_length() + 7) // 8, "little")))
+
+    def count(self) -> int:
+        """
+        Returns the number of document indexes in the set
+        :return:
+        """
+        return self.to_int().bit_count()
+
+    def get_indexes(self) -> typing.Iterator[int]:
+        """
+        Yield the document indexes in the set in ascending order
+        :return:
+        """
+        for byte_index, byte in enumerate(self.data):
+            while byte:
+                lowest_bit: int = byte & -byte
+                yield (byte_index << 3) + lowest_bit.bit_length() - 1
+                byte ^= lowest_bit
+
+    def merge(self, other: "PresenceBitmap", offset: int) -> "PresenceBitmap":
+        """
+        Merge another bitmap into this one, its indexes are shifted by offset.
+        :param other: bitmap to merge, it is not altered.
+        :param offset: number of documents the indexes of the other bitmap are shifted by, i.e. the number of
+            documents of this bitmap when the documents of the other one are appended.
+        :return: self
+        """
+        self.data = PresenceBitmap.from_int(self.to_int() | other.to_int() << offset).data
+        return self
+
+    def as_dict(self) -> dict:
+        """
+        Returns the bitmap as a serializable dict
+        :return:
+        """
+        return {"data": base64.b64encode(bytes(self.data)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> "PresenceBitmap":
+        """
+        Create a bitmap from the output of as_dict
+        :param dict_:
+        :return:
+        """
+        return cls(bytearray(base64.b64decode(dict_["data"])))
@@ -0,0 +1,72 @@
+import typing
+
+from pyscgen.json.analyze.analysis_state import AnalysisState
+from pyscgen.json.analyze.path_accumulator import PathAccumulator, ELEMENT_CONTAINER, VALUE_ELEMENT_CONTAINER
+
+
+class ShapePlan:
+
+    def __init__(self):
+        """
+        Precompiled fold of one structural document shape.
+        It is recorded from the events of the first document with the shape. Every further document with the same
+        shape only needs its values and the lengths of its lists to update the accumulators, the type counts and the
+        presence of dicts and lists within lists are the same for all of them. The values are the scalars and the
+        dicts and lists which are not within a list. The list lengths are not part of the shape if only some elements
+        of long lists are inspected.
+        Every path and data type of the shape was added to the state when the plan was recorded, so only the
+        nullability of the paths can change when a plan is folded.
+        """
+        self.type_counts: typing.Dict[typing.Tuple[int, type], int] = {}
+        # {path_id: status} of the dicts and lists within a list
+        self.container_presence: typing.Dict[int, int] = {}
+        self.value_path_ids: typing.List[int] = []
+        self.array_path_ids: typing.List[int] = []
+
+    def record(self, path_id: int, data_type: type, value: typing.Any, is_container: bool):
+        """
+        Record one event of a document with this shape
+        :param path_id: ID of the path
+        :param data_type: python type of the value
+        :param value: value of the event, ELEMENT_CONTAINER for dicts and lists within a list
+        :param is_container: True if the value is a dict or list
+        :return:
+        """
+        self.type_counts[(path_id, data_type)] = self.type_counts.get((path_id, data_type), 0) + 1
+        if is_container and value is ELEMENT_CONTAINER:
+            self.container_presence[path_id] = VALUE_ELEMENT_CONTAINER
+        else:
+            self.value_path_ids.append(path_id)
+
+    def record_arrays(self, array_lengths: typing.List[typing.Tuple[int, int]]):
+        """
+        Record the paths of the lists of a document with this shape
+        :param array_lengths: (path_id, length) of each list in the order they were walked
+        :return:
+        """
+        self.array_path_ids = [path_id for path_id, length in array_lengths]
+
+    def fold(self, values: list, state: AnalysisState, array_lengths: typing.List[int] = ()):
+        """
+        Fold the values of a document with this shape into the accumulators of the state.
+        :param values: scalars and dicts and lists which are not within a list, in the order of the recorded events
+        :param state: AnalysisState the plan was recorded with
+        :param array_lengths: lengths of the lists in the order they were recorded
+        :return:
+        """
+        accumulators: typing.List[PathAccumulator] = state.accumulators
+        for path_id, length in zip(self.array_path_ids, array_lengths):
+            accumulators[path_id].add_array_length(length)
+        for (path_id, data_type), count in self.type_counts.items():
+            accumulators[path_id].add_data_type(data_type, count)
+        document_accumulators: typing.Dict[PathAccumulator, int] = {
+            accumulators[path_id]: status for path_id, status in self.container_presence.items()}
+        digests: dict = {}
+        for path_id, value in zip(self.value_path_ids, values):
+            accumulator: PathAccumulator = accumulators[path_id]
+            # the highest status of the values of a path in the document counts
+            status: int = accumulator.add_counted_value(value, digests)
+            if document_accumulators.get(accumulator, -1) < status:
+                document_accumulators[accumulator] = status
+        # a known shape brings no new paths or data types, but NaN values can still make a path nullable
+        state.add_document(document_accumulators)
@@ -0,0 +1,98 @@
+import collections.abc as collections
+import hashlib
+import operator
+import typing
+
+_PLAIN_TYPES: typing.Tuple[type, ...] = (str, int, float, bool, type(None))
+_NESTED_TYPES: typing.Tuple[type, ...] = (collections.Mapping, list, tuple, set, frozenset)
+_get_key = operator.itemgetter(0)
+
+
+def _is_nested(value: typing.Any) -> bool:
+    """
+    Returns True if the value is a dict, list, tuple or set, which is hashed by its children.
+    :param value:
+    :return:
+    """
+    return type(value) not in _PLAIN_TYPES and isinstance(value, _NESTED_TYPES)
+
+
+def _encode_scalar(value: typing.Any) -> str:
+    """
+    Encodes a scalar by its repr, which differs for str, int, float, bool and None values. Values of other types
+    are prefixed with their type.
+    :param value: scalar value
+    :return:
+    """
+    if type(value) in _PLAIN_TYPES:
+        return repr(value)
+    return "\x1f" + type(value).__qualname__ + ":" + repr(value)
+
+
+def _encode_child(value: typing.Any, digests: dict) -> str:
+    """
+    Encodes a child of a container: nested values by their digest, which has to be computed already.
+    :param value: child value
+    :param digests: digests of the nested values by their id
+    :return:
+    """
+    if _is_nested(value):
+        return "#" + digests[id(value)].hex()
+    return _encode_scalar(value)
+
+
+def _encode_nested(value: typing.Any, digests: dict) -> str:
+    """
+    Encodes a dict, list, tuple or set, whose nested children are already hashed
+    :param value: nested value
+    :param digests: digests of the nested values by their id
+    :return:
+    """
+    if isinstance(value, collections.Mapping):
+        try:
+            items: list = sorted(value.items(), key=_get_key)
+        except TypeError:
+            items = sorted(value.items(), key=lambda key_child: str(key_child[0]))
+        return "{" + ",".join(_encode_scalar(key) + ":" + _encode_child(child, digests)
+                              for key, child in items) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "<" + ",".join(sorted(_encode_child(child, digests) for child in value)) + ">"
+    return "[" + ",".join(_encode_child(child, digests) for child in value) + "]"
+
+
+def _hash(encoded: str) -> bytes:
+    return hashlib.blake2b(encoded.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def get_structural_hash(value: typing.Any, digests: dict = None) -> bytes:
+    """
+    Returns a canonical 128 bit digest of a nested value, which is equal for structurally equal values.
+    Dicts are encoded ordered by key and sets ordered by their elements, so the order of the keys or elements does
+    not matter. Lists and tuples are encoded the same way, as tuples become lists when a value is serialized to JSON.
+    The value is hashed bottom-up with an explicit stack, so there is no limit for the nesting depth: each nested
+    value is encoded by the digests of its nested children. The digests are kept in digests by the id of the value,
+    so hashing a value and its children one after the other only hashes every nested value once.
+    :param value: any value, e.g. a dict, list, set or scalar
+    :param digests: If given, the digests of all nested values are looked up in and added to this dict. It must
+        only be used while the hashed values are alive and unchanged, e.g. for the values of one document.
+    :return:
+    """
+    if not _is_nested(value):
+        return _hash(_encode_scalar(value))
+    if digests is None:
+        digests = {}
+    stack: list = [value]
+    while stack:
+        item = stack[-1]
+        if id(item) in digests:
+            stack.pop()
+            continue
+        children = item.values() if isinstance(item, collections.Mapping) else item
+        pending: list = [child for child in children if _is_nested(child) and id(child) not in digests]
+        if pending:
+            # the item is visited again once all its nested children are hashed
+            stack.extend(pending)
+        else:
+            stack.pop()
+            digests[id(item)] = _hash(_encode_nested(item, digests))
+    return digests[id(value)]
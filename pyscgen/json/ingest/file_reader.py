@@ -0,0 +1,128 @@
+import mmap
+import re
+import typing
+
+from pyscgen.json.ingest.json_parser import JSONParser
+
+_NON_WHITESPACE = re.compile(rb"\S")
+
+
+class FileReader:
+
+    def __init__(self, ndjson: bool = True, parser_backend: str = "auto"):
+        """
+        Reads JSON documents from files through mmap and yields them one by one, so only the document which is
+        currently processed is held in memory.
+        :param ndjson: If True, the files contain newline-delimited JSON, one document per line. The lines are split
+            on the memory map without copying the file and parsed lazily. If False, each file holds exactly one
+            JSON document. Defaults to True.
+        :param parser_backend: JSON decoding backend, see JSONParser. Defaults to "auto".
+        """
+        self.ndjson = ndjson
+        self.parser: JSONParser = JSONParser(parser_backend)
+
+    @staticmethod
+    def get_paths(paths: typing.Union[str, typing.Iterable[str]]) -> typing.List[str]:
+        """
+        Returns a list of paths for a single path or an iterable of paths
+        :param paths:
+        :return:
+        """
+        return [paths] if isinstance(paths, str) else list(paths)
+
+    @staticmethod
+    def iter_lines(view: memoryview) -> typing.Iterator[memoryview]:
+        """
+        Split a memory map on line boundaries and yield each non-blank line as a memoryview slice of it, nothing is
+        copied. Each slice is released after it was processed, so the map can be closed afterwards.
+        :param view: memoryview of the memory map
+        :return:
+        """
+        size: int = len(view)
+        data = view.obj
+        start: int = 0
+        while start < size:
+            end: int = data.find(b"\n", start)
+            if end == -1:
+                end = size
+            if _NON_WHITESPACE.search(data, start, end):
+                line: memoryview = view[start:end]
+                try:
+                    yield line
+                finally:
+                    line.release()
+            start = end + 1
+
+    def parse(self, data: typing.Union[bytes, memoryview]) -> typing.Any:
+        """
+        Parse one JSON document with the backend of the parser
+        :param data: raw JSON bytes
+        :return:
+        """
+        return self.parser.loads(data)
+
+    def read_raw_file(self, path: str) -> typing.Iterator[memoryview]:
+        """
+        Yield the raw JSON of each document of one file as a memoryview slice of the memory map.
+        A slice is only valid until the next one is requested.
+        :param path: path of the file
+        :return:
+        """
+        with open(path, "rb") as file:
+            if file.seek(0, 2) == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from self.read_raw_bytes(mapped)
+
+    def read_raw_bytes(self, data: typing.Union[bytes, bytearray, mmap.mmap]) -> typing.Iterator[memoryview]:
+        """
+        Yield the raw JSON of each document of the bytes as a memoryview slice, nothing is copied.
+        A slice is only valid until the next one is requested.
+        :param data: newline-delimited JSON if ndjson is set, otherwise one JSON document
+        :return:
+        """
+        with memoryview(data) as view:
+            if self.ndjson:
+                yield from self.iter_lines(view)
+            elif _NON_WHITESPACE.search(view.obj):
+                yield view
+
+    def read_raw_documents(self, paths: typing.Union[str, typing.Iterable[str]]) -> typing.Iterator[memoryview]:
+        """
+        Yield the raw JSON of all documents of all files one after another, see read_raw_file.
+        :param paths: a single path or an iterable of paths
+        :return:
+        """
+        path: str
+        for path in self.get_paths(paths):
+            yield from self.read_raw_file(path)
+
+    def read_file(self, path: str) -> typing.Iterator[dict]:
+        """
+        Yield the documents of one file
+        :param path: path of the file
+        :return:
+        """
+        raw: memoryview
+        for raw in self.read_raw_file(path):
+            yield self.parse(raw)
+
+    def read_bytes(self, data: typing.Union[bytes, bytearray, mmap.mmap]) -> typing.Iterator[dict]:
+        """
+        Yield the documents of raw JSON bytes, e.g. a message payload or a memory mapped file.
+        :param data: newline-delimited JSON if ndjson is set, otherwise one JSON document
+        :return:
+        """
+        raw: memoryview
+        for raw in self.read_raw_bytes(data):
+            yield self.parse(raw)
+
+    def read_documents(self, paths: typing.Union[str, typing.Iterable[str]]) -> typing.Iterator[dict]:
+        """
+        Yield the documents of all files one after another
+        :param paths: a single path or an iterable of paths
+        :return:
+        """
+        raw: memoryview
+        for raw in self.read_raw_documents(paths):
+            yield self.parse(raw)
@@ -0,0 +1,75 @@
+import json
+import typing
+import warnings
+
+
+class JSONParser:
+    backends: typing.Tuple[str, ...] = ("orjson", "simdjson", "json")
+
+    def __init__(self, backend: str = "auto"):
+        """
+        Decodes raw JSON bytes with a selectable backend.
+        orjson and simdjson are optional dependencies. If the requested backend is not installed, a warning is issued
+        and the next available backend is used, the stdlib json module is always available as last resort.
+        Documents which a fast backend rejects, e.g. because of NaN values, are parsed with the stdlib json module
+        again, so every backend accepts the same input. Note that orjson parses integers with more than 64 bit as float.
+        :param backend: "json", "orjson", "simdjson" or "auto", which uses the fastest installed backend.
+            Defaults to "auto".
+        """
+        if backend != "auto" and backend not in self.backends:
+            raise ValueError("Unknown JSON backend '" + str(backend) + "', choose one of: auto, " +
+                             ", ".join(self.backends))
+        self.requested_backend: str = backend
+        self.backend: str = "json"
+        self.__loads: typing.Callable[[typing.Any], typing.Any] = self.__loads_json
+        candidates: typing.Tuple[str, ...] = self.backends if backend == "auto" else \
+            self.backends[self.backends.index(backend):]
+        for candidate in candidates:
+            loads: typing.Optional[typing.Callable] = self.__import_backend(candidate)
+            if loads is not None:
+                self.backend = candidate
+                self.__loads = loads
+                break
+        if backend != "auto" and self.backend != backend:
+            warnings.warn("The JSON backend '" + backend + "' is not installed, '" + self.backend +
+                          "' is used instead.")
+
+    @staticmethod
+    def __loads_json(data: typing.Any) -> typing.Any:
+        """
+        Parse one JSON document with the stdlib json module
+        :param data: raw JSON
+        :return:
+        """
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def __import_backend(self, backend: str) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+        """
+        Returns the loads function of the backend or None, if it is not installed.
+        :param backend:
+        :return:
+        """
+        if backend == "json":
+            return self.__loads_json
+        try:
+            if backend == "orjson":
+                import orjson
+                # orjson reads memoryviews without copying them
+                return orjson.loads
+            import simdjson
+            return lambda data: simdjson.loads(bytes(data) if isinstance(data, memoryview) else data)
+        except ImportError:
+            return None
+
+    def loads(self, data: typing.Union[bytes, bytearray, memoryview, str]) -> typing.Any:
+        """
+        Parse one JSON document
+        :param data: raw JSON
+        :return:
+        """
+        try:
+            return self.__loads(data)
+        except ValueError:
+            if self.backend == "json":
+                raise
+            return self.__loads_json(data)
@@ -0,0 +1,131 @@
+import json
+import re
+import typing
+
+from pyscgen.json.analyze.path_accumulator import ELEMENT_CONTAINER, UNKNOWN_VALUE
+from pyscgen.json.analyze.path_trie import PathTrie
+
+# one JSON token, whitespace is skipped. Groups: 1 punctuation, 2 string content, 3 number, 4 fraction,
+# 5 exponent, 6 literal, 7 anything else, which is invalid. The number group encloses fraction and exponent, so
+# lastindex is 3 for every number
+_TOKEN = re.compile(rb'[ \t\r\n]*(?:([{}\[\]:,])|"((?:[^"\\]|\\.)*)"|(-?\d+(\.\d+)?([eE][+-]?\d+)?)'
+                    rb'|(true|false|null|NaN|-?Infinity)|(.))', re.S)
+_WHITESPACE: bytes = b" \t\r\n"
+_PUNCTUATION, _STRING, _NUMBER, _FRACTION, _EXPONENT, _LITERAL, _INVALID = range(1, 8)
+_LITERALS: typing.Dict[bytes, typing.Any] = {b"true": True, b"false": False, b"null": None, b"NaN": float("nan"),
+                                             b"Infinity": float("inf"), b"-Infinity": float("-inf")}
+
+
+class StructureScanner:
+
+    def __init__(self):
+        """
+        Tokenizes raw JSON bytes and emits the same (path_id, type, value) events as the walker of the JSONAnalyzer,
+        without building the dicts and lists of the document. Only scalar values are created, dicts and lists are
+        emitted with UNKNOWN_VALUE as value - or ELEMENT_CONTAINER within a list, like the walker does. So dicts and lists count
+        as present, but their unique values are not tracked.
+        The input is not fully validated, e.g. missing commas are accepted. If a key occurs twice in an object,
+        both values are emitted, while a parser would only keep the last one.
+        """
+
+    @staticmethod
+    def __decode_string(content: bytes) -> str:
+        """
+        Decode the content of a JSON string token, escape sequences are resolved by the json module.
+        :param content: bytes between the quotes
+        :return:
+        """
+        if b"\\" in content:
+            return json.loads(b'"' + content + b'"')
+        return content.decode("utf-8")
+
+    @staticmethod
+    def __get_error(token: typing.Optional[typing.Match]) -> ValueError:
+        """
+        Returns the error for an unexpected token or the unexpected end of the document
+        :param token:
+        :return:
+        """
+        if token is None:
+            return ValueError("Invalid JSON: unexpected end of the document.")
+        return ValueError("Invalid JSON at position " + str(token.start()) + ": " + repr(token.group(0).strip()))
+
+    def scan(self, data: typing.Union[bytes, memoryview], trie: PathTrie, array_lengths: list = None
+             ) -> typing.Iterator[typing.Tuple[int, type, typing.Any]]:
+        """
+        Scan one JSON document, which must be an object, and yield a (path_id, type, value) event per element.
+        :param data: raw JSON bytes of one document
+        :param trie: PathTrie which maps the paths to integer IDs, new paths are added to it.
+        :param array_lengths: If given, a pair [path_id, length] is appended for every list, like the walker does.
+        :return:
+        """
+        if array_lengths is None:
+            array_lengths = []
+        decode_string = self.__decode_string
+        list_symbol: str = trie.list_symbol
+        nodes: list = trie.nodes
+        # trailing whitespace, e.g. the newline at the end of a file or the carriage return of a CRLF line, ends the
+        # input. Otherwise, it would be matched as invalid token.
+        end: int = len(data)
+        while end and data[end - 1] in _WHITESPACE:
+            end -= 1
+        tokens: typing.Iterator[typing.Match] = _TOKEN.finditer(data, 0, end)
+        token = next(tokens, None)
+        if token is None or token.group(_PUNCTUATION) != b"{":
+            raise ValueError("The JSON document must be an object.")
+        # each entry holds the children of the container node, its path ID, if the container is a list, if the
+        # container is located within a list and for lists the index of their length in array_lengths
+        stack: list = [(trie.root_children, None, False, False, None)]
+        while stack:
+            children, parent_id, is_list, within_list, length_index = stack[-1]
+            token = next(tokens, None)
+            if token is None:
+                raise self.__get_error(token)
+            kind: int = token.lastindex
+            if kind == _PUNCTUATION:
+                punctuation: bytes = token.group(_PUNCTUATION)
+                if punctuation == b",":
+                    continue
+                if punctuation == (b"]" if is_list else b"}"):
+                    stack.pop()
+                    continue
+            if is_list:
+                key: str = list_symbol
+                within_list = True
+                array_lengths[length_index][1] += 1
+            else:
+                if kind != _STRING:
+                    raise self.__get_error(token)
+                key = decode_string(token.group(_STRING))
+                token = next(tokens, None)
+                if token is None or token.group(_PUNCTUATION) != b":":
+                    raise self.__get_error(token)
+                token = next(tokens, None)
+                if token is None:
+                    raise self.__get_error(token)
+                kind = token.lastindex
+            path_id: int = children.get(key)
+            if path_id is None:
+                path_id = trie.get_child_id(parent_id, key)
+            if kind == _STRING:
+                yield path_id, str, decode_string(token.group(_STRING))
+            elif kind == _NUMBER:
+                if token.group(_FRACTION) is None and token.group(_EXPONENT) is None:
+                    yield path_id, int, int(token.group(_NUMBER))
+                else:
+                    yield path_id, float, float(token.group(_NUMBER))
+            elif kind == _LITERAL:
+                value: typing.Any = _LITERALS[token.group(_LITERAL)]
+                yield path_id, type(value), value
+            elif kind == _PUNCTUATION and token.group(_PUNCTUATION) == b"{":
+                yield path_id, dict, ELEMENT_CONTAINER if within_list else UNKNOWN_VALUE
+                stack.append((nodes[path_id].children, path_id, False, within_list, None))
+            elif kind == _PUNCTUATION and token.group(_PUNCTUATION) == b"[":
+                yield path_id, list, ELEMENT_CONTAINER if within_list else UNKNOWN_VALUE
+                stack.append((nodes[path_id].children, path_id, True, within_list, len(array_lengths)))
+                array_lengths.append([path_id, 0])
+            else:
+                raise self.__get_error(token)
+        token = next(tokens, None)
+        if token is not None:
+            raise self.__get_error(token)
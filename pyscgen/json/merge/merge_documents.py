@@ -1,118 +1,130 @@
 import warnings
-from typing import Any
-
-from glom import assign, Assign, glom
+from typing import Any, Dict, Iterable, Optional, Union, List
 
 from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
-from pyscgen.json._model.analyze_model import ColumnInfo
+from pyscgen.json.analyze.analysis_state import AnalysisState
+from pyscgen.json._model.analyze_model import ColumnInfo, ColumnInfos
 
 
 class DocumentMerger:
 
-    def __init__(self):
+    def __init__(self, type_dominance_threshold: float = None, track_unique_values: bool = False):
         """
 
+        :param type_dominance_threshold: If set, keys with mixed types get a placeholder of the type which makes up at
+            least this share of the values instead of string, see JSONAnalyzer. Defaults to None.
+        :param track_unique_values: If True, the unique values of each key are tracked, see JSONAnalyzer. The merged
+            document does not need them, so by default they are not tracked at all and the state of update only
+            holds the counts and data types of each key. Defaults to False.
         """
-        self.json_analyzer = JSONAnalyzer()
+        self.json_analyzer = JSONAnalyzer(type_dominance_threshold=type_dominance_threshold,
+                                          track_unique_values=track_unique_values)
         self.__list_symbol_extended: str = self.json_analyzer.path_concat_separator + self.json_analyzer.list_symbol
 
-    def get_merged_document(self, docs: [dict]) -> dict:
+    def get_merged_document(self, docs: [dict], workers: int = None, sample: int = None) -> dict:
         """
         Create a single representation out of n supplied JSON-Documents/dicts.
         All found columns are merged into one document.
         Please note that the output document contains only placeholder values for each key with the correct datatype.
         Internally, the json analyzer is used which is present in this package to gather all needed information.
         :param docs: List of JSON-Documents/Dicts which should be analyzed and merged into one.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the merged document is based on a bounded sample of at most this number of documents,
+            see JSONAnalyzer.analyze. Defaults to None, which means all documents are analyzed.
         :return:
         """
-        _ , column_infos, _, _, _ = self.json_analyzer.analyze(docs=docs)
-        merged: dict = {}
-        column_info: ColumnInfo
-        # loop over the analyzed column infos
-        for column_info in column_infos.column_infos:
-            # find out if the current column is of type list or dict
-            is_list: bool = column_info.data_type_config.python_type == list
-            is_dict: bool = column_info.data_type_config.python_type == dict
-            # add a new element to the merged dict based on the gathered infos
-            merged = self.__add_element(merged, column_info, is_list, is_dict)
-        return merged
+        column_infos: ColumnInfos = self.json_analyzer.analyze(docs=docs, workers=workers, sample=sample).column_infos
+        return self.get_merged_document_from_column_infos(column_infos)
 
-    def __add_element(self, merged: dict, column_info: ColumnInfo, is_list: bool, is_dict: bool):
+    def get_merged_document_from_files(self, paths: Union[str, List[str]], ndjson: bool = True, workers: int = None,
+                                       sample: int = None, parser_backend: str = "auto") -> dict:
         """
-        Adds an element to merged based on the given infos.
-        :param merged: merged dict which is iteratively built
-        :param column_info: colum info object
-        :param is_list: True if the current column is a list
-        :param is_dict: True if the current column is a dict
+        Create a merged document out of JSON files. The files are streamed through the JSON analyzer, see
+        JSONAnalyzer.analyze_files, so they are never loaded into memory as a whole.
+        :param paths: a single path or a list of paths
+        :param ndjson: If True, the files contain newline-delimited JSON, one document per line. If False, each file
+            holds exactly one JSON document. Defaults to True.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the merged document is based on a bounded sample of at most this number of documents.
+            Defaults to None, which means all documents are analyzed.
+        :param parser_backend: JSON decoding backend, see JSONAnalyzer.analyze_files. Defaults to "auto".
         :return:
         """
+        column_infos: ColumnInfos = self.json_analyzer.analyze_files(paths, ndjson=ndjson, workers=workers,
+                                                                     sample=sample, parser_backend=parser_backend)
+        return self.get_merged_document_from_column_infos(column_infos)
 
-        path: str = column_info.path
-        # use the datatype infos to append the correct value to the element
-        if is_list:
-            # an empty list is not working because your don´t have an element [0] there
-            # Also None is not working too because you can´t assign to it. That´s why I´m using Any.
-            _ = self.__assign_wrapper(merged, path, [Any], is_list, is_dict)
-        elif is_dict:
-            _ = self.__assign_wrapper(merged, path, {}, is_list, is_dict)
-        else:
-            # if its not a dict or list, add the value from the data type config
-            _ = self.__assign_wrapper(merged, path, column_info.data_type_config.python_value,
-                                      is_list, is_dict)
-        return merged
+    def create_state(self, docs: Iterable[dict] = (), workers: int = None) -> AnalysisState:
+        """
+        Create the analysis state the merged document is based on, e.g. to persist it with AnalysisState.as_dict and
+        add new documents later on with update.
+        :param docs: documents which should be merged, can be empty.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :return:
+        """
+        return self.json_analyzer.analyze_state(docs, workers=workers)
 
-    def __assign_wrapper(self, obj: Any,
-                         path: str,
-                         value: Any,
-                         is_list: bool,
-                         is_dict: bool,
-                         skip_errors: bool = True):
+    def update(self, merged_state: AnalysisState, new_docs: Iterable[dict], workers: int = None) -> dict:
         """
-        A wrapper function around gloms assign method for error handling and building T[]-Paths.
-        :param obj: object to assign to.
-        :param path: assignment path
-        :param value: value to assign
-        :param is_list: True if the current column is a list
-            @DEPRECATED
-        :param is_dict: True if the current column is a dict
-            @DEPRECATED
-        :param skip_errors: True if errors should be skipped and not raised.
-            Defaults to True.
+        Fold new documents into an existing analysis state and return the merged document of all documents the state
+        is based on. Only the new documents are analyzed, so the cost depends on their number and the number of keys,
+        but not on the number of documents merged before.
+        :param merged_state: state created by create_state or a former update, e.g. restored with
+            AnalysisState.from_dict. It is updated in place.
+        :param new_docs: documents which should be added to the merged document
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
         :return:
         """
-        path_elements_list: list = path.split(self.json_analyzer.path_concat_separator)
-        missing_filler = None
-        t_ref = None
+        self.json_analyzer.analyze_state(new_docs, state=merged_state, workers=workers)
+        return self.get_merged_document_from_column_infos(self.json_analyzer.create_column_infos(merged_state))
 
-        def missing_filler_callable():
-            """
-            To be usable in the missing-parameter of glom.Assign it needs to be a callable.
-            So I just wrapped the returning of the needed value in a simple function.
-            :return:
-            """
-            return missing_filler
+    def get_merged_document_from_column_infos(self, column_infos: ColumnInfos) -> dict:
+        """
+        Create the merged document based on the ColumnInfos of the JSON analyzer.
+        The document is built in a single pass over the columns, which form a tree via their path_id and parent_id:
+        each column is added to the container of its parent column, which was created before, as parents are always
+        listed before their children.
+        :param column_infos: ColumnInfos, e.g. the result of JSONAnalyzer.analyze_stream
+        :return:
+        """
+        merged: dict = {}
+        # the dicts and lists created for the columns, by path_id
+        containers: Dict[Optional[int], Any] = {None: merged}
+        column_info: ColumnInfo
+        # loop over the analyzed column infos
+        for column_info in column_infos.column_infos:
+            parent: Any = containers.get(column_info.parent_id)
+            if parent is None:
+                # the parent column is neither a dict nor a list, e.g. because of mixed types, or was skipped itself
+                warnings.warn("The column '" + column_info.path + "' is skipped, because its parent column is not a "
+                              "dict or list in the merged document.")
+                continue
+            value: Any = self.__get_placeholder(column_info)
+            if isinstance(value, (dict, list)):
+                containers[column_info.path_id] = value
+            if isinstance(parent, list):
+                parent[0] = value
+            else:
+                parent[column_info.name] = value
+        return merged
 
-        # simply try to use basic glom.assign to assign the given value to the merged dict.
-        try:
-            _ = assign(obj, path, value)
-        # If glom.assign is not working - e.g. for 0 in the past which indicates a list then build
-        # the T[]-assignment by hand iteratively based on the given path.
-        except Exception as e:
-            try:
-                for element in path_elements_list:
-                    if element == self.json_analyzer.list_symbol:
-                        if t_ref is None:
-                            t_ref = "T[0]"
-                        else:
-                            t_ref = t_ref + "[0]"
-                    else:
-                        if t_ref is None:
-                            t_ref = "T['" + element + "']"
-                        else:
-                            t_ref = t_ref + "['" + element + "']"
-                t_ref = eval(t_ref)
-                _ = glom(obj, Assign(t_ref, value, missing=missing_filler_callable))
-            except Exception as e:
-                warnings.warn(str(e))
-                if not skip_errors:
-                    raise e
+    @staticmethod
+    def __get_placeholder(column_info: ColumnInfo) -> Any:
+        """
+        Returns the placeholder value of a column based on its data type config.
+        :param column_info: colum info object
+        :return:
+        """
+        # use the datatype infos to add the correct value to the element
+        if column_info.data_type_config.python_type == list:
+            # an empty list is not working because there is no element [0] to put the list element in
+            # Also None is not working too because you can´t assign to it. That´s why I´m using Any.
+            return [Any]
+        if column_info.data_type_config.python_type == dict:
+            return {}
+        # if its not a dict or list, add the value from the data type config
+        return column_info.data_type_config.python_value
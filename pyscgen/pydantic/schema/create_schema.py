@@ -1,10 +1,13 @@
+from typing import Union, List
+
 from pydantic_avro.avro_to_pydantic import avsc_to_pydantic
 from pyscgen.avro.schema.create_schema import AvroSchemaGenerator
 
 
 class PydanticSchemaGenerator:
 
-    def __init__(self, alphabetically_ordered_by_path: bool = True, debug: bool = False):
+    def __init__(self, alphabetically_ordered_by_path: bool = True, debug: bool = False,
+                 type_dominance_threshold: float = None):
         """
 
         :param alphabetically_ordered_by_path:
@@ -12,19 +15,52 @@ class PydanticSchemaGenerator:
             This comes in handy if you need a more deterministic solution.
         :param debug: If True, Debug inf is printed out.
             Defaults to False.
+        :param type_dominance_threshold: If set, fields with mixed types get the type which makes up at least this
+            share of the values instead of string, see JSONAnalyzer. Defaults to None.
         """
-        self.avro_schema_generator = AvroSchemaGenerator(alphabetically_ordered_by_path=alphabetically_ordered_by_path, debug=debug)
+        self.avro_schema_generator = AvroSchemaGenerator(alphabetically_ordered_by_path=alphabetically_ordered_by_path, debug=debug,
+                                                         type_dominance_threshold=type_dominance_threshold)
         self.debug = debug
 
-    def create_schema(self, docs: [dict], name: str = "PyScGenClass", namespace: str = "com.pyscgen.avro") -> str:
+    def create_schema(self, docs: [dict], name: str = "PyScGenClass", namespace: str = "com.pyscgen.avro",
+                      workers: int = None, sample: int = None) -> str:
         """
         Creates a pydantic schema/model based on some JSON Messages
         :param docs: List of dicts on which data the AVRO-Schema will be based on
         :param name: Name of the AVRO-Schema used in the "name" Attribute
         :param namespace: AVRO Namespace.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the schema is inferred from a bounded sample of at most this number of documents,
+            see JSONAnalyzer.analyze. Defaults to None, which means all documents are analyzed.
+        :return:
+        """
+        avro_schema = self.avro_schema_generator.create_schema(docs=docs, name=name, namespace=namespace,
+                                                               workers=workers, sample=sample)
+        pydantic_schema = avsc_to_pydantic(avro_schema.as_dict(remove_empty=True))
+        return pydantic_schema
+
+    def create_schema_from_files(self, paths: Union[str, List[str]], name: str = "PyScGenClass",
+                                 namespace: str = "com.pyscgen.avro", ndjson: bool = True, workers: int = None,
+                                 sample: int = None, parser_backend: str = "auto") -> str:
+        """
+        Creates a pydantic schema/model based on JSON files, which are streamed through the JSON analyzer.
+        :param paths: a single path or a list of paths
+        :param name: Name of the AVRO-Schema used in the "name" Attribute
+        :param namespace: AVRO Namespace.
+        :param ndjson: If True, the files contain newline-delimited JSON, one document per line. If False, each file
+            holds exactly one JSON document. Defaults to True.
+        :param workers: If greater than 1, the documents are analyzed in parallel with this number of processes.
+            Defaults to None, which means no parallelism.
+        :param sample: If set, the schema is inferred from a bounded sample of at most this number of documents.
+            Defaults to None, which means all documents are analyzed.
+        :param parser_backend: JSON decoding backend, see JSONAnalyzer.analyze_files. Defaults to "auto".
         :return:
         """
-        avro_schema = self.avro_schema_generator.create_schema(docs=docs, name=name, namespace=namespace)
+        avro_schema = self.avro_schema_generator.create_schema_from_files(paths=paths, name=name, namespace=namespace,
+                                                                          ndjson=ndjson, workers=workers,
+                                                                          sample=sample,
+                                                                          parser_backend=parser_backend)
         pydantic_schema = avsc_to_pydantic(avro_schema.as_dict(remove_empty=True))
         return pydantic_schema
 
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import decimal
 import glob
@@ -7,6 +8,7 @@ import json
 import fastavro
 import pytest
 
+from pyscgen.avro._model.record_model import Field, Record, Schema
 from pyscgen.avro.schema.create_schema import AvroSchemaGenerator
 
 
@@ -192,6 +194,119 @@ class TestAvroSchemaGenerator:
                     # A Schema ca be created but name redefinition is currently not handled and needs to be fixed manually by hand afterwards
                     fastavro.validation.validate(doc, fastavro.parse_schema(json.loads(value_schema_str)))
 
+    def test_schema_generation_workers(self):
+        generator = get_instance()
+        data: dict = get_data("complex")
+        for test, docs in data.items():
+            schema = generator.create_schema(docs)
+            schema_parallel = generator.create_schema(docs, workers=2)
+            assert schema_parallel.as_dict() == schema.as_dict()
+
+    def test_schema_generation_sample(self):
+        generator = get_instance()
+        data: dict = get_data("complex")
+        for test, docs in data.items():
+            schema = generator.create_schema(docs)
+            schema_sampled = generator.create_schema(docs * 20, sample=len(docs))
+            assert schema_sampled.as_dict() == schema.as_dict()
+
+    def test_schema_generation_async(self):
+        generator = get_instance()
+        data: dict = get_data("complex")
+        for test, docs in data.items():
+            async def aiter_docs():
+                for doc in docs:
+                    await asyncio.sleep(0)
+                    yield doc
+
+            schema = generator.create_schema(docs)
+            schema_async = asyncio.run(generator.create_schema_async(aiter_docs(), batch_size=2))
+            assert schema_async.as_dict() == schema.as_dict()
+            schema_async = asyncio.run(generator.create_schema_async(aiter_docs(), sample=len(docs)))
+            assert schema_async.as_dict() == schema.as_dict()
+
+    def test_schema_generation_same_names(self):
+        generator = get_instance()
+        docs = [{"b": {"b": {"id": [1.5], "a": 2.5}, "x": {"x": [1, 2]}}}]
+        schema = generator.create_schema(docs)
+        assert schema.as_dict()["fields"] == [
+            {"name": "b", "type": {"name": "b", "type": "record", "fields": [
+                {"name": "b", "type": {"name": "b", "type": "record", "fields": [
+                    {"name": "a", "type": "float"},
+                    {"name": "id", "type": {"type": "array", "items": "float"}}]}},
+                {"name": "x", "type": {"name": "x", "type": "record", "fields": [
+                    {"name": "x", "type": {"type": "array", "items": "int"}}]}}]}}]
+        with pytest.warns(UserWarning, match="'b.b' is skipped"):
+            schema = generator.create_schema(docs + [{"b": "text"}])
+        assert schema.as_dict()["fields"] == [{"name": "b", "type": "string"}]
+
+    def test_infer_and_write(self):
+        generator = get_instance()
+        docs = [{"a": 1, "b": {"c": 1.5, "d": [1, "x"]}, "l": [{"v": True}, {"v": "t"}]},
+                {"a": "s", "b": {"c": 2.5, "d": []}, "l": []},
+                {"a": {"z": [1]}, "b": None, "l": [{"v": None}]}]
+        out_path: str = "./out/infer_and_write.avro"
+        with pytest.warns(UserWarning, match="'a.z' is skipped"):
+            schema = generator.infer_and_write(docs, out_path, batch_size=2)
+        with open(out_path, "rb") as file:
+            assert [block.num_records for block in fastavro.block_reader(file)] == [2, 1]
+            file.seek(0)
+            reader = fastavro.reader(file)
+            assert reader.codec == "deflate"
+            assert [field["name"] for field in reader.writer_schema["fields"]] == ["a", "b", "l"]
+            assert list(reader) == [{"a": "1", "b": {"c": 1.5, "d": ["1", "x"]}, "l": [{"v": "true"}, {"v": "t"}]},
+                                    {"a": "s", "b": {"c": 2.5, "d": []}, "l": []},
+                                    {"a": '{"z": [1]}', "b": None, "l": [{"v": None}]}]
+        data: dict = get_data("complex")
+        for test, docs in data.items():
+            with pytest.raises(ValueError):
+                generator.infer_and_write(iter(docs), out_path)
+            schema = generator.infer_and_write(iter(docs), out_path, infer_from=len(docs), codec="null")
+            assert schema.as_dict() == generator.create_schema(docs).as_dict()
+            with open(out_path, "rb") as file:
+                assert len(list(fastavro.reader(file))) == len(docs)
+
+    def test_infer_and_write_type_outliers(self):
+        generator = AvroSchemaGenerator(type_dominance_threshold=0.6)
+        docs = [{"a": 1, "b": 1, "c": 1.5, "d": True}] * 5 + [{"a": "8", "b": None, "c": "2", "d": "false"},
+                                                             {"a": 7.0, "b": "n/a", "c": 3, "d": True}]
+        out_path: str = "./out/infer_and_write.avro"
+        schema = generator.infer_and_write(iter(docs), out_path, infer_from=len(docs))
+        assert schema.as_dict()["fields"] == [{"name": "a", "type": "int"}, {"name": "b", "type": ["null", "int"]},
+                                              {"name": "c", "type": "float"}, {"name": "d", "type": "boolean"}]
+        with open(out_path, "rb") as file:
+            assert list(fastavro.reader(file))[-2:] == [{"a": 8, "b": None, "c": 2.0, "d": False},
+                                                        {"a": 7, "b": None, "c": 3.0, "d": True}]
+        with pytest.raises(ValueError, match="'n/a' can´t be converted"):
+            generator.infer_and_write(docs + [{"a": "n/a", "b": 1, "c": 1.5, "d": True}], out_path)
+        schema = generator.infer_and_write([{"a": i, "b": str(i)} for i in range(100)], out_path, sample=10)
+        assert schema.as_dict()["fields"] == [{"name": "a", "type": "int"}, {"name": "b", "type": "string"}]
+        with open(out_path, "rb") as file:
+            assert len(list(fastavro.reader(file))) == 100
+
+    def test_schema_as_dict(self):
+        record = Record(name="r", type="record", default={"a": None, "b": {}},
+                        fields=[Field(name="a", type=["null", "int"], default={}),
+                                ["null", Record(name="e", type="record")]])
+        schema = Schema(name="s", fields=[Field(name="r", type=record)])
+        assert schema.as_dict() == {"name": "s", "type": "record", "fields": [
+            {"name": "r", "type": {"name": "r", "type": "record", "default": {"b": {}}, "fields": [
+                {"name": "a", "type": ["null", "int"], "default": {}}, ["null", {"name": "e", "type": "record"}]]}}]}
+        assert schema.as_dict(remove_empty=False)["fields"][0]["type"]["default"] == {"a": None, "b": {}}
+        assert json.loads(schema.as_json(indent=2)) == schema.as_dict()
+        # deeply nested schemas exceed the recursion limit of the json module
+        field = Field(name="leaf", type="int")
+        for index in range(2000):
+            field = Field(name="f" + str(index), type=Record(name="r" + str(index), type="record", fields=[field]))
+        schema = Schema(name="s", fields=[field])
+        schema_dict = schema.as_dict()
+        for index in range(2000):
+            schema_dict = schema_dict["fields"][0]["type"]
+        assert schema_dict == {"name": "r0", "type": "record", "fields": [{"name": "leaf", "type": "int"}]}
+        schema_json = schema.as_json()
+        assert schema_json.startswith('{"name": "s", "type": "record", "fields": [{"name": "f1999", "type": {')
+        assert schema_json.endswith('[{"name": "leaf", "type": "int"}]' + '}}]' * 2000 + '}')
+
     def test_schema_generator_all_dtypes(self):
         generator = get_instance()
         data: [dict] = {
@@ -0,0 +1,194 @@
+import json
+import os
+
+from pyscgen.json.analyze.analysis_state import AnalysisState
+from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
+from pyscgen.json.analyze import structural_hash
+from pyscgen.json.analyze.path_accumulator import PathAccumulator
+
+
+def get_data(test: str) -> [dict]:
+    """
+    Return the JSON-Data from file.
+    :return:
+    """
+    data_folder: str = "../data/"
+    data = []
+    test_path: str = data_folder + test
+    for filename in os.listdir(test_path):
+        file_path = os.path.join(test_path, filename)
+        with open(file_path, "r") as file:
+            json_ = json.load(file)
+            data.append(json_)
+    return data
+
+
+def get_analyzer_instance():
+    return JSONAnalyzer()
+
+
+def get_column_info_summary(column_infos) -> list:
+    return [(info.path, info.has_nulls, info.data_types, sorted(map(str, info.unique_values)))
+            for info in column_infos.column_infos]
+
+
+class TestAnalysisState:
+
+    def test_merge_shards(self):
+        for test in ["simple", "complex", "nested_array", "array"]:
+            json_analyzer = get_analyzer_instance()
+            docs: [dict] = get_data(test)
+            state_a: AnalysisState = json_analyzer.analyze_state(docs[:1])
+            state_b: AnalysisState = json_analyzer.analyze_state(docs[1:])
+            merged: AnalysisState = state_a.merge(state_b)
+            assert merged.document_count == len(docs)
+            assert get_column_info_summary(json_analyzer.create_column_infos(merged)) == \
+                   get_column_info_summary(json_analyzer.analyze_stream(docs))
+
+    def test_serialize(self):
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = get_data("complex")
+        state: AnalysisState = json_analyzer.analyze_state(docs)
+        restored: AnalysisState = AnalysisState.from_dict(json.loads(json.dumps(state.as_dict())))
+        assert restored.document_count == state.document_count
+        assert get_column_info_summary(json_analyzer.create_column_infos(restored)) == \
+               get_column_info_summary(json_analyzer.create_column_infos(state))
+
+    def test_add_to_existing_state(self):
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = get_data("simple")
+        state: AnalysisState = json_analyzer.analyze_state(docs[:2])
+        state = json_analyzer.analyze_state(docs[2:], state=state)
+        assert state.document_count == len(docs)
+
+    def test_max_unique_values(self):
+        json_analyzer = JSONAnalyzer(max_unique_values=100, unique_values_sample_size=10)
+        docs: [dict] = [{"id": i, "category": i % 5} for i in range(5000)]
+        column_infos = json_analyzer.analyze_stream(docs)
+        id_info = [info for info in column_infos.column_infos if info.path == "id"][0]
+        category_info = [info for info in column_infos.column_infos if info.path == "category"][0]
+        assert id_info.distinct_count_approximate
+        assert abs(id_info.distinct_count - 5000) < 5000 * 0.05
+        assert len(id_info.unique_values) == 10
+        assert not category_info.distinct_count_approximate
+        assert category_info.distinct_count == 5
+        assert sorted(category_info.unique_values) == [0, 1, 2, 3, 4]
+
+    def test_merge_sketches(self):
+        json_analyzer = JSONAnalyzer(max_unique_values=100)
+        state_a: AnalysisState = json_analyzer.analyze_state({"id": i} for i in range(5000))
+        state_b: AnalysisState = json_analyzer.analyze_state({"id": i} for i in range(2500, 7500))
+        restored_b: AnalysisState = AnalysisState.from_dict(json.loads(json.dumps(state_b.as_dict())))
+        merged: AnalysisState = state_a.merge(restored_b)
+        id_info = json_analyzer.create_column_infos(merged).column_infos[0]
+        assert id_info.distinct_count_approximate
+        assert abs(id_info.distinct_count - 7500) < 7500 * 0.05
+
+    def test_canonical_unique_values(self):
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = [{"doc": {"a": 1, "b": [1, 2]}}, {"doc": {"b": [1, 2], "a": 1}}, {"doc": {"a": 2, "b": []}}]
+        column_infos = json_analyzer.analyze_stream(docs)
+        doc_info = [info for info in column_infos.column_infos if info.path == "doc"][0]
+        assert doc_info.distinct_count == 2
+
+    def test_canonical_unique_values_of_sets_and_tuples(self):
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = [{"tags": {"a", "b"}, "pair": ("a", ["b"])},
+                        {"tags": {"b", "a"}, "pair": ("a", ["b"])},
+                        {"tags": {"c"}, "pair": ("a", ["c"])}]
+        column_infos = json_analyzer.analyze_stream(docs)
+        for info in column_infos.column_infos:
+            assert info.distinct_count == 2
+
+    def test_structural_hash(self):
+        assert PathAccumulator.get_hashable({"a": [1, {2}], "b": None}) == \
+            PathAccumulator.get_hashable({"b": None, "a": (1, frozenset([2]))})
+        assert PathAccumulator.get_hashable([1, 2]) != PathAccumulator.get_hashable([2, 1])
+        assert PathAccumulator.get_hashable([True]) != PathAccumulator.get_hashable([1])
+        nested: tuple = ()
+        for _ in range(10000):
+            nested = (nested,)
+        assert PathAccumulator.get_hashable(nested) == PathAccumulator.get_hashable(nested)
+        json_analyzer = JSONAnalyzer(max_unique_values=1)
+        column_infos = json_analyzer.analyze_stream([{"pair": ("a", [i % 3])} for i in range(30)])
+        assert round(column_infos.column_infos[0].distinct_count) == 3
+
+    def test_unique_values_of_dicts_and_lists(self):
+        docs: [dict] = [json.loads(line) for line in [
+            '{"doc": {"a": 1, "b": [1, 2]}, "list": [[1, 2], {"c": "x"}]}',
+            '{"doc": {"b": [1, 2], "a": 1}, "list": [[1, 2], {"c": "x"}]}',
+            '{"doc": {"a": 1, "b": [2, 1]}, "list": [{"c": "x"}, [1, 2]]}',
+            '{"doc": {"a": 1.0, "b": [1, 2]}, "list": []}',
+            '{"doc": null, "list": null}']]
+        for shape_cache_size in [0, 1000]:
+            column_infos = JSONAnalyzer(shape_cache_size=shape_cache_size).analyze_stream(docs)
+            distinct_counts: dict = {info.path: info.distinct_count for info in column_infos.column_infos}
+            assert (distinct_counts["doc"], distinct_counts["doc.b"], distinct_counts["list"]) == (3, 2, 3)
+
+    def test_structural_hash_digests(self):
+        value: dict = {"b": [1, 2.5, None, True, "ü\"", {}], "a": {"2": [[]], "10": float("nan")}}
+        digests: dict = {}
+        digest: bytes = structural_hash.get_structural_hash(value, digests)
+        # every nested value is hashed once and its digest is reused for the values nested in it
+        assert len(digests) == 6
+        assert structural_hash.get_structural_hash(value["a"], digests) == \
+            structural_hash.get_structural_hash({"10": float("nan"), "2": [[]]})
+        assert digest == structural_hash.get_structural_hash(json.loads(json.dumps(value)))
+        nested: dict = {}
+        for _ in range(5000):
+            nested = {"a": nested}
+        digests = {}
+        structural_hash.get_structural_hash(nested, digests)
+        assert len(digests) == 5001
+        column_infos = JSONAnalyzer().analyze_stream([nested])
+        assert len(column_infos.column_infos) == 5000
+
+    def test_unique_values_of_many_dicts(self):
+        docs: [dict] = [{"d": {"id": i % 300, "l": [i % 300]}, "i": i % 300} for i in range(600)]
+        json_analyzer = JSONAnalyzer(unique_values_sample_size=5)
+        state: AnalysisState = json_analyzer.analyze_state(docs)
+        # only sample_size dicts and lists are kept, the others are counted by their structural hash
+        assert len(state.get_accumulator("d").get_unique_values()) == 5
+        assert len(state.get_accumulator("d.l").get_unique_values()) == 5
+        assert len(state.get_accumulator("i").get_unique_values()) == 300
+        state_merged: AnalysisState = json_analyzer.analyze_state(docs[:400]).merge(
+            AnalysisState.from_dict(json.loads(json.dumps(json_analyzer.analyze_state(docs[400:]).as_dict()))))
+        for state in [state, state_merged]:
+            distinct_counts: dict = {info.path: info.distinct_count
+                                     for info in json_analyzer.create_column_infos(state).column_infos}
+            assert distinct_counts == {"d": 300, "d.id": 300, "d.l": 300, "d.l.0": 300, "i": 300}
+
+    def test_element_containers(self):
+        docs: [dict] = [{"b": [{"c": 1}], "l": [[1]]}] * 3 + [{"b": [], "l": None}, {"b": [{"c": 2}, 3]}]
+        for shape_cache_size in [0, 1000]:
+            state: AnalysisState = JSONAnalyzer(shape_cache_size=shape_cache_size).analyze_state(docs)
+            state = AnalysisState.from_dict(json.loads(json.dumps(state.as_dict(), default=str)))
+            column_infos = JSONAnalyzer().create_column_infos(state)
+            infos: dict = {info.path: info for info in column_infos.column_infos}
+            # dicts and lists within a list are present, but keep the path nullable
+            assert (infos["b.0"].present_count, infos["b.0"].null_count, infos["b.0"].missing_count) == (4, 0, 1)
+            assert (infos["l.0"].present_count, infos["l.0"].null_count, infos["l.0"].missing_count) == (3, 0, 2)
+            assert infos["b.0"].has_nulls and infos["l.0"].has_nulls
+            assert infos["l.0"].density == 1 / 2
+
+    def test_presence_bitmaps(self):
+        docs: [dict] = [{"a": 1, "b": None}, {"a": None}, {"b": 2}, {"a": 3, "b": [1]}] * 5
+        json_analyzer = JSONAnalyzer(track_presence=True)
+        state: AnalysisState = json_analyzer.analyze_state(docs)
+        assert list(state.get_presence_bitmap("a").get_indexes()) == [i for i in range(20) if i % 4 in (0, 3)]
+        assert list(state.get_presence_bitmap("a", with_nulls=True).get_indexes()) == \
+            [i for i in range(20) if i % 4 != 2]
+        assert state.get_presence_bitmap("b").count() == 10
+        assert state.get_presence_bitmap("unknown").count() == 0
+        column_info = json_analyzer.create_column_infos(state).column_infos[0]
+        assert (column_info.present_count, column_info.null_count, column_info.missing_count) == (10, 5, 5)
+        # merged shards and serialized states keep the document indexes
+        state_merged: AnalysisState = json_analyzer.analyze_state(docs[:7]).merge(json_analyzer.analyze_state(docs[7:]))
+        state_merged = AnalysisState.from_dict(json.loads(json.dumps(state_merged.as_dict())))
+        for path in ["a", "b", "b.0"]:
+            for with_nulls in [False, True]:
+                assert state_merged.get_presence_bitmap(path, with_nulls).data == \
+                    state.get_presence_bitmap(path, with_nulls).data
+        # without bitmaps in one of the states, presence is not tracked anymore
+        state_merged.merge(JSONAnalyzer().analyze_state(docs))
+        assert not state_merged.track_presence
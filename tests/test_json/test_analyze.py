@@ -1,8 +1,11 @@
+import asyncio
 import datetime
 import json
 
 import os
 
+import pytest
+
 from typing import Any
 
 from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
@@ -183,3 +186,295 @@ class TestJSONAnalyzer:
         selector = [info.name == "SntFOVersion" for info in column_infos.column_infos]
         result = [x for x, y in zip(column_infos.column_infos, selector) if y][0]
         assert result.data_type_config.python_type == str
+
+    def test_JSONAnalyzer_stream(self):
+        """
+        Test that the streaming analysis gives the same column infos as the list based analysis
+        :return:
+        """
+        for test in ["simple", "complex", "nested_array", "deeply_nested"]:
+            json_analyzer = get_analyzer_instance()
+            docs: [dict] = get_data(test)
+            _, column_infos, _, _, _ = json_analyzer.analyze(docs)
+            column_infos_stream = json_analyzer.analyze_stream(doc for doc in docs)
+            assert [info.path for info in column_infos.column_infos] == \
+                   [info.path for info in column_infos_stream.column_infos]
+            for info, info_stream in zip(column_infos.column_infos, column_infos_stream.column_infos):
+                assert info.has_nulls == info_stream.has_nulls
+                assert info.data_types == info_stream.data_types
+                assert info.avro_path == info_stream.avro_path
+                assert info.data_type_config.python_type == info_stream.data_type_config.python_type
+
+    def test_JSONAnalyzer_workers(self):
+        """
+        Test that the parallel analysis gives the same result as the sequential one
+        :return:
+        """
+        test = "complex"
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = get_data(test)
+        collection_data, column_infos, df_flattened, df_dtypes, df_unique = json_analyzer.analyze(docs)
+        collection_data_p, column_infos_p, df_flattened_p, df_dtypes_p, df_unique_p = json_analyzer.analyze(
+            docs, workers=2, chunk_size=1)
+        assert collection_data_p.size == collection_data.size
+        assert list(df_flattened_p.columns) == list(df_flattened.columns)
+        assert [info.path for info in column_infos_p.column_infos] == [info.path for info in column_infos.column_infos]
+        column_infos_stream = json_analyzer.analyze_stream(docs, workers=2, chunk_size=1)
+        assert [info.path for info in column_infos_stream.column_infos] == \
+               [info.path for info in column_infos.column_infos]
+        # the worker processes create their analyzer with the same settings
+        json_analyzer = JSONAnalyzer(max_array_elements=1, track_unique_values=False)
+        docs = [{"a": [i, str(i)], "b": i} for i in range(10)]
+        assert [info.as_dict() for info in json_analyzer.analyze_stream(docs, workers=2, chunk_size=3).column_infos] \
+            == [info.as_dict() for info in json_analyzer.analyze_stream(docs).column_infos]
+
+    def test_JSONAnalyzer_lazy_outputs(self):
+        """
+        Test that only the column infos are built up front and the other outputs on access
+        :return:
+        """
+        test = "complex"
+        json_analyzer = get_analyzer_instance()
+        docs: [dict] = get_data(test)
+        result = json_analyzer.analyze(docs)
+        assert len(result.column_infos.column_infos) > 0
+        assert result._AnalysisResult__df_flattened is None
+        assert result._AnalysisResult__df_unique is None
+        assert len(result.df_flattened) == len(docs)
+        assert result._AnalysisResult__df_unique is None
+        assert result[1] is result.column_infos
+        collection_data, column_infos, df_flattened, df_dtypes, df_unique = result
+        assert df_flattened is result.df_flattened
+        assert len(df_unique) > 0
+
+    def test_JSONAnalyzer_deeply_nested_without_recursion_limit(self):
+        """
+        Test that documents nested deeper than the recursion limit can be analyzed
+        :return:
+        """
+        depth = 2000
+        doc: dict = {"value": 1}
+        for i in range(depth):
+            doc = {"level": doc} if i % 2 else {"level": [doc]}
+        json_analyzer = get_analyzer_instance()
+        column_infos = json_analyzer.analyze_stream([doc, doc])
+        leaf = [info for info in column_infos.column_infos if info.name == "value"][0]
+        assert leaf.data_type_config.python_type == int
+        assert leaf.path.count(".") == depth + depth // 2
+
+    def test_JSONAnalyzer_all_list_elements(self):
+        """
+        Test that every element of a list is inspected
+        :return:
+        """
+        json_analyzer = get_analyzer_instance()
+        column_infos = json_analyzer.analyze_stream([{"list": [1, 2, 3, "text"]}])
+        element = [info for info in column_infos.column_infos if info.path == "list.0"][0]
+        assert element.data_types == [int, str]
+        assert element.distinct_count == 4
+
+    def test_JSONAnalyzer_path_tree(self):
+        """
+        Test that the ColumnInfos can be walked as a tree via the path IDs
+        :return:
+        """
+        json_analyzer = get_analyzer_instance()
+        column_infos = json_analyzer.analyze_stream([{"a": {"b": [{"c": 1}]}, "d": 2}])
+        assert [info.path for info in column_infos.get_roots()] == ["a", "d"]
+        a = [info for info in column_infos.column_infos if info.path == "a"][0]
+        b = column_infos.get_children(a)[0]
+        assert b.path == "a.b" and b.depth == 1
+        element = column_infos.get_children(b)[0]
+        assert element.avro_path == "a.b.b_record"
+        c = column_infos.get_children(element)[0]
+        assert c.path == "a.b.0.c" and c.depth == 3
+        assert c.parent_config.path_id == element.path_id
+        assert column_infos.get_parent(column_infos.get_parent(c)) is b
+        assert column_infos.get_parent(a) is None
+
+    def test_JSONAnalyzer_shape_cache(self):
+        """
+        Test that documents with a known shape are folded from the shape cache with the same result
+        :return:
+        """
+        docs: [dict] = get_data("northdata") * 3 + [{"a": [1, None, {"b": None}]}] * 2
+        cached = JSONAnalyzer().analyze_stream(docs)
+        uncached = JSONAnalyzer(shape_cache_size=0).analyze_stream(docs)
+        assert [info.as_dict() for info in cached.column_infos] == [info.as_dict() for info in uncached.column_infos]
+        assert cached.statistics.document_count == len(docs)
+        assert cached.statistics.shape_cache_misses == len(get_data("northdata")) + 1
+        assert cached.statistics.shape_cache_hits == len(docs) - cached.statistics.shape_cache_misses
+        assert uncached.statistics.shape_cache_hits == 0
+        # large documents are not cached
+        docs = [{"a": i, "l": list(range(2000))} for i in range(3)]
+        state = JSONAnalyzer().analyze_state(docs)
+        assert (state.shape_cache_hits, state.shape_cache_misses, len(state.shape_cache)) == (0, 3, 0)
+        assert [info.as_dict() for info in JSONAnalyzer().create_column_infos(state).column_infos] == \
+            [info.as_dict() for info in JSONAnalyzer(shape_cache_size=0).analyze_stream(docs).column_infos]
+
+    def test_JSONAnalyzer_sample(self):
+        """
+        Test that a stratified sample keeps rare shapes and records the sample size and nullability confidence
+        :return:
+        """
+        docs: [dict] = [{"id": i, "value": 1} for i in range(1000)]
+        docs[777] = {"id": 777, "rare": "x"}
+        column_infos = JSONAnalyzer().analyze_stream(iter(docs), sample=50)
+        assert column_infos.statistics.sample_size == 50
+        assert column_infos.statistics.population_size == 1000
+        infos = {info.path: info for info in column_infos.column_infos}
+        assert infos["rare"].has_nulls and infos["value"].has_nulls
+        assert infos["rare"].nullability_confidence == 1.0
+        assert 0 < infos["id"].nullability_confidence < 1
+        result = JSONAnalyzer().analyze(docs, sample=2000)
+        assert result.column_infos.statistics.sample_size is None
+        assert len(result.df_flattened) == 1000
+
+    def test_JSONAnalyzer_large_sample(self):
+        """
+        Test that a large uniform sample keeps distinct documents spread over the whole stream
+        :return:
+        """
+        docs: [dict] = [{"id": i} for i in range(200000)]
+        column_infos = JSONAnalyzer(max_unique_values=None).analyze_stream(iter(docs), sample=20000)
+        assert column_infos.statistics.sample_size == 20000
+        ids: list = column_infos.column_infos[0].unique_values
+        assert len(ids) == len(set(ids)) == 20000
+        assert 90000 < sum(ids) / len(ids) < 110000
+
+    def test_JSONAnalyzer_stop_after_stable(self):
+        """
+        Test that the analysis stops consuming a stream once the schema is stable
+        :return:
+        """
+        consumed: list = []
+
+        def docs():
+            i = 0
+            while True:
+                consumed.append(i)
+                doc: dict = {"id": i}
+                if i == 10:
+                    doc["optional"] = "x"
+                if i == 20:
+                    doc["id"] = None
+                yield doc
+                i += 1
+
+        column_infos = JSONAnalyzer().analyze_stream(docs(), stop_after_stable=50)
+        assert column_infos.statistics.last_change_index == 20
+        assert column_infos.statistics.stopped_early
+        assert len(consumed) == 71
+        assert all(info.has_nulls for info in column_infos.column_infos)
+
+    def test_JSONAnalyzer_analyze_async(self):
+        """
+        Test that documents from an async source, with a queue standing in for a message bus, give the same result
+        as analyze_stream
+        :return:
+        """
+        docs: [dict] = get_data("complex")
+
+        async def consume(queue: asyncio.Queue):
+            while True:
+                doc = await queue.get()
+                if doc is None:
+                    return
+                yield doc
+
+        async def run():
+            queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+            async def produce():
+                for doc in docs * 3:
+                    await queue.put(doc)
+                await queue.put(None)
+
+            producer = asyncio.create_task(produce())
+            column_infos = await JSONAnalyzer().analyze_async(consume(queue), batch_size=2)
+            await producer
+            return column_infos
+
+        column_infos = asyncio.run(run())
+        assert column_infos.as_dict() == JSONAnalyzer().analyze_stream(docs * 3).as_dict()
+
+        async def aiter_docs():
+            for doc in docs * 3:
+                yield doc
+
+        column_infos = asyncio.run(JSONAnalyzer().analyze_async(aiter_docs(), batch_size=2, sample=5))
+        assert column_infos.statistics.sample_size == 5
+        assert column_infos.as_dict() == JSONAnalyzer().analyze_stream(docs * 3, sample=5).as_dict()
+
+    def test_JSONAnalyzer_type_dominance(self):
+        """
+        Test the per-column type counts and that a dominant type is chosen instead of string
+        :return:
+        """
+        docs: [dict] = [{"value": i} for i in range(999)] + [{"value": "n/a"}, {"value": None}]
+        column_info = JSONAnalyzer().analyze_stream(docs).column_infos[0]
+        assert dict(zip(column_info.data_types, column_info.data_type_counts)) == {int: 999, str: 1, type(None): 1}
+        assert column_info.data_type_config.python_type == str
+        assert column_info.type_outlier_count == 0
+        column_info = JSONAnalyzer(type_dominance_threshold=0.99).analyze_stream(docs).column_infos[0]
+        assert column_info.data_type_config.python_type == int
+        assert column_info.type_outlier_count == 1
+        assert column_info.mixed_types
+
+    def test_JSONAnalyzer_query_documents(self):
+        """
+        Test the document queries of the AnalysisResult, which are answered from the presence bitmaps
+        :return:
+        """
+        docs: [dict] = [{"a": 1, "b": {"c": 1}}, {"a": None, "b": {"c": 2}}, {"b": {"c": None}}, {"a": 2}]
+        result = JSONAnalyzer(track_presence=True).analyze(docs)
+        assert result.documents_with("a") == [0, 3]
+        assert result.documents_with("a", with_nulls=True) == [0, 1, 3]
+        assert result.find_documents(with_paths=["b"], without_paths=["a"]) == [1, 2]
+        assert result.find_documents(without_paths=["b.c"]) == [2, 3]
+        assert result.get_document_paths(2) == ["b"]
+        assert result.get_document_paths(2, with_nulls=True) == ["b", "b.c"]
+        assert result.count_documents_with_shape(["a", "b", "b.c"]) == 1
+        assert result.count_documents_with_shape(["b", "b.c"], with_nulls=True) == 1
+        assert result.count_documents_with_shape(["b", "b.c"]) == 1
+        assert result.count_documents_with_shape(["a"]) == 1
+        with pytest.raises(ValueError):
+            JSONAnalyzer().analyze(docs).documents_with("a")
+
+    def test_JSONAnalyzer_query_list_documents(self):
+        """
+        Test the document queries for the paths of records and lists within lists
+        :return:
+        """
+        docs: [dict] = [{"b": [{"c": 1}]}, {"b": []}, {"b": [[1], {"c": None}]}, {"x": 1}]
+        for shape_cache_size in [0, 1000]:
+            result = JSONAnalyzer(track_presence=True, shape_cache_size=shape_cache_size).analyze(docs)
+            assert result.documents_with("b.0") == [0, 2]
+            assert result.documents_with("b.0.0") == [2]
+            assert result.find_documents(without_paths=["b.0"]) == [1, 3]
+            assert result.find_documents(with_paths=["b.0"], without_paths=["b.0.c"]) == [2]
+            assert result.get_document_paths(0) == ["b", "b.0", "b.0.c"]
+            assert result.get_document_paths(2, with_nulls=True) == ["b", "b.0", "b.0.c", "b.0.0"]
+
+    def test_JSONAnalyzer_max_array_elements(self):
+        """
+        Test that only some elements of long lists are inspected, while the list lengths are fully counted
+        :return:
+        """
+        docs: [dict] = [{"values": list(range(1000)) + ["tail"], "nested": [[1, 2, 3]] * 50}, {"values": [1, 2]}]
+        for array_sampling in ["head", "stride", "random"]:
+            for shape_cache_size in [0, 1000]:
+                column_infos = JSONAnalyzer(max_array_elements=10, array_sampling=array_sampling,
+                                            shape_cache_size=shape_cache_size).analyze_stream(docs * 2)
+                column_info = column_infos.column_infos[-2]
+                assert column_info.path == "values"
+                assert (column_info.array_length_min, column_info.array_length_max) == (2, 1001)
+                assert column_info.array_length_mean == 501.5
+                assert len(column_infos.column_infos[-1].unique_values) <= 12
+                nested = column_infos.column_infos[1]
+                assert nested.path == "nested.0" and nested.array_length_mean == 3
+        column_infos = JSONAnalyzer().analyze_stream(docs)
+        assert column_infos.column_infos[-1].data_types == [int, str]
+        assert column_infos.column_infos[-1].array_length_min is None
+        with pytest.raises(ValueError):
+            JSONAnalyzer(array_sampling="tail")
@@ -27,3 +27,13 @@ class TestDataTypeConfig:
         with pytest.raises(DataTypeConfig.ContainsNotAllNeededConfigEntriesException):
             dtype_config.data_type_config = config
 
+
+    def test_choose_type_info(self):
+        dtype_config = DataTypeConfig()
+        assert dtype_config.choose_type_info([int]).python_type == int
+        assert dtype_config.choose_type_info([type(None), int]).python_type == int
+        assert dtype_config.choose_type_info([int, type(None)]).python_type == int
+        assert dtype_config.choose_type_info([int, float, str]).python_type == str
+        assert dtype_config.choose_type_info([int, str], [999, 1]).python_type == str
+        assert dtype_config.choose_type_info([int, str], [999, 1], 0.99).python_type == int
+        assert dtype_config.choose_type_info([int, str, type(None)], [50, 50, 900], 0.99).python_type == str
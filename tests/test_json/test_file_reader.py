@@ -0,0 +1,140 @@
+import json
+import os
+import tracemalloc
+import warnings
+
+import pytest
+
+from pyscgen.json.analyze.analyze_documents import JSONAnalyzer
+from pyscgen.json.ingest.file_reader import FileReader
+from pyscgen.json.ingest.json_parser import JSONParser
+from pyscgen.json.merge.merge_documents import DocumentMerger
+
+
+def get_paths(test: str) -> [str]:
+    """
+    Return the paths of the JSON-Data files.
+    :return:
+    """
+    data_folder: str = "../data/"
+    test_path: str = data_folder + test
+    return [os.path.join(test_path, filename) for filename in os.listdir(test_path)]
+
+
+def get_data(test: str) -> [dict]:
+    """
+    Return the JSON-Data from file.
+    :return:
+    """
+    data = []
+    for file_path in get_paths(test):
+        with open(file_path, "r") as file:
+            data.append(json.load(file))
+    return data
+
+
+def write_ndjson(path: str, docs: [dict]):
+    """
+    Write the documents as newline-delimited JSON
+    :return:
+    """
+    with open(path, "w") as file:
+        for doc in docs:
+            file.write(json.dumps(doc) + "\n")
+
+
+class TestFileReader:
+
+    def test_read_ndjson(self, tmp_path):
+        path = str(tmp_path / "docs.ndjson")
+        with open(path, "wb") as file:
+            file.write(b'{"a": 1}\r\n\n   \n{"a": [1, 2]}\n{"b": "\xc3\xa4"}')
+        empty_path = str(tmp_path / "empty.ndjson")
+        open(empty_path, "w").close()
+        docs = list(FileReader().read_documents([path, empty_path]))
+        assert docs == [{"a": 1}, {"a": [1, 2]}, {"b": "ä"}]
+
+    def test_analyze_files(self, tmp_path):
+        for test in ["simple", "northdata"]:
+            expected = JSONAnalyzer().analyze_stream(get_data(test))
+            single = JSONAnalyzer().analyze_files(get_paths(test), ndjson=False)
+            path = str(tmp_path / (test + ".ndjson"))
+            write_ndjson(path, get_data(test))
+            ndjson = JSONAnalyzer().analyze_files(path)
+            assert single.as_dict()["column_infos"] == expected.as_dict()["column_infos"]
+            assert ndjson.as_dict()["column_infos"] == expected.as_dict()["column_infos"]
+
+    def test_merged_document_from_files(self):
+        merged = DocumentMerger().get_merged_document_from_files(get_paths("complex"), ndjson=False)
+        assert merged == DocumentMerger().get_merged_document(get_data("complex"))
+
+    def test_parser_backends(self, tmp_path):
+        path = str(tmp_path / "northdata.ndjson")
+        write_ndjson(path, get_data("northdata"))
+        results: dict = {}
+        for backend in ["json", "orjson", "simdjson", "auto"]:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                column_infos = JSONAnalyzer().analyze_files(path, parser_backend=backend)
+            assert column_infos.statistics.parser_backend in JSONParser.backends
+            results[backend] = column_infos.as_dict()["column_infos"]
+        assert all(result == results["json"] for result in results.values())
+        # NaN is rejected by orjson, the document is parsed with the stdlib json module then
+        assert JSONParser().loads(memoryview(b'{"a": NaN, "b": 1}'))["b"] == 1
+
+    def test_analyze_bytes(self):
+        data: bytes = b'{"a": 1}\n{"a": null, "b": [1]}\n'
+        column_infos = JSONAnalyzer().analyze_bytes(data, parser_backend="json")
+        assert column_infos.statistics.parser_backend == "json"
+        assert [info.path for info in column_infos.column_infos] == ["a", "b", "b.0"]
+        assert all(info.has_nulls for info in column_infos.column_infos)
+
+    def test_structure_only(self, tmp_path):
+        for test in ["complex", "nested_array", "nullable_array_and_record"]:
+            path: str = str(tmp_path / (test + ".ndjson"))
+            write_ndjson(path, get_data(test))
+            column_infos = JSONAnalyzer().analyze_files(path, structure_only=True)
+            column_infos_parsed = JSONAnalyzer().analyze_files(path, parser_backend="json")
+            assert column_infos.statistics.parser_backend == "structure_scanner"
+            for info, info_parsed in zip(column_infos.as_dict()["column_infos"],
+                                         column_infos_parsed.as_dict()["column_infos"]):
+                if {dict, list} & set(info["data_types"]):
+                    # the scanner does not build dicts and lists, so their unique values are unknown
+                    assert info["unique_values"] == [] and info["distinct_count"] == 0
+                    info = dict(info, unique_values=info_parsed["unique_values"],
+                                distinct_count=info_parsed["distinct_count"], density=info_parsed["density"])
+                assert info == info_parsed
+        data: bytes = b'{"a": "x\\"y", "b": [{"c": -1.5e3}, {"c": null}], "d": true}'
+        column_infos = JSONAnalyzer().analyze_bytes(data, ndjson=False, structure_only=True)
+        assert [info.path for info in column_infos.column_infos] == ["a", "b", "b.0", "b.0.c", "d"]
+        assert column_infos.get_column_info(column_infos.column_infos[0].path_id).unique_values == ['x"y']
+        # trailing whitespace ends the input, e.g. of CRLF lines or of a single document file ending with a newline
+        for data, ndjson in [(b'{"a": 1}\r\n{"a": 2}\r\n', True), (b'{"a": 1}\n', False),
+                             (b'{"a": [1, {"b": 2}]}  ', False)]:
+            column_infos = JSONAnalyzer().analyze_bytes(data, ndjson=ndjson, structure_only=True)
+            column_infos_parsed = JSONAnalyzer().analyze_bytes(data, ndjson=ndjson, parser_backend="json")
+            assert column_infos.statistics.document_count == column_infos_parsed.statistics.document_count
+            assert [info.path for info in column_infos.column_infos] == \
+                [info.path for info in column_infos_parsed.column_infos]
+        path: str = str(tmp_path / "single.json")
+        with open(path, "w") as file:
+            file.write(json.dumps(get_data("complex")[0]) + "\n")
+        column_infos = JSONAnalyzer().analyze_files(path, ndjson=False, structure_only=True)
+        assert column_infos.statistics.document_count == 1
+
+    def test_structure_only_memory(self):
+        # a single huge document is never built as dicts and lists, so the peak memory stays far below parsing
+        data: bytes = json.dumps({"items": [{"id": i, "name": "name" + str(i), "tags": ["a", "b"],
+                                             "sub": {"x": i * 0.5, "y": None}} for i in range(5000)]}).encode()
+        peaks: list = []
+        for kwargs in [{"structure_only": True}, {"parser_backend": "json"}]:
+            tracemalloc.start()
+            JSONAnalyzer(max_unique_values=10).analyze_bytes(data, ndjson=False, **kwargs)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[0] * 4 < peaks[1]
+
+    def test_structure_only_invalid(self):
+        for data in [b'[1, 2]', b'{"a": }', b'{"a": 1', b'{"a": 1}}']:
+            with pytest.raises(ValueError):
+                JSONAnalyzer().analyze_bytes(data, ndjson=False, structure_only=True)
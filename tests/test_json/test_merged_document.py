@@ -1,8 +1,12 @@
 import datetime
 import json
 import os
+import pickle
 from typing import Any
 
+import pytest
+
+from pyscgen.json.analyze.analysis_state import AnalysisState
 from pyscgen.json.merge.merge_documents import DocumentMerger
 
 from json import JSONEncoder
@@ -279,3 +283,41 @@ class TestJSONMerger:
             json.dump(merged, file, indent=4, cls=JSONEncoder)
         assert isinstance(merged, dict)
         assert get_result_dict()[test] == merged
+
+    def test_JSONMerger_workers(self):
+        test = "complex"
+        json_merger = get_merged_instance()
+        docs: [dict] = get_data(test)
+        merged = json_merger.get_merged_document(docs, workers=2)
+        assert get_result_dict()[test] == merged
+
+    def test_JSONMerger_skip_mixed_parent(self):
+        json_merger = get_merged_instance()
+        docs: [dict] = [{"a": {"b": 1}, "c": [{"d.e": True}]}, {"a": "text", "c": []}]
+        with pytest.warns(UserWarning, match="'a.b' is skipped"):
+            merged = json_merger.get_merged_document(docs)
+        assert merged == {"a": "text", "c": [{"d.e": True}]}
+
+    def test_JSONMerger_update(self):
+        for test in ["complex", "nested_array", "nullable_array_and_record"]:
+            json_merger = DocumentMerger(track_unique_values=True)
+            docs: [dict] = get_data(test)
+            merged_state: AnalysisState = json_merger.create_state(docs[:1])
+            # the state is persisted and restored between the updates
+            merged_state = AnalysisState.from_dict(json.loads(json.dumps(merged_state.as_dict(), cls=JSONEncoder)))
+            merged = json_merger.update(merged_state, docs[1:])
+            assert merged_state.document_count == len(docs)
+            assert get_result_dict()[test] == merged
+
+    def test_JSONMerger_update_state_size(self):
+        json_merger = get_merged_instance()
+        merged_state: AnalysisState = json_merger.create_state({"id": i, "tags": [str(i)]} for i in range(1000))
+        state_size: int = len(json.dumps(merged_state.as_dict(), cls=JSONEncoder))
+        merged = json_merger.update(merged_state, ({"id": i, "tags": [str(i)]} for i in range(1000, 50000)))
+        assert merged_state.document_count == 50000
+        assert merged == json_merger.get_merged_document([{"id": 0, "tags": ["0"]}])
+        # the unique values are not tracked
+        assert len(json.dumps(merged_state.as_dict(), cls=JSONEncoder)) < state_size * 1.1
+        wide_state: AnalysisState = json_merger.create_state({"c" + str(j): i * j for j in range(2000)}
+                                                             for i in range(3))
+        assert len(pickle.dumps(wide_state)) < 2000 * 500